@@ -1,3 +1,7 @@
+import asyncio
+import json
+import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request, Form
@@ -5,15 +9,25 @@ from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import InMemorySaver
 from langchain_openai import ChatOpenAI
-from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
 import uvicorn
 
+from mcp_pool import MCPSessionPool
+from session_store import SessionStore, open_checkpointer
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from tools.tool_cache import CachedToolNode, ToolCachePolicy
+
+# MCP 도구별 캐싱 정책. 웹페이지, 날씨, 뉴스, 야구 순위, 브리핑은 MCP 서버가 이미
+# 캐싱하므로(mcp_server.py의 async_ttl_cache) 여기서는 서버가 캐싱하지 않는 도구만 지정합니다.
+# 명언(daily_quote)은 매번 새로 생성하도록 캐싱하지 않습니다.
+MCP_TOOL_CACHE_POLICIES = {
+    "today_schedule": ToolCachePolicy(ttl=60),
+}
+
 
 def create_prompt_template() -> ChatPromptTemplate:
     """에이전트를 위한 프롬프트 템플릿을 생성합니다."""
@@ -27,7 +41,16 @@ def create_prompt_template() -> ChatPromptTemplate:
 - 일정과 스케줄 정보를 확인할 수 있습니다
 - 사용자에게 영감을 주는 명언을 제공할 수 있습니다
 - 사용자의 하루 일정 준비를 도와주는 브리핑 기능이 있습니다. 
-  사용자가 위치한 곳을 안다면 바로 brief_today() 도구의 지침을 따르면 됩니다. 아니라면, 위치를 물어보고나서 도구의 지침을 따릅니다. 
+  사용자가 위치한 곳을 안다면 brief_today(city_name) 도구를 한 번만 호출하면 됩니다. 아니라면, 위치를 물어보고나서 호출합니다.
+  brief_today는 날씨, 뉴스, 프로야구 순위, 일정, 명언을 모두 담은 JSON을 반환하므로 다른 도구를 추가로 호출하지 마세요.
+  브리핑은 다음 형식으로 정리하고, 마지막에 따뜻한 말 한마디를 덧붙입니다. error로 표시된 항목은 가져오지 못했다고 알려주세요.
+
+  ## 사용자님을 위한 맞춤 요약
+  ### 오늘의 날씨
+  ### 오늘자 주요 뉴스 (링크를 함께 제공합니다)
+  ### 야구단 랭킹 (순위와 전적을 리스트 형태로)
+  ### 오늘의 업무 일정
+  ### 영감을 주는 격언 한마디
 
 사용자와의 대화에서 다음 원칙을 지켜주세요:
 1. 항상 친절하고 정중한 태도로 응답해주세요
@@ -45,12 +68,18 @@ def create_prompt_template() -> ChatPromptTemplate:
     )
 
 
-def create_agent(tools):
-    """주어진 도구를 사용하여 에이전트를 생성합니다."""
-    memory = InMemorySaver()
+def create_agent(tool_node: CachedToolNode, session_store: SessionStore):
+    """주어진 도구 노드와 세션 저장소를 사용하여 에이전트를 생성합니다."""
     prompt = create_prompt_template()
     llm = ChatOpenAI(model="gpt-4o-mini")
-    return create_react_agent(llm, tools, checkpointer=memory, prompt=prompt)
+    return create_react_agent(
+        llm,
+        tool_node,
+        checkpointer=session_store.checkpointer,
+        prompt=prompt,
+        # 대화 기록이 길어지면 LLM 호출 전에 상태를 압축
+        pre_model_hook=session_store.compact_history,
+    )
 
 
 @asynccontextmanager
@@ -58,16 +87,33 @@ async def lifespan(app: FastAPI):
     """FastAPI 애플리케이션의 생명주기 동안 MCP 연결 및 에이전트 설정을 관리합니다."""
     print("애플리케이션 시작: MCP 서버에 연결하고 에이전트를 설정합니다...")
 
-    async with streamablehttp_client("http://localhost:8000/mcp") as (read, write, _):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            tools = await load_mcp_tools(session)
-            app.state.agent_executor = create_agent(tools)
-            print("에이전트 설정 완료. 애플리케이션이 준비되었습니다.")
-            yield
+    async with open_checkpointer() as checkpointer:
+        session_store = SessionStore(checkpointer)
+        await session_store.setup()
+        app.state.session_store = session_store
+        sweeper = asyncio.create_task(session_store.sweep_forever())
+
+        def build_agent(tools):
+            # 모든 세션이 같은 도구 캐시를 공유하도록 도구 노드를 에이전트와 함께 만듭니다.
+            app.state.tool_node = CachedToolNode(tools, policies=MCP_TOOL_CACHE_POLICIES)
+            app.state.agent_executor = create_agent(app.state.tool_node, session_store)
+
+        try:
+            # 도구 호출은 세션 풀에서 가장 한가한 세션으로 보내고, 끊어진 세션은 자동으로 재연결
+            # MCP 서버가 재시작되며 도구가 바뀌면 새 도구로 에이전트를 다시 만듭니다.
+            async with MCPSessionPool(on_tools_changed=build_agent) as mcp_pool:
+                app.state.mcp_pool = mcp_pool
+                build_agent(await mcp_pool.load_tools())
+                print("에이전트 설정 완료. 애플리케이션이 준비되었습니다.")
+                yield
+        finally:
+            sweeper.cancel()
 
     print("애플리케이션 종료.")
     app.state.agent_executor = None
+    app.state.session_store = None
+    app.state.mcp_pool = None
+    app.state.tool_node = None
 
 
 # lifespan 관리자를 사용하여 FastAPI 앱 인스턴스 생성
@@ -88,51 +134,138 @@ async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-async def stream_agent_response(agent_executor, message: str, session_id: str):
-    """에이전트의 응답을 스트리밍하는 비동기 제너레이터"""
+# 작은 토큰을 모아서 보내는 기준 (글자 수, 초)
+TOKEN_BATCH_CHARS = 32
+TOKEN_BATCH_INTERVAL = 0.05
+# tool_end 이벤트에 담을 도구 결과 미리보기 길이
+TOOL_OUTPUT_PREVIEW_CHARS = 200
+
+
+def format_sse(event: str, data: dict) -> str:
+    """SSE 이벤트 하나를 `event:` / `data:` 형식의 문자열로 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_agent_response(
+    agent_executor, message: str, session_id: str, session_store: SessionStore = None
+):
+    """
+    에이전트의 응답을 SSE 이벤트로 스트리밍하는 비동기 제너레이터
+
+    이벤트 종류:
+        token: {"text": ...} 모델이 생성한 텍스트 (작은 토큰은 모아서 전송)
+        tool_start: {"id", "name", "input"} 도구 호출 시작
+        tool_end: {"id", "name", "output"} 도구 호출 완료 (결과는 앞부분만 전송)
+        error: {"message": ...} 처리 중 오류
+        done: {} 응답 종료
+    """
     if agent_executor is None:
-        yield "에이전트가 아직 준비되지 않았습니다. 잠시 후 다시 시도해주세요."
+        yield format_sse(
+            "error", {"message": "에이전트가 아직 준비되지 않았습니다. 잠시 후 다시 시도해주세요."}
+        )
+        yield format_sse("done", {})
         return
 
-    try:
-        config = {"configurable": {"thread_id": session_id}}
-        input_message = HumanMessage(content=message)
+    config = {"configurable": {"thread_id": session_id}}
+    input_message = HumanMessage(content=message)
+    buffer: list[str] = []
+    buffered_chars = 0
+    last_flush = time.monotonic()
+    first_token_sent = False
 
-        # astream_events를 사용하여 응답 스트리밍
+    def flush_tokens() -> str:
+        nonlocal buffered_chars, last_flush
+        text = "".join(buffer)
+        buffer.clear()
+        buffered_chars = 0
+        last_flush = time.monotonic()
+        return format_sse("token", {"text": text})
+
+    try:
+        # ① 필요한 이벤트(채팅 모델, 도구)만 구독하여 나머지 콜백 이벤트는 만들지 않음
         async for event in agent_executor.astream_events(
             {"messages": [input_message]},
             config=config,
-            version="v1",
+            version="v2",
+            include_types=["chat_model", "tool"],
         ):
             kind = event["event"]
             if kind == "on_chat_model_stream":
                 content = event["data"]["chunk"].content
-                if content:
-                    # 스트리밍된 콘텐츠를 클라이언트로 전송
-                    yield content
+                if not content:
+                    continue
+                buffer.append(content)
+                buffered_chars += len(content)
+                # ② 첫 토큰은 바로 보내고, 이후에는 일정 길이나 시간이 쌓이면 모아서 전송
+                if (
+                    not first_token_sent
+                    or buffered_chars >= TOKEN_BATCH_CHARS
+                    or time.monotonic() - last_flush >= TOKEN_BATCH_INTERVAL
+                ):
+                    first_token_sent = True
+                    yield flush_tokens()
             elif kind == "on_tool_start":
-                # TODO: 도구 사용 시작을 클라이언트에 알릴 수 있습니다.
-                print(f"Tool start: {event['name']}")
+                if buffer:
+                    yield flush_tokens()
+                yield format_sse(
+                    "tool_start",
+                    {
+                        "id": event["run_id"],
+                        "name": event["name"],
+                        "input": event["data"].get("input"),
+                    },
+                )
             elif kind == "on_tool_end":
-                # TODO: 도구 사용 완료를 클라이언트에 알릴 수 있습니다.
-                print(f"Tool end: {event['name']}")
-            else:
-                print(event)
+                output = event["data"].get("output")
+                output = str(getattr(output, "content", output))
+                yield format_sse(
+                    "tool_end",
+                    {
+                        "id": event["run_id"],
+                        "name": event["name"],
+                        "output": output[:TOOL_OUTPUT_PREVIEW_CHARS],
+                    },
+                )
+
+        if buffer:
+            yield flush_tokens()
+
+        # 응답이 끝나면 이전 체크포인트를 정리하여 세션 크기를 일정하게 유지
+        if session_store is not None:
+            await session_store.prune(session_id)
 
     except Exception as e:
         print(f"스트리밍 중 오류 발생: {e}")
-        yield f"오류가 발생했습니다: {e}"
+        if buffer:
+            yield flush_tokens()
+        yield format_sse("error", {"message": f"오류가 발생했습니다: {e}"})
+
+    yield format_sse("done", {})
 
 
 @app.post("/chat")
 async def chat(request: Request, message: str = Form(...), session_id: str = Form(...)):
     """사용자 메시지를 받아 에이전트의 응답을 스트리밍합니다."""
     agent_executor = request.app.state.agent_executor
+    session_store = request.app.state.session_store
+    await session_store.touch(session_id)
     return StreamingResponse(
-        stream_agent_response(agent_executor, message, session_id),
+        stream_agent_response(agent_executor, message, session_id, session_store),
         media_type="text/event-stream",
+        # 프록시가 응답을 모아 두지 않고 바로 전달하도록 설정
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@app.get("/stats")
+async def stats(request: Request):
+    """세션 수, 정리/압축 횟수, 체크포인트 사용량, MCP 세션 풀 상태와 도구 캐시 적중률을 반환합니다."""
+    return {
+        **await request.app.state.session_store.usage(),
+        "mcp_pool": request.app.state.mcp_pool.stats(),
+        "tool_cache": request.app.state.tool_node.stats(),
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
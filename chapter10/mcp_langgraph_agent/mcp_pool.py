@@ -0,0 +1,297 @@
+"""
+채팅 에이전트가 MCP 서버와 통신할 때 사용하는 세션 풀 모듈
+
+- 여러 개의 MCP 세션을 열어 두고, 진행 중인 호출이 가장 적은 세션으로 도구 호출을 보냅니다.
+- 모든 세션이 바쁘면 max_size까지 세션을 늘립니다.
+- 세션마다 주기적으로 ping을 보내 상태를 확인하고, 끊어지면 백오프 후 다시 연결합니다.
+- 다시 연결한 뒤 도구 목록이 바뀌었으면 도구를 다시 불러와 콜백으로 알려줍니다.
+
+풀 자체가 list_tools / call_tool을 제공하므로 `load_mcp_tools(pool)`로 만든 도구는
+특정 세션에 묶이지 않고 항상 풀을 통해 호출됩니다. 이 예제의 도구는 모두 조회용이므로
+연결 오류로 실패한 호출은 다른 세션에서 한 번 더 시도합니다.
+
+환경 변수:
+    MCP_SERVER_URL: MCP 서버 주소 (기본값: http://localhost:8000/mcp)
+    MCP_POOL_MIN_SIZE: 항상 열어 둘 세션 수 (기본값: 2)
+    MCP_POOL_MAX_SIZE: 최대 세션 수 (기본값: 8)
+"""
+
+import asyncio
+import os
+from typing import Awaitable, Callable, List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+
+MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:8000/mcp")
+MCP_POOL_MIN_SIZE = int(os.getenv("MCP_POOL_MIN_SIZE", "2"))
+MCP_POOL_MAX_SIZE = int(os.getenv("MCP_POOL_MAX_SIZE", "8"))
+
+
+class _PooledSession:
+    """
+    풀에 속한 MCP 세션 하나입니다.
+
+    streamablehttp_client와 ClientSession은 연 태스크 안에서 닫아야 하므로,
+    세션마다 전용 태스크가 연결을 열고 유지하며 끊어지면 다시 연결합니다.
+    """
+
+    def __init__(self, pool: "MCPSessionPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.reconnects = 0
+        self.ready = asyncio.Event()
+        self._broken = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.session is not None and not self._broken.is_set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def mark_broken(self) -> None:
+        """연결이 끊어진 것으로 표시합니다. 연결 태스크가 세션을 닫고 다시 연결합니다."""
+        self._broken.set()
+
+    async def _run(self) -> None:
+        backoff = self.pool.min_backoff
+        while True:
+            try:
+                async with streamablehttp_client(self.pool.url) as (read, write, _):
+                    async with ClientSession(read, write) as session:
+                        await asyncio.wait_for(
+                            session.initialize(), self.pool.connect_timeout
+                        )
+                        self.session = session
+                        self.ready.set()
+                        backoff = self.pool.min_backoff
+                        await self.pool._on_connected(self)
+                        await self._watch(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"MCP 세션 {self.index} 연결 오류: {e!r}")
+            finally:
+                self.session = None
+                self.ready.clear()
+                self._broken.clear()
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.pool.max_backoff)
+
+    async def _watch(self, session: ClientSession) -> None:
+        """끊어졌다는 표시가 있거나 ping에 실패할 때까지 기다립니다."""
+        while not self._broken.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._broken.wait(), self.pool.health_check_interval
+                )
+            except asyncio.TimeoutError:
+                try:
+                    await asyncio.wait_for(
+                        session.send_ping(), self.pool.health_check_timeout
+                    )
+                except Exception as e:
+                    print(f"MCP 세션 {self.index} 상태 확인 실패: {e!r}")
+                    return
+
+
+class MCPSessionPool:
+    """
+    MCP 세션 풀입니다. `load_mcp_tools`에 세션 대신 넘길 수 있습니다.
+
+    Args:
+        url (str): MCP 서버 주소
+        min_size (int): 항상 열어 둘 세션 수
+        max_size (int): 최대 세션 수
+        max_in_flight_per_session (int): 세션 하나에 몰리는 호출이 이 수를 넘으면 세션을 늘림
+        on_tools_changed: 다시 연결한 뒤 도구 목록이 바뀌었을 때 새 도구 목록을 받는 콜백
+
+    사용 예시:
+        async with MCPSessionPool(on_tools_changed=rebuild_agent) as pool:
+            tools = await pool.load_tools()
+    """
+
+    def __init__(
+        self,
+        url: str = MCP_SERVER_URL,
+        min_size: int = MCP_POOL_MIN_SIZE,
+        max_size: int = MCP_POOL_MAX_SIZE,
+        max_in_flight_per_session: int = 4,
+        on_tools_changed: Optional[Callable[[List[BaseTool]], None]] = None,
+        connect_timeout: float = 10.0,
+        health_check_interval: float = 15.0,
+        health_check_timeout: float = 5.0,
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.max_in_flight_per_session = max_in_flight_per_session
+        self.on_tools_changed = on_tools_changed
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.retries = 0
+        self.tool_reloads = 0
+        self._members: List[_PooledSession] = []
+        self._tool_signature: Optional[tuple] = None
+        self._reload_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _add_member(self) -> _PooledSession:
+        member = _PooledSession(self, len(self._members))
+        self._members.append(member)
+        member.start()
+        return member
+
+    async def start(self) -> None:
+        """min_size개의 세션을 열고, 하나라도 연결될 때까지 기다립니다."""
+        for _ in range(self.min_size):
+            self._add_member()
+        try:
+            await self._wait_for_healthy()
+        except BaseException:
+            # 시작에 실패하면 __aexit__이 호출되지 않으므로, 재연결 중인 세션을 여기서 멈춥니다.
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        await asyncio.gather(*(member.stop() for member in self._members))
+        self._members.clear()
+
+    async def _wait_for_healthy(self) -> _PooledSession:
+        """연결된 세션이 생길 때까지 connect_timeout초 동안 기다립니다."""
+        waiters = [asyncio.create_task(m.ready.wait()) for m in self._members]
+        try:
+            await asyncio.wait(
+                waiters, timeout=self.connect_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+        healthy = [m for m in self._members if m.healthy]
+        if not healthy:
+            raise ConnectionError(f"MCP 서버({self.url})에 연결할 수 없습니다.")
+        return min(healthy, key=lambda m: m.in_flight)
+
+    async def _acquire(self, exclude: Optional[_PooledSession] = None) -> _PooledSession:
+        """진행 중인 호출이 가장 적은 세션을 고릅니다. 모두 바쁘면 세션을 하나 늘립니다."""
+        healthy = [m for m in self._members if m.healthy and m is not exclude]
+        if not healthy:
+            return await self._wait_for_healthy()
+
+        member = min(healthy, key=lambda m: m.in_flight)
+        if (
+            member.in_flight >= self.max_in_flight_per_session
+            and len(self._members) < self.max_size
+        ):
+            # 새 세션은 연결되는 동안 사용할 수 없으므로, 이번 호출은 기존 세션으로 보냅니다.
+            self._add_member()
+        return member
+
+    async def _dispatch(self, method: Callable[[ClientSession], Awaitable]):
+        """세션 하나를 골라 요청을 보내고, 연결 오류면 다른 세션에서 한 번 더 시도합니다."""
+        member = await self._acquire()
+        for attempt in range(2):
+            member.in_flight += 1
+            member.calls += 1
+            try:
+                return await method(member.session)
+            except McpError:
+                # 서버가 보낸 프로토콜 오류는 연결 문제가 아니므로 그대로 전달합니다.
+                raise
+            except Exception:
+                member.mark_broken()
+                if attempt == 1:
+                    raise
+                self.retries += 1
+            finally:
+                member.in_flight -= 1
+            member = await self._acquire(exclude=member)
+
+    async def list_tools(self, cursor: Optional[str] = None):
+        return await self._dispatch(lambda session: session.list_tools(cursor=cursor))
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None):
+        return await self._dispatch(lambda session: session.call_tool(name, arguments))
+
+    async def load_tools(self) -> List[BaseTool]:
+        """풀을 통해 호출되는 LangChain 도구 목록을 불러옵니다."""
+        tools = await load_mcp_tools(self)
+        self._tool_signature = _tool_signature(tools)
+        return tools
+
+    async def _on_connected(self, member: _PooledSession) -> None:
+        """세션이 (다시) 연결되면 도구 목록이 바뀌었는지 확인합니다."""
+        if self._tool_signature is None or member.reconnects == 0:
+            return
+        async with self._reload_lock:
+            try:
+                tools = await load_mcp_tools(member.session)
+            except Exception as e:
+                print(f"MCP 도구 목록 확인 실패: {e!r}")
+                return
+            signature = _tool_signature(tools)
+            if signature == self._tool_signature:
+                return
+
+            print("MCP 서버의 도구 목록이 바뀌어 도구를 다시 불러옵니다.")
+            self._tool_signature = signature
+            self.tool_reloads += 1
+            if self.on_tools_changed is not None:
+                self.on_tools_changed(await load_mcp_tools(self))
+
+    def stats(self) -> dict:
+        """세션별 상태와 호출 수를 반환합니다."""
+        return {
+            "url": self.url,
+            "size": len(self._members),
+            "healthy": sum(m.healthy for m in self._members),
+            "retries": self.retries,
+            "tool_reloads": self.tool_reloads,
+            "sessions": [
+                {
+                    "index": m.index,
+                    "healthy": m.healthy,
+                    "in_flight": m.in_flight,
+                    "calls": m.calls,
+                    "reconnects": m.reconnects,
+                }
+                for m in self._members
+            ],
+        }
+
+
+def _tool_signature(tools: List[BaseTool]) -> tuple:
+    """도구 이름, 설명, 입력 스키마로 도구 목록이 바뀌었는지 비교할 값을 만듭니다."""
+    return tuple(
+        sorted((tool.name, tool.description, repr(tool.args_schema)) for tool in tools)
+    )
@@ -1,24 +1,86 @@
+import asyncio
+import functools
 import json
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
 import feedparser
 import httpx
 from bs4 import BeautifulSoup
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from mcp.server.fastmcp import FastMCP
-from geopy.geocoders import Nominatim
 
-# ① MCP 서버 인스턴스 생성
-mcp = FastMCP("Yozm-ai-agent")
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
+from tools.geocoding import aget_coordinates
 
-# ② 웹페이지 스크래핑 도구
-@mcp.tool()
-def scrape_page_text(url: str) -> str:
-    """웹페이지의 텍스트 콘텐츠를 스크랩합니다."""
-    resp = httpx.get(url)
+# ① MCP 서버 인스턴스 생성
+mcp = FastMCP("Yozm-ai-agent")
 
-    if resp.status_code != 200:
-        return f"Failed to fetch {url}"
+# 모든 도구가 함께 쓰는 HTTP 커넥션 풀 (서버의 이벤트 루프에서 처음 사용할 때 생성)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 httpx.AsyncClient를 반환합니다."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, follow_redirects=True
+        )
+    return _http_client
+
+
+def async_ttl_cache(ttl: float, maxsize: int = 256):
+    """
+    비동기 함수의 결과를 ttl초 동안 캐싱하는 데코레이터입니다.
+
+    여러 에이전트 세션이 같은 값을 동시에 요청하면 업스트림 호출은 한 번만 하고
+    그 결과를 함께 사용합니다. 예외가 발생한 호출은 캐싱하지 않습니다.
+    """
+
+    def decorator(func):
+        cache: OrderedDict = OrderedDict()  # key -> (만료 시각, 결과)
+        inflight: dict = {}  # key -> 실행 중인 Task
+
+        def store(key, task: asyncio.Task) -> None:
+            inflight.pop(key, None)
+            if task.cancelled() or task.exception() is not None:
+                return
+            cache[key] = (time.monotonic() + ttl, task.result())
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            cached = cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(functools.partial(store, key))
+            # 먼저 요청한 쪽이 취소되어도 다른 대기자를 위해 실행은 계속합니다.
+            return await asyncio.shield(task)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+@async_ttl_cache(ttl=300)
+async def fetch_page_text(url: str) -> str:
+    resp = await get_http_client().get(url)
+    resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
     # body 태그에서 텍스트를 추출하고 공백을 정리합니다.
     if soup.body:
@@ -27,38 +89,48 @@ def scrape_page_text(url: str) -> str:
     return ""
 
 
-# ③ 도시명을 좌표로 변환하는 헬퍼 함수
-def get_coordinates(city_name: str) -> tuple[float, float]:
-    """도시 이름을 받아 위도와 경도를 반환합니다."""
-    geolocator = Nominatim(user_agent="weather_app_langgraph")
-    location = geolocator.geocode(city_name)
-    if location:
-        return location.latitude, location.longitude
-    raise ValueError(f"좌표를 찾을 수 없습니다: {city_name}")
+# ② 웹페이지 스크래핑 도구
+@mcp.tool()
+async def scrape_page_text(url: str) -> str:
+    """웹페이지의 텍스트 콘텐츠를 스크랩합니다."""
+    try:
+        return await fetch_page_text(url)
+    except httpx.HTTPError:
+        return f"Failed to fetch {url}"
+
+
+@async_ttl_cache(ttl=600)
+async def fetch_weather(city_name: str) -> dict:
+    # ③ 도시명을 좌표로 변환 (공용 지오코딩 서비스 사용)
+    latitude, longitude = await aget_coordinates(city_name)
+    url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
+    response = await get_http_client().get(url)
+    response.raise_for_status()
+    return response.json()
 
 
 @mcp.tool()
-def get_weather(city_name: str) -> str:
+async def get_weather(city_name: str) -> str:
     """도시 이름을 받아 해당 도시의 현재 날씨 정보를 반환합니다."""
     print(f"날씨 조회: {city_name}")
-    latitude, longitude = get_coordinates(city_name)
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-    response = httpx.get(url)
-    result = response.json()
+    result = await fetch_weather(city_name.strip())
     print(result)
     return json.dumps(result)
 
 
-# ④ 구글 뉴스 헤드라인 수집 도구
-@mcp.tool()
-def get_news_headlines() -> str:
-    """구글 RSS피드에서 최신 뉴스와 URL을 반환합니다."""
-    rss_url = "https://news.google.com/rss?hl=ko&gl=KR&ceid=KR:ko"
-    feed = feedparser.parse(rss_url)
+NEWS_RSS_URL = "https://news.google.com/rss?hl=ko&gl=KR&ceid=KR:ko"
 
-    if not feed.entries:
-        return "뉴스를 가져올 수 없습니다."
 
+@async_ttl_cache(ttl=30)
+async def fetch_news_feed(rss_url: str):
+    response = await get_http_client().get(rss_url)
+    response.raise_for_status()
+    # RSS 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    return await asyncio.to_thread(feedparser.parse, response.content)
+
+
+def format_news_headlines(feed) -> str:
+    """feedparser 결과를 번호가 매겨진 마크다운 링크 목록으로 만듭니다."""
     news_list = []
     for i, entry in enumerate(feed.entries, 1):
         # feedparser entry 객체에서 직접 속성 접근
@@ -82,28 +154,50 @@ def get_news_headlines() -> str:
     return "\n".join(news_list)
 
 
-# ⑤ KBO 프로야구 순위 조회 도구
+# ④ 구글 뉴스 헤드라인 수집 도구
 @mcp.tool()
-def get_kbo_rank() -> str:
-    """한국 프로야구 구단의 랭킹을 가져옵니다"""
-    result = httpx.get(
+async def get_news_headlines() -> str:
+    """구글 RSS피드에서 최신 뉴스와 URL을 반환합니다."""
+    try:
+        feed = await fetch_news_feed(NEWS_RSS_URL)
+    except httpx.HTTPError:
+        return "뉴스를 가져올 수 없습니다."
+
+    if not feed.entries:
+        return "뉴스를 가져올 수 없습니다."
+    return format_news_headlines(feed)
+
+
+@async_ttl_cache(ttl=600)
+async def fetch_kbo_rank() -> str:
+    result = await get_http_client().get(
         "https://sports.daum.net/prx/hermes/api/team/rank.json?leagueCode=kbo&seasonKey=2025"
     )
+    result.raise_for_status()
     return result.text
 
 
+# ⑤ KBO 프로야구 순위 조회 도구
+@mcp.tool()
+async def get_kbo_rank() -> str:
+    """한국 프로야구 구단의 랭킹을 가져옵니다"""
+    try:
+        return await fetch_kbo_rank()
+    except httpx.HTTPError:
+        return "프로야구 순위를 가져올 수 없습니다."
+
+
+SCHEDULE_EVENTS = ["10:00 팀 미팅", "13:00 점심 약속", "15:00 프로젝트 회의", "19:00 헬스장"]
+
+
 # ⑥ 하드코딩된 일정 반환 도구
 @mcp.tool()
 def today_schedule() -> str:
     """임의의 스케줄을 반환합니다."""
-    events = ["10:00 팀 미팅", "13:00 점심 약속", "15:00 프로젝트 회의", "19:00 헬스장"]
-    return " | ".join(events)
+    return " | ".join(SCHEDULE_EVENTS)
 
 
-# ⑦ LLM을 활용한 명언 생성 도구
-@mcp.tool()
-def daily_quote() -> str:
-    """사용자에게 영감을 주는 명언을 출력합니다"""
+async def generate_daily_quote() -> str:
     # streaming을 False로 설정하여 스트리밍 비활성화
     chat_model = ChatOpenAI(model="gpt-4o-mini")
     prompt = ChatPromptTemplate.from_messages(
@@ -116,42 +210,78 @@ def daily_quote() -> str:
         ]
     )
     chain = prompt | chat_model
-    response = chain.invoke({})
+    response = await chain.ainvoke({})
     return response.content
 
 
-# ⑧ 종합 브리핑 도구 (다른 도구들을 순차적으로 호출)
+# ⑦ LLM을 활용한 명언 생성 도구
+@mcp.tool()
+async def daily_quote() -> str:
+    """사용자에게 영감을 주는 명언을 출력합니다"""
+    return await generate_daily_quote()
+
+
+async def fetch_news_section() -> str:
+    feed = await fetch_news_feed(NEWS_RSS_URL)
+    if not feed.entries:
+        raise ValueError("뉴스를 가져올 수 없습니다.")
+    return format_news_headlines(feed)
+
+
+async def fetch_kbo_section():
+    text = await fetch_kbo_rank()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class PartialBriefingError(Exception):
+    """일부 항목을 가져오지 못한 브리핑. 캐싱하지 않도록 예외로 전달합니다."""
+
+    def __init__(self, briefing: dict):
+        super().__init__("브리핑 일부 항목을 가져오지 못했습니다.")
+        self.briefing = briefing
+
+
+@async_ttl_cache(ttl=60)
+async def build_briefing(city_name: str) -> dict:
+    """
+    브리핑에 필요한 데이터를 동시에 가져옵니다. 실패한 항목은 error로 표시합니다.
+
+    실패한 항목이 있으면 PartialBriefingError로 브리핑을 전달해서, 일시적인 실패가
+    캐시에 남아 다음 요청까지 error로 보이지 않게 합니다.
+    """
+    sections = {
+        "weather": fetch_weather(city_name),
+        "news": fetch_news_section(),
+        "kbo_rank": fetch_kbo_section(),
+        "quote": generate_daily_quote(),
+    }
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+    briefing = {"city": city_name, "schedule": SCHEDULE_EVENTS}
+    for name, result in zip(sections, results):
+        if isinstance(result, Exception):
+            print(f"브리핑 항목 실패 ({name}): {result}")
+            briefing[name] = {"error": str(result) or type(result).__name__}
+        else:
+            briefing[name] = result
+    if any(isinstance(result, Exception) for result in results):
+        raise PartialBriefingError(briefing)
+    return briefing
+
+
+# ⑧ 종합 브리핑 도구 (날씨, 뉴스, 야구 순위, 일정, 명언을 서버에서 동시에 수집)
 @mcp.tool()
-def brief_today() -> str:
-    """사용자의 하루 시작을 돕기 위해 날씨, 뉴스, 일정 등을 종합하여 전달합니다."""
-    return """
-다음을 순서대로 실행하고, 실행한 결과를 사용자에게 알려주세요. 
-첫째로 사용자가 위치한 도시를 파악하세요. 위치를 모른다면, 사용자에게 질문하세요.
-둘째로 사용자의 위치를 기반으로 get_weather 도구를 호출하여 날씨 정보를 찾아서 제공합니다. 
-셋째로 get_news_headlines 도구를 사용하여 오늘의 주요 뉴스를 출력합니다. 
-넷째로 get_kbo_rank 도구를 사용하여 현재 시간 프로야구 랭킹 및 전적을 리스트 형태로 출력합니다.  
-다섯째로 today_schedule 도구를 사용하여 오늘 사용자의 일정을 알려줍니다. 
-마지막으로 daily_quote 을 사용하여 명언을 출력하고, 따뜻한 말한마디를 덧붙입니다. 
-
-출력은 다음과 같이 해주세요.
-## 사용자님을 위한 맞춤 요약  
-    
-### 오늘의 날씨
-[get_weather 의 결과]
-
-### 오늘자 주요 뉴스
-[get_news_headlines 의 결과] (링크를 함께 제공합니다)
-
-
-### 야구단 랭킹 
-[get_kbo_rank 의 결과]
-
-### 오늘의 업무 일정
-[today_schedule 의 결과]
-
-### 영감을 주는 격언 한마디
-[daily_quote 의 결과]
-"""
+async def brief_today(city_name: str) -> str:
+    """사용자의 하루 시작을 돕기 위해 도시의 날씨, 주요 뉴스, 프로야구 순위, 오늘 일정, 명언을 한 번에 모아 JSON으로 반환합니다."""
+    print(f"브리핑 생성: {city_name}")
+    try:
+        briefing = await build_briefing(city_name.strip())
+    except PartialBriefingError as e:
+        briefing = e.briefing
+    return json.dumps(briefing, ensure_ascii=False)
 
 
 # ⑨ 메인 실행 부분
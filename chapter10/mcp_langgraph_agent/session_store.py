@@ -0,0 +1,295 @@
+"""
+채팅 에이전트의 세션(thread) 상태를 관리하는 모듈
+
+- 체크포인터 백엔드 선택: 메모리(InMemorySaver) 또는 SQLite 파일 (여러 uvicorn 워커가 공유 가능)
+- 세션 수 상한(LRU)과 유휴 시간(TTL)을 넘은 세션의 체크포인트 삭제
+  (SQLite 백엔드는 세션별 마지막 사용 시각을 같은 파일의 session_activity 테이블에 기록해
+  모든 워커가 같은 기준으로 정리합니다)
+- 응답이 끝난 세션의 이전 체크포인트 정리 (최신 체크포인트만 유지)
+- 대화 기록이 길어지면 최근 대화만 남기도록 상태를 압축하는 pre_model_hook
+- /stats 엔드포인트에서 사용할 사용량 카운터
+
+환경 변수:
+    CHECKPOINT_BACKEND: "memory" 또는 "sqlite" (기본값: "memory")
+    CHECKPOINT_DB_PATH: SQLite 파일 경로 (기본값: 이 파일 옆의 checkpoints.sqlite3)
+    MAX_SESSIONS: 유지할 최대 세션 수 (기본값: 1000, SQLite 백엔드는 모든 워커 합계)
+    SESSION_IDLE_TTL: 세션 유휴 만료 시간(초) (기본값: 1800)
+    MAX_HISTORY_MESSAGES: 세션에 남겨 둘 최대 메시지 수 (기본값: 40)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage, RemoveMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+try:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:
+    AsyncSqliteSaver = None
+
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "memory")
+CHECKPOINT_DB_PATH = os.getenv(
+    "CHECKPOINT_DB_PATH", str(Path(__file__).resolve().parent / "checkpoints.sqlite3")
+)
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+MAX_HISTORY_MESSAGES = int(os.getenv("MAX_HISTORY_MESSAGES", "40"))
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    backend: str = CHECKPOINT_BACKEND, db_path: str = CHECKPOINT_DB_PATH
+):
+    """설정한 백엔드의 체크포인터를 열고, 종료 시 연결을 정리합니다."""
+    if backend == "memory":
+        yield InMemorySaver()
+        return
+
+    if backend == "sqlite":
+        if AsyncSqliteSaver is None:
+            raise RuntimeError(
+                "SQLite 체크포인터를 사용하려면 langgraph-checkpoint-sqlite 패키지를 설치하세요: "
+                "pip install langgraph-checkpoint-sqlite"
+            )
+
+        async with AsyncSqliteSaver.from_conn_string(db_path) as saver:
+            await saver.setup()
+            yield saver
+        return
+
+    raise ValueError(
+        f"Invalid CHECKPOINT_BACKEND: {backend}. Must be 'memory' or 'sqlite'."
+    )
+
+
+class SessionStore:
+    """
+    세션별 마지막 사용 시각을 추적하고, 오래되었거나 넘치는 세션의 체크포인트를 삭제합니다.
+
+    SQLite 체크포인터를 쓰면 마지막 사용 시각을 같은 파일의 session_activity 테이블에 저장하므로,
+    여러 워커가 파일을 공유해도 다른 워커에서 사용 중인 세션을 지우지 않습니다.
+    InMemorySaver는 프로세스마다 따로 있으므로 사용 시각도 메모리에 둡니다.
+
+    Args:
+        checkpointer: 세션 상태가 저장된 LangGraph 체크포인터 (InMemorySaver 또는 AsyncSqliteSaver)
+        max_sessions (int): 유지할 최대 세션 수. 넘으면 가장 오래 사용하지 않은 세션부터 삭제
+        idle_ttl (float): 이 시간(초) 동안 사용하지 않은 세션은 삭제
+        max_history_messages (int): 세션에 남겨 둘 최대 메시지 수
+    """
+
+    def __init__(
+        self,
+        checkpointer,
+        max_sessions: int = MAX_SESSIONS,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_history_messages: int = MAX_HISTORY_MESSAGES,
+    ):
+        self.checkpointer = checkpointer
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_history_messages = max_history_messages
+        self.evictions = 0
+        self.compactions = 0
+        self.compacted_messages = 0
+        self._last_seen: OrderedDict[str, float] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_sqlite(self) -> bool:
+        return AsyncSqliteSaver is not None and isinstance(self.checkpointer, AsyncSqliteSaver)
+
+    async def setup(self) -> None:
+        """
+        사용 시각 테이블을 만들고, 기록이 없는 기존 세션(재시작 전에 저장된 세션 등)을
+        지금 사용한 것으로 등록한 뒤 정리합니다. 등록된 세션은 유휴 시간이 지나면 삭제됩니다.
+        """
+        if self.is_sqlite:
+            saver = self.checkpointer
+            async with saver.lock:
+                await saver.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS session_activity ("
+                    "thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+                )
+                await saver.conn.execute(
+                    "INSERT OR IGNORE INTO session_activity (thread_id, last_seen) "
+                    "SELECT DISTINCT thread_id, ? FROM checkpoints",
+                    (time.time(),),
+                )
+                await saver.conn.commit()
+        await self.evict()
+
+    async def touch(self, session_id: str) -> None:
+        """세션 사용을 기록하고, 필요하면 다른 세션을 정리합니다."""
+        if self.is_sqlite:
+            saver = self.checkpointer
+            async with saver.lock:
+                await saver.conn.execute(
+                    "INSERT INTO session_activity (thread_id, last_seen) VALUES (?, ?) "
+                    "ON CONFLICT(thread_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (session_id, time.time()),
+                )
+                await saver.conn.commit()
+        else:
+            async with self._lock:
+                self._last_seen[session_id] = time.monotonic()
+                self._last_seen.move_to_end(session_id)
+        await self.evict()
+
+    async def evict(self) -> int:
+        """상한을 넘었거나 유휴 시간이 지난 세션을 삭제하고, 삭제한 세션 수를 반환합니다."""
+        if self.is_sqlite:
+            victims = await self._evict_sqlite()
+        else:
+            victims = await self._evict_memory()
+
+        for session_id in victims:
+            await self.checkpointer.adelete_thread(session_id)
+        self.evictions += len(victims)
+        return len(victims)
+
+    async def _evict_memory(self) -> list:
+        now = time.monotonic()
+        victims = []
+        async with self._lock:
+            while self._last_seen:
+                session_id, last_seen = next(iter(self._last_seen.items()))
+                over_limit = len(self._last_seen) > self.max_sessions
+                if not over_limit and now - last_seen < self.idle_ttl:
+                    break
+                self._last_seen.popitem(last=False)
+                victims.append(session_id)
+        return victims
+
+    async def _evict_sqlite(self) -> list:
+        """만료/초과 세션의 사용 기록을 지우고, 이 워커가 지운 세션 ID만 반환합니다."""
+        saver = self.checkpointer
+        victims = []
+        async with saver.lock:
+            async with saver.conn.execute(
+                "SELECT thread_id, last_seen FROM session_activity WHERE last_seen <= ? "
+                "UNION SELECT * FROM (SELECT thread_id, last_seen FROM session_activity "
+                "ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                (time.time() - self.idle_ttl, self.max_sessions),
+            ) as cursor:
+                candidates = await cursor.fetchall()
+            for thread_id, last_seen in candidates:
+                # 그 사이 다른 워커가 사용했거나 먼저 지웠으면 (last_seen이 바뀜) 건너뜁니다.
+                cursor = await saver.conn.execute(
+                    "DELETE FROM session_activity WHERE thread_id = ? AND last_seen = ?",
+                    (thread_id, last_seen),
+                )
+                if cursor.rowcount:
+                    victims.append(thread_id)
+            await saver.conn.commit()
+        return victims
+
+    async def prune(self, session_id: str) -> None:
+        """세션의 이전 체크포인트를 지우고 네임스페이스마다 최신 체크포인트만 남깁니다."""
+        if self.is_sqlite:
+            saver = self.checkpointer
+            async with saver.lock:
+                for table in ("checkpoints", "writes"):
+                    await saver.conn.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ? "
+                        "AND (checkpoint_ns, checkpoint_id) NOT IN ("
+                        "SELECT checkpoint_ns, MAX(checkpoint_id) FROM checkpoints "
+                        "WHERE thread_id = ? GROUP BY checkpoint_ns)",
+                        (session_id, session_id),
+                    )
+                await saver.conn.commit()
+        elif isinstance(self.checkpointer, InMemorySaver):
+            self._prune_memory(session_id)
+
+    def _prune_memory(self, session_id: str) -> None:
+        saver = self.checkpointer
+        if session_id not in saver.storage:
+            return
+        for checkpoint_ns, checkpoints in saver.storage[session_id].items():
+            if not checkpoints:
+                continue
+            keep = max(checkpoints)
+            versions = saver.serde.loads_typed(checkpoints[keep][0])["channel_versions"]
+            for checkpoint_id in [cid for cid in checkpoints if cid != keep]:
+                del checkpoints[checkpoint_id]
+            for key in [
+                k for k in saver.writes
+                if k[0] == session_id and k[1] == checkpoint_ns and k[2] != keep
+            ]:
+                del saver.writes[key]
+            # 최신 체크포인트가 참조하지 않는 이전 버전의 채널 값도 삭제합니다.
+            for key in [
+                k for k in saver.blobs
+                if k[0] == session_id and k[1] == checkpoint_ns and versions.get(k[2]) != k[3]
+            ]:
+                del saver.blobs[key]
+
+    def compact_history(self, state) -> dict:
+        """
+        대화 기록을 최근 max_history_messages개 정도로 줄이는 pre_model_hook입니다.
+
+        도구 호출과 도구 결과가 나뉘지 않도록 사람 메시지에서 시작하는 구간만 남기며,
+        상태 자체를 교체하므로 체크포인트 크기도 함께 줄어듭니다.
+        """
+        messages = state["messages"]
+        if len(messages) <= self.max_history_messages:
+            return {}
+
+        human_indices = [
+            i for i, message in enumerate(messages) if isinstance(message, HumanMessage)
+        ]
+        if not human_indices:
+            return {}
+        # 최근 구간 안의 첫 사람 메시지부터 남기고, 없으면 마지막 사람 메시지부터 남깁니다.
+        cutoff = len(messages) - self.max_history_messages
+        start = next((i for i in human_indices if i >= cutoff), human_indices[-1])
+        if start == 0:
+            return {}
+
+        self.compactions += 1
+        self.compacted_messages += start
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *messages[start:]]}
+
+    async def sweep_forever(self, interval: float = 60.0) -> None:
+        """주기적으로 유휴 세션을 정리하는 백그라운드 루프"""
+        while True:
+            await asyncio.sleep(interval)
+            evicted = await self.evict()
+            if evicted:
+                print(f"유휴 세션 {evicted}개를 정리했습니다.")
+
+    async def usage(self) -> dict:
+        """현재 세션 수와 체크포인트 사용량을 반환합니다."""
+        usage = {
+            "backend": type(self.checkpointer).__name__,
+            "max_sessions": self.max_sessions,
+            "idle_ttl": self.idle_ttl,
+            "evictions": self.evictions,
+            "compactions": self.compactions,
+            "compacted_messages": self.compacted_messages,
+        }
+        if self.is_sqlite:
+            saver = self.checkpointer
+            async with saver.lock:
+                async with saver.conn.execute("SELECT COUNT(*) FROM session_activity") as cursor:
+                    (usage["active_sessions"],) = await cursor.fetchone()
+                async with saver.conn.execute("SELECT COUNT(*) FROM checkpoints") as cursor:
+                    (usage["stored_checkpoints"],) = await cursor.fetchone()
+                async with saver.conn.execute(
+                    "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+                ) as cursor:
+                    (usage["db_size_bytes"],) = await cursor.fetchone()
+        elif isinstance(self.checkpointer, InMemorySaver):
+            usage["active_sessions"] = len(self._last_seen)
+            usage["stored_threads"] = len(self.checkpointer.storage)
+            usage["stored_checkpoints"] = sum(
+                len(checkpoints)
+                for namespaces in self.checkpointer.storage.values()
+                for checkpoints in namespaces.values()
+            )
+        return usage
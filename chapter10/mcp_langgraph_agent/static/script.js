@@ -78,11 +78,38 @@ const ChatApp = {
   },
 
   /**
-   * 서버로부터 봇의 응답을 스트리밍합니다.
+   * 서버로부터 봇의 응답을 SSE 이벤트로 받아 스트리밍합니다.
    * @param {string} message - 사용자가 보낸 메시지
    * @param {HTMLElement} botMessageElement - 봇 메시지를 표시할 요소
    */
   async streamBotResponse(message, botMessageElement) {
+    const state = { content: "", renderScheduled: false };
+
+    // 마크다운 렌더링은 비용이 크므로 화면 갱신 주기마다 한 번만 수행합니다.
+    const scheduleRender = () => {
+      if (state.renderScheduled) return;
+      state.renderScheduled = true;
+      requestAnimationFrame(() => {
+        state.renderScheduled = false;
+        botMessageElement.innerHTML = marked.parse(state.content);
+        this.scrollToBottom();
+      });
+    };
+
+    const handlers = {
+      token: (data) => {
+        state.content += data.text;
+        scheduleRender();
+      },
+      tool_start: (data) => this.appendToolStatus(data),
+      tool_end: (data) => this.completeToolStatus(data),
+      error: (data) => {
+        state.content += `\n\n${data.message}`;
+        scheduleRender();
+      },
+      done: () => scheduleRender(),
+    };
+
     try {
       const response = await fetch("/chat", {
         method: "POST",
@@ -99,16 +126,20 @@ const ChatApp = {
 
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
-      let content = "";
+      let buffer = "";
 
-      // 스트림을 읽어서 화면에 점진적으로 표시합니다.
+      // 스트림을 읽어서 빈 줄로 구분된 SSE 이벤트 단위로 처리합니다.
       while (true) {
         const { value, done } = await reader.read();
         if (done) break;
 
-        content += decoder.decode(value, { stream: true });
-        botMessageElement.innerHTML = marked.parse(content);
-        this.scrollToBottom();
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const { event, data } = this.parseSseEvent(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          handlers[event]?.(data);
+        }
       }
     } catch (error) {
       console.error("스트리밍 중 오류 발생:", error);
@@ -117,6 +148,54 @@ const ChatApp = {
     }
   },
 
+  /**
+   * SSE 이벤트 블록 하나를 이벤트 이름과 데이터로 변환합니다.
+   * @param {string} block - "event: ..." / "data: ..." 줄로 이루어진 문자열
+   * @returns {{event: string, data: object}} 파싱된 이벤트
+   */
+  parseSseEvent(block) {
+    let event = "message";
+    const dataLines = [];
+    for (const line of block.split("\n")) {
+      if (line.startsWith("event:")) {
+        event = line.slice(6).trim();
+      } else if (line.startsWith("data:")) {
+        dataLines.push(line.slice(5).trimStart());
+      }
+    }
+    return { event, data: dataLines.length ? JSON.parse(dataLines.join("\n")) : {} };
+  },
+
+  /**
+   * 도구 호출이 시작되었음을 채팅 박스에 표시합니다.
+   * @param {{id: string, name: string}} data - tool_start 이벤트 데이터
+   */
+  appendToolStatus(data) {
+    const statusElement = document.createElement("div");
+    statusElement.classList.add("tool-status");
+    statusElement.dataset.toolId = data.id;
+    statusElement.textContent = `🔧 ${data.name} 실행 중...`;
+    // 봇 메시지 위에 표시되도록 마지막 메시지 앞에 넣습니다.
+    this.elements.chatBox.insertBefore(
+      statusElement,
+      this.elements.chatBox.lastElementChild
+    );
+    this.scrollToBottom();
+  },
+
+  /**
+   * 도구 호출이 끝났음을 표시합니다.
+   * @param {{id: string, name: string}} data - tool_end 이벤트 데이터
+   */
+  completeToolStatus(data) {
+    const statusElement = this.elements.chatBox.querySelector(
+      `.tool-status[data-tool-id="${data.id}"]`
+    );
+    if (statusElement) {
+      statusElement.textContent = `✅ ${data.name} 완료`;
+    }
+  },
+
   /**
    * 새로운 메시지 요소를 생성하고 DOM에 추가합니다.
    * @param {string} sender - 메시지를 보낸 사람 ('user' 또는 'bot')
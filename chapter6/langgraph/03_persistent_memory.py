@@ -1,39 +1,125 @@
-from typing import Dict, Any
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Literal, Optional
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver  # ① InMemorySaver 임포트
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
-import json
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from utils.delta_checkpoint import DeltaSqliteSaver  # ① DeltaSqliteSaver 임포트
+from utils.structured_output import invoke_structured
+from utils.tokens import count_tokens
+
+# 메모리 설정
+MEMORY_DB_PATH = os.getenv(
+    "MEMORY_DB_PATH", str(Path(__file__).resolve().parent / "memory_bot.sqlite3")
+)
+MAX_PREFERENCES = 20  # 카테고리(좋아하는 것/싫어하는 것)마다 기억할 최대 항목 수
+KEEP_RECENT_TURNS = 6  # 요약하지 않고 그대로 남겨 둘 최근 대화 수
+COMPACT_EVERY_TURNS = 10  # 최근 대화가 이만큼 더 쌓이면 오래된 대화를 요약에 합칩니다
+TURN_MAX_CHARS = 1000  # 대화 한 턴에서 저장할 최대 글자 수
+SUMMARY_MAX_CHARS = 800  # 대화 요약의 최대 글자 수
+PROMPT_MEMORY_TOKENS = 1500  # 시스템 프롬프트에 넣을 기억의 토큰 예산
 
 
 # ② 그래프 상태 정의
 class MemoryBotState(BaseModel):
     user_message: str = Field(default="", description="사용자 입력 메시지")
     user_name: str = Field(default="", description="사용자 이름")
-    user_preferences: Dict[str, Any] = Field(
-        default_factory=dict, description="사용자 선호도"
+    user_preferences: Dict[str, List[str]] = Field(
+        default_factory=dict, description="사용자 선호도 (중복 없이 최근 언급 순)"
     )
+    history_summary: str = Field(default="", description="오래된 대화의 요약")
+    recent_turns: List[Dict[str, str]] = Field(
+        default_factory=list, description="최근 대화 ({'user': ..., 'bot': ...})"
+    )
+    turn_count: int = Field(default=0, description="전체 대화 수")
     response: str = Field(default="", description="최종 응답")
 
 
+# LLM 응답 형식
+class MemoryUpdate(BaseModel):
+    response: str = Field(description="사용자에게 줄 응답 메시지")
+    new_name: Optional[str] = Field(default=None, description="새로 알게 된 이름")
+    new_likes: list[str] = Field(default_factory=list, description="새로 알게 된 좋아하는 것들")
+    new_dislikes: list[str] = Field(default_factory=list, description="새로 알게 된 싫어하는 것들")
+
+
 # LangChain LLM 초기화
 llm = ChatOpenAI(model="gpt-5-mini")
 
 
+def normalize_preference(item: str) -> str:
+    """공백과 앞뒤 문장 부호를 정리해서 같은 항목이 같은 문자열이 되도록 합니다."""
+    return " ".join(str(item).split()).strip(" .,!?~")
+
+
+def merge_preferences(
+    preferences: Dict[str, List[str]], likes: List[str], dislikes: List[str]
+) -> Dict[str, List[str]]:
+    """
+    새로 알게 된 선호도를 합칩니다.
+
+    같은 항목(대소문자 무시)은 한 번만 남기되 최근 언급 순서로 뒤로 옮기고, 반대 목록에
+    있던 항목은 지웁니다 (마음이 바뀐 경우). 카테고리마다 최근 MAX_PREFERENCES개만 유지합니다.
+    """
+    merged = {category: list(items) for category, items in preferences.items()}
+    for category, opposite, items in (
+        ("likes", "dislikes", likes),
+        ("dislikes", "likes", dislikes),
+    ):
+        for item in items:
+            item = normalize_preference(item)
+            if not item:
+                continue
+            key = item.casefold()
+            merged[category] = [
+                x for x in merged.get(category, []) if x.casefold() != key
+            ] + [item]
+            merged[opposite] = [x for x in merged.get(opposite, []) if x.casefold() != key]
+    return {category: items[-MAX_PREFERENCES:] for category, items in merged.items()}
+
+
+def build_memory_context(state: MemoryBotState) -> str:
+    """
+    시스템 프롬프트에 넣을 기억을 PROMPT_MEMORY_TOKENS 안에서 조립합니다.
+
+    이름, 선호도, 대화 요약은 항상 넣고, 남은 예산만큼 최근 대화를 최신 것부터 채웁니다.
+    """
+    preferences = state.user_preferences
+    memory = f"""- 사용자 이름: {state.user_name or "모름"}
+- 좋아하는 것: {", ".join(preferences.get("likes", [])) or "없음"}
+- 싫어하는 것: {", ".join(preferences.get("dislikes", [])) or "없음"}"""
+    if state.history_summary:
+        memory += f"\n\n이전 대화 요약:\n{state.history_summary}"
+
+    budget = PROMPT_MEMORY_TOKENS - count_tokens(memory)
+    turns = []
+    for turn in reversed(state.recent_turns):
+        text = f"사용자: {turn['user']}\n챗봇: {turn['bot']}"
+        tokens = count_tokens(text)
+        if tokens > budget:
+            break
+        turns.append(text)
+        budget -= tokens
+    if turns:
+        memory += "\n\n최근 대화:\n" + "\n".join(reversed(turns))
+    return memory
+
+
 # ③ 메시지 처리 노드
 def process_message(state: MemoryBotState) -> Dict[str, Any]:
     message = state.user_message
-    user_name = state.user_name
-    preferences = state.user_preferences.copy()
 
     # 시스템 프롬프트
     system_prompt = f"""
 당신은 사용자의 정보를 기억하는 메모리 봇입니다.
 현재 기억하고 있는 정보:
-- 사용자 이름: {user_name if user_name else "모름"}
-- 좋아하는 것: {preferences.get("likes", [])}
-- 싫어하는 것: {preferences.get("dislikes", [])}
+{build_memory_context(state)}
 
 사용자 메시지를 분석하여 다음 JSON 형태로 응답하세요:
 {{
@@ -46,49 +132,83 @@ def process_message(state: MemoryBotState) -> Dict[str, Any]:
 
     messages = [SystemMessage(content=system_prompt), HumanMessage(content=message)]
 
-    response = llm.invoke(messages)
-    result = json.loads(response.content)
-
-    # 새로운 정보 업데이트
-    if result.get("new_name"):
-        user_name = result["new_name"]
+    result = invoke_structured(llm, messages, MemoryUpdate)
 
-    if result.get("new_likes"):
-        preferences.setdefault("likes", []).extend(result["new_likes"])
-
-    if result.get("new_dislikes"):
-        preferences.setdefault("dislikes", []).extend(result["new_dislikes"])
+    # 새로운 정보 업데이트 (중복 없이 합치기)
+    user_name = normalize_preference(result.new_name or "") or state.user_name
+    preferences = merge_preferences(
+        state.user_preferences, result.new_likes, result.new_dislikes
+    )
 
-    bot_response = result.get("response", "죄송해요, 이해하지 못했어요.")
+    bot_response = result.response or "죄송해요, 이해하지 못했어요."
+    turn = {"user": message[:TURN_MAX_CHARS], "bot": bot_response[:TURN_MAX_CHARS]}
 
     return {
         "response": bot_response,
         "user_name": user_name,
         "user_preferences": preferences,
+        "recent_turns": state.recent_turns + [turn],
+        "turn_count": state.turn_count + 1,
     }
 
 
-# ④ 메모리 봇 그래프 생성
-def create_memory_bot_graph():
-    # ⑤ InMemorySaver로 자동 메모리 관리
-    checkpointer = InMemorySaver()
+# ④ 대화 압축 노드: 오래된 대화를 요약에 합치고 최근 대화만 남깁니다.
+def compact_history(state: MemoryBotState) -> Dict[str, Any]:
+    old_turns = state.recent_turns[:-KEEP_RECENT_TURNS]
+    conversation = "\n".join(
+        f"사용자: {turn['user']}\n챗봇: {turn['bot']}" for turn in old_turns
+    )
+    prompt = f"""다음은 지금까지의 대화 요약과 그 뒤에 이어진 대화입니다.
+둘을 합쳐 {SUMMARY_MAX_CHARS}자 이내의 새 요약을 작성하세요.
+사용자에 대해 알게 된 사실, 사용자가 부탁한 일, 이어지고 있는 주제 위주로 정리하세요.
 
+기존 요약:
+{state.history_summary or "없음"}
+
+이어진 대화:
+{conversation}"""
+
+    response = llm.invoke([HumanMessage(content=prompt)])
+    return {
+        "history_summary": response.text()[:SUMMARY_MAX_CHARS],
+        "recent_turns": state.recent_turns[-KEEP_RECENT_TURNS:],
+    }
+
+
+def route_after_message(state: MemoryBotState) -> Literal["compact_history", "__end__"]:
+    """최근 대화가 충분히 쌓였으면 압축합니다."""
+    if len(state.recent_turns) >= KEEP_RECENT_TURNS + COMPACT_EVERY_TURNS:
+        return "compact_history"
+    return END
+
+
+# ⑤ 체크포인터 열기: SQLite 파일에 저장해 프로그램을 다시 실행해도 기억이 남습니다.
+#    DeltaSqliteSaver는 바뀐 필드만 기록하므로, 응답 하나가 바뀔 때 쌓인 기억 전체를 다시 쓰지 않습니다.
+@contextmanager
+def open_checkpointer(db_path: str = MEMORY_DB_PATH):
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        yield saver
+
+
+# ⑥ 메모리 봇 그래프 생성
+def create_memory_bot_graph(checkpointer):
     workflow = StateGraph(MemoryBotState)
 
     workflow.add_node("process_message", process_message)
+    workflow.add_node("compact_history", compact_history)
 
     workflow.add_edge(START, "process_message")
-    workflow.add_edge("process_message", END)
+    workflow.add_conditional_edges("process_message", route_after_message)
+    workflow.add_edge("compact_history", END)
 
-    # ⑥ checkpointer와 함께 컴파일
+    # ⑦ checkpointer와 함께 컴파일
     return workflow.compile(checkpointer=checkpointer)
 
 
 def main():
-    print("=== InMemorySaver 메모리 봇 테스트 ===\n")
+    print("=== 영구 메모리 봇 테스트 ===\n")
 
-    app = create_memory_bot_graph()
-    thread_id = "gyul_123"  # ⑦ thread_id - 세션 식별자
+    thread_id = "gyul_123"  # ⑧ thread_id - 세션 식별자
 
     # 테스트 대화
     conversations = [
@@ -100,18 +220,24 @@ def main():
         "내가 좋아하는 것과 싫어하는 것은?",
     ]
 
-    for i, message in enumerate(conversations, 1):
-        print(f"[{i}] 사용자: {message}")
+    with open_checkpointer() as checkpointer:
+        app = create_memory_bot_graph(checkpointer)
+
+        for i, message in enumerate(conversations, 1):
+            print(f"[{i}] 사용자: {message}")
 
-        # ⑧ InMemorySaver 사용을 위한 config 설정
-        config = {"configurable": {"thread_id": thread_id}}
-        result = app.invoke({"user_message": message}, config)
+            # ⑨ 체크포인터 사용을 위한 config 설정
+            config = {"configurable": {"thread_id": thread_id}}
+            result = app.invoke({"user_message": message}, config)
+            # 기억은 모두 최신 상태에 들어 있으므로 이전 체크포인트는 지웁니다.
+            checkpointer.prune([thread_id], strategy="keep_latest")
 
-        print(f"[{i}] 챗봇: {result['response']}")
-        print(
-            f"메모리: 이름={result.get('user_name', '없음')}, "
-            f"좋아하는 것={result.get('user_preferences', {})}\n"
-        )
+            print(f"[{i}] 챗봇: {result['response']}")
+            print(
+                f"메모리: 이름={result.get('user_name', '없음')}, "
+                f"선호도={result.get('user_preferences', {})}, "
+                f"전체 대화 {result['turn_count']}회 (최근 {len(result['recent_turns'])}회 보관)\n"
+            )
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
+import sys
+from pathlib import Path
 from typing import Dict, Any, Literal
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.messages import SystemMessage, HumanMessage
-import json
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from utils.structured_output import invoke_structured
+from tutor_content_bank import ContentBank, Quiz, build_quiz_messages, is_valid_quiz
 
 
 # ① 학습 상태 정의
@@ -20,11 +26,15 @@ class TutorState(BaseModel):
     max_quizzes: int = Field(default=3, description="최대 퀴즈 수")
     status: str = Field(default="explaining", description="상태: explaining, quizzing, reviewing, done")
     previous_questions: list[str] = Field(default_factory=list, description="이전에 낸 문제들")
+    seen_quiz_ids: list[int] = Field(default_factory=list, description="퀴즈 은행에서 이미 낸 문제 ID")
 
 
 # LLM 초기화
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
 
+# 주제별 설명 캐시와 퀴즈 은행 (tutor_content_bank.py)
+bank = ContentBank(llm, OpenAIEmbeddings(model="text-embedding-3-small"))
+
 
 # ② 주제 설명 노드
 def explain_topic(state: TutorState) -> Dict[str, Any]:
@@ -35,18 +45,11 @@ def explain_topic(state: TutorState) -> Dict[str, Any]:
         print(f"\n=== 📚 AI 학습 튜터 시작! ===")
         print(f"주제: {topic}\n")
     
-    system_prompt = f"""당신은 친절한 선생님입니다.
-'{topic}' 주제를 쉽고 명확하게 설명하세요.
+    # 캐시된 설명이 있으면 LLM을 호출하지 않습니다.
+    explanation = bank.explanation(topic)
 
-3-4문장으로 핵심 개념을 설명하되, 예시를 포함하세요."""
-    
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=f"{topic}에 대해 설명해주세요.")
-    ]
-    
-    response = llm.invoke(messages)
-    explanation = response.content
+    # 학습자가 설명을 읽는 동안 퀴즈 은행을 백그라운드에서 채웁니다.
+    bank.fill_in_background(topic)
     
     print(f"📖 설명:\n{explanation}\n")
     
@@ -59,44 +62,23 @@ def explain_topic(state: TutorState) -> Dict[str, Any]:
 # ③ 퀴즈 생성 노드
 def generate_quiz(state: TutorState) -> Dict[str, Any]:
     """학습 내용에 대한 퀴즈를 생성합니다."""
-    print("🧠 퀴즈를 생성 중...\n")
-    
-    # 이전 문제들이 있으면 표시
-    previous_questions_text = ""
-    if state.previous_questions:
-        previous_questions_text = "\n\n이미 낸 문제들 (중복 금지):\n" + "\n".join(
-            f"- {q}" for q in state.previous_questions
-        )
-    
-    system_prompt = f"""당신은 퀴즈 출제자입니다.
-다음 설명을 바탕으로 4지선다 퀴즈를 만드세요:
-
-{state.explanation}
-{previous_questions_text}
-
-다음 JSON 형식으로 응답하세요:
-{{
-  "question": "질문 (명확하고 구체적으로)",
-  "choices": ["선택지1", "선택지2", "선택지3", "선택지4"],
-  "answer": "정답 선택지의 정확한 텍스트"
-}}
-
-중요: 
-- 이전에 낸 문제와 완전히 다른 각도의 문제를 만드세요
-- 같은 개념의 다른 측면을 다루세요
-- 난이도는 중간 정도로, 이해도를 확인할 수 있는 문제를 만드세요"""
-    
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content="퀴즈를 만들어주세요.")
-    ]
-    
-    response = llm.invoke(messages)
-    result = json.loads(response.content)
-    
-    question = result["question"]
-    choices = result["choices"]
-    answer = result["answer"]
+    seen_quiz_ids = state.seen_quiz_ids.copy()
+    
+    # 퀴즈 은행에 아직 풀지 않은 문제가 있으면 바로 출제합니다.
+    banked = bank.draw_quiz(state.topic, exclude_ids=seen_quiz_ids)
+    if banked is not None:
+        print("⚡ 퀴즈 은행에서 출제합니다.\n")
+        question, choices, answer = banked.question, banked.choices, banked.answer
+        seen_quiz_ids.append(banked.quiz_id)
+    else:
+        print("🧠 퀴즈를 생성 중...\n")
+        # 이전 문제는 최근 몇 개만 프롬프트에 넣습니다.
+        messages = build_quiz_messages(state.explanation, state.previous_questions)
+        quiz = invoke_structured(llm, messages, Quiz)
+        question, choices, answer = quiz.question, quiz.choices, quiz.answer
+        # 직접 생성한 문제도 은행에 넣어 다음 학습자가 쓸 수 있게 합니다.
+        if is_valid_quiz(quiz) and (added := bank.add_quiz(state.topic, quiz)) is not None:
+            seen_quiz_ids.append(added.quiz_id)
     
     print(f"❓ 퀴즈 #{state.quiz_count + 1}")
     print(f"{question}\n")
@@ -112,6 +94,7 @@ def generate_quiz(state: TutorState) -> Dict[str, Any]:
         "quiz_choices": choices,
         "quiz_answer": answer,
         "previous_questions": updated_previous,
+        "seen_quiz_ids": seen_quiz_ids,
         "status": "reviewing"
     }
 
@@ -1,9 +1,20 @@
-from typing import Dict, Any, Literal
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Any, Literal, List, Optional, Tuple, Union
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
-import json
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from utils.structured_output import ainvoke_structured, invoke_structured
+from utils.tokens import count_tokens
 
 
 # ① 게임 상태 정의
@@ -17,12 +28,225 @@ class StoryGameState(BaseModel):
     game_status: str = Field(default="playing", description="게임 상태: playing, ended")
 
 
+# 장면 생성 결과 형식
+class Scene(BaseModel):
+    scene: str = Field(description="장면 설명")
+    choices: list[str] = Field(description="선택지 3개")
+
+
 # LLM 초기화
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.8)
 
+# 추측 실행에서 동시에 보낼 최대 장면 생성 요청 수 (선택지 수와 같으면 모두 동시에 생성)
+SPECULATION_MAX_CONCURRENCY = 3
+
+
+def build_next_scene_messages(story_context: str, user_choice: str) -> List[BaseMessage]:
+    system_prompt = f"""당신은 인터랙티브 스토리 작가입니다.
+이전 스토리와 사용자의 선택을 바탕으로 다음 장면을 생성하세요.
+
+이전 맥락: {story_context}
+사용자 선택: {user_choice}
+
+다음 JSON 형식으로 응답하세요:
+{{
+  "scene": "다음 장면 설명 (3-4문장, 사용자 선택의 결과를 반영)",
+  "choices": ["선택지1", "선택지2", "선택지3"]
+}}
+
+스토리는 자연스럽게 연결되고 흥미진진해야 합니다."""
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content="다음 장면을 생성해주세요.")
+    ]
+
+
+def build_ending_messages(story_context: str, user_choice: str) -> List[BaseMessage]:
+    system_prompt = f"""당신은 스토리 작가입니다.
+다음 스토리를 감동적이고 만족스럽게 마무리하세요.
+
+스토리 맥락:
+{story_context}
+
+마지막 선택: {user_choice}
+
+2-3문장으로 멋진 결말을 작성하세요."""
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content="스토리를 마무리해주세요.")
+    ]
+
+
+def estimate_tokens(messages: List[BaseMessage], output: Union[Scene, str]) -> int:
+    """비용 비교용으로 요청 하나의 입력+출력 토큰 수를 추정합니다."""
+    text = output.model_dump_json() if isinstance(output, Scene) else output
+    return sum(count_tokens(m.text()) for m in messages) + count_tokens(text)
+
+
+async def agenerate_continuation(
+    story_context: str, user_choice: str, ending: bool
+) -> Tuple[Union[Scene, str], int]:
+    """선택 하나에 대한 다음 장면(ending이면 결말)과 추정 토큰 수를 생성합니다."""
+    if ending:
+        messages = build_ending_messages(story_context, user_choice)
+        output = (await llm.ainvoke(messages)).text()
+    else:
+        messages = build_next_scene_messages(story_context, user_choice)
+        output = await ainvoke_structured(llm, messages, Scene)
+    return output, estimate_tokens(messages, output)
+
+
+class SceneSpeculator:
+    """
+    플레이어가 장면을 읽고 고르는 동안, 제시된 선택지마다 다음 장면을 미리 생성합니다.
+
+    생성은 백그라운드 스레드의 이벤트 루프에서 최대 max_concurrency개씩 동시에 실행됩니다.
+    플레이어가 고른 선택지의 결과는 바로(또는 남은 시간만 기다려) 사용하고,
+    나머지는 버립니다. cancel_unchosen이면 아직 끝나지 않은 나머지 요청은 취소합니다.
+
+    Args:
+        max_concurrency (int): 동시에 보낼 최대 장면 생성 요청 수
+        cancel_unchosen (bool): 선택되지 않은 진행 중 요청을 취소할지 여부
+    """
+
+    def __init__(
+        self, max_concurrency: int = SPECULATION_MAX_CONCURRENCY, cancel_unchosen: bool = True
+    ):
+        self.max_concurrency = max_concurrency
+        self.cancel_unchosen = cancel_unchosen
+        self.stats = {
+            "speculated": 0,  # 미리 보낸 요청 수
+            "ready": 0,  # 선택 시점에 이미 끝나 있던 요청 수
+            "waited": 0,  # 선택 후 남은 시간을 기다린 요청 수
+            "missed": 0,  # 미리 생성하지 못해 직접 생성한 수
+            "wasted": 0,  # 끝까지 생성됐지만 버린 요청 수
+            "cancelled": 0,  # 끝나기 전에 취소한 요청 수
+            "used_tokens": 0,
+            "wasted_tokens": 0,
+        }
+        self.wait_seconds: List[float] = []
+        self._pending: Dict[str, Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="story-speculator", daemon=True
+        )
+        self._thread.start()
+
+    async def _generate(self, story_context: str, user_choice: str, ending: bool):
+        # 세마포어는 이벤트 루프 스레드 안에서 만들어야 그 루프에 묶입니다.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await agenerate_continuation(story_context, user_choice, ending)
+
+    def speculate(self, story_context: str, choices: List[str], ending: bool) -> None:
+        """선택지마다 다음 장면(ending이면 결말) 생성을 백그라운드에서 시작합니다."""
+        self.discard()
+        # 같은 문구의 선택지는 결과도 같으므로 한 번만 생성합니다.
+        choices = list(dict.fromkeys(choices))
+        for choice in choices:
+            self._pending[choice] = asyncio.run_coroutine_threadsafe(
+                self._generate(story_context, choice, ending), self._loop
+            )
+        with self._lock:
+            self.stats["speculated"] += len(choices)
+
+    def take(self, user_choice: str) -> Optional[Union[Scene, str]]:
+        """
+        고른 선택지의 결과를 꺼내고 나머지는 버립니다.
+
+        Returns:
+            미리 생성한 장면(또는 결말). 미리 생성하지 않았거나 실패했으면 None
+        """
+        future = self._pending.pop(user_choice, None)
+        self.discard()
+        if future is None:
+            with self._lock:
+                self.stats["missed"] += 1
+            return None
+
+        started = time.perf_counter()
+        with self._lock:
+            self.stats["ready" if future.done() else "waited"] += 1
+        try:
+            output, tokens = future.result()
+        except Exception as e:
+            print(f"⚠️ 미리 생성한 장면을 사용할 수 없습니다: {e}")
+            with self._lock:
+                self.stats["missed"] += 1
+            return None
+        with self._lock:
+            self.stats["used_tokens"] += tokens
+            self.wait_seconds.append(time.perf_counter() - started)
+        return output
+
+    def discard(self) -> None:
+        """선택되지 않은 요청을 버립니다. 비용은 요청이 끝날 때 집계합니다."""
+        for future in self._pending.values():
+            if self.cancel_unchosen:
+                future.cancel()
+            future.add_done_callback(self._count_discarded)
+        self._pending.clear()
+
+    def _count_discarded(self, future: Future) -> None:
+        with self._lock:
+            if future.cancelled():
+                self.stats["cancelled"] += 1
+            elif future.exception() is None:
+                self.stats["wasted"] += 1
+                self.stats["wasted_tokens"] += future.result()[1]
+
+    def report(self) -> str:
+        with self._lock:
+            stats = dict(self.stats)
+            waits = list(self.wait_seconds)
+        total_tokens = stats["used_tokens"] + stats["wasted_tokens"]
+        overhead = stats["wasted_tokens"] / stats["used_tokens"] if stats["used_tokens"] else 0.0
+        average_wait = sum(waits) / len(waits) if waits else 0.0
+        return (
+            f"추측 생성 {stats['speculated']}회: 바로 사용 {stats['ready']}회, "
+            f"기다려서 사용 {stats['waited']}회, 직접 생성 {stats['missed']}회, "
+            f"버림 {stats['wasted']}회, 취소 {stats['cancelled']}회\n"
+            f"평균 체감 대기 시간 {average_wait:.2f}초, "
+            f"추정 토큰 {total_tokens} (버린 토큰 {stats['wasted_tokens']}, 오버헤드 {overhead:.0%})"
+        )
+
+    async def _cancel_all(self) -> None:
+        """루프에 남은 생성 작업을 취소하고, 취소 처리가 끝날 때까지 기다립니다."""
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self) -> None:
+        """남은 요청을 모두 취소하고, 취소가 끝난 뒤 이벤트 루프를 멈춥니다."""
+        self.discard()
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop).result(timeout=5)
+        except TimeoutError:
+            print("⚠️ 미리 생성하던 요청이 제때 취소되지 않았습니다.")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+
+def get_speculator(config: RunnableConfig) -> Optional[SceneSpeculator]:
+    """실행 설정에서 추측 실행기를 꺼냅니다. 추측 실행 모드가 아니면 None"""
+    return config.get("configurable", {}).get("speculator")
+
+
+def print_scene(scene: str, choices: List[str]) -> None:
+    print(f"📖 {scene}\n")
+    print("🎯 선택지:")
+    for i, choice in enumerate(choices, 1):
+        print(f"  {i}. {choice}")
+
 
 # ② 스토리 시작 노드
-def start_story(state: StoryGameState) -> Dict[str, Any]:
+def start_story(state: StoryGameState, config: RunnableConfig) -> Dict[str, Any]:
     """게임을 시작하고 첫 번째 장면을 생성합니다."""
     print("\n=== 🎮 AI 스토리 어드벤처 게임 시작! ===\n")
     
@@ -42,16 +266,16 @@ def start_story(state: StoryGameState) -> Dict[str, Any]:
         HumanMessage(content="모험이 시작되는 첫 장면을 만들어주세요.")
     ]
     
-    response = llm.invoke(messages)
-    result = json.loads(response.content)
+    result = invoke_structured(llm, messages, Scene)
     
-    scene = result["scene"]
-    choices = result["choices"]
+    scene = result.scene
+    choices = result.choices
     
-    print(f"📖 {scene}\n")
-    print("🎯 선택지:")
-    for i, choice in enumerate(choices, 1):
-        print(f"  {i}. {choice}")
+    print_scene(scene, choices)
+    
+    # 플레이어가 읽는 동안 선택지별 다음 장면을 미리 생성
+    if speculator := get_speculator(config):
+        speculator.speculate(scene, choices, ending=1 >= state.max_turns)
     
     return {
         "story_context": scene,
@@ -81,42 +305,28 @@ def get_user_choice(state: StoryGameState) -> Dict[str, Any]:
 
 
 # ④ 다음 장면 생성 노드 (AI가 스토리 진행)
-def generate_next_scene(state: StoryGameState) -> Dict[str, Any]:
+def generate_next_scene(state: StoryGameState, config: RunnableConfig) -> Dict[str, Any]:
     """사용자 선택에 따라 다음 장면을 AI가 생성합니다."""
-    print("\n🤔 AI가 다음 이야기를 생성 중...\n")
-    
-    system_prompt = f"""당신은 인터랙티브 스토리 작가입니다.
-이전 스토리와 사용자의 선택을 바탕으로 다음 장면을 생성하세요.
-
-이전 맥락: {state.story_context}
-사용자 선택: {state.user_choice}
-
-다음 JSON 형식으로 응답하세요:
-{{
-  "scene": "다음 장면 설명 (3-4문장, 사용자 선택의 결과를 반영)",
-  "choices": ["선택지1", "선택지2", "선택지3"]
-}}
-
-스토리는 자연스럽게 연결되고 흥미진진해야 합니다."""
+    speculator = get_speculator(config)
+    result = speculator.take(state.user_choice) if speculator else None
     
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content="다음 장면을 생성해주세요.")
-    ]
-    
-    response = llm.invoke(messages)
-    result = json.loads(response.content)
+    if not isinstance(result, Scene):
+        print("\n🤔 AI가 다음 이야기를 생성 중...\n")
+        messages = build_next_scene_messages(state.story_context, state.user_choice)
+        result = invoke_structured(llm, messages, Scene)
+    else:
+        print()
     
-    scene = result["scene"]
-    choices = result["choices"]
+    scene = result.scene
+    choices = result.choices
     
     # 맥락 업데이트
     new_context = f"{state.story_context}\n\n[선택: {state.user_choice}]\n{scene}"
     
-    print(f"📖 {scene}\n")
-    print("🎯 선택지:")
-    for i, choice in enumerate(choices, 1):
-        print(f"  {i}. {choice}")
+    print_scene(scene, choices)
+    
+    if speculator:
+        speculator.speculate(new_context, choices, ending=state.turn_count + 1 >= state.max_turns)
     
     return {
         "story_context": new_context,
@@ -127,27 +337,17 @@ def generate_next_scene(state: StoryGameState) -> Dict[str, Any]:
 
 
 # ⑤ 스토리 종료 노드
-def end_story(state: StoryGameState) -> Dict[str, Any]:
+def end_story(state: StoryGameState, config: RunnableConfig) -> Dict[str, Any]:
     """스토리를 마무리합니다."""
-    print("\n🎬 AI가 스토리 결말을 생성 중...\n")
-    
-    system_prompt = f"""당신은 스토리 작가입니다.
-다음 스토리를 감동적이고 만족스럽게 마무리하세요.
-
-스토리 맥락:
-{state.story_context}
-
-마지막 선택: {state.user_choice}
-
-2-3문장으로 멋진 결말을 작성하세요."""
+    speculator = get_speculator(config)
+    ending = speculator.take(state.user_choice) if speculator else None
     
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content="스토리를 마무리해주세요.")
-    ]
-    
-    response = llm.invoke(messages)
-    ending = response.content
+    if not isinstance(ending, str):
+        print("\n🎬 AI가 스토리 결말을 생성 중...\n")
+        response = llm.invoke(build_ending_messages(state.story_context, state.user_choice))
+        ending = response.text()
+    else:
+        print()
     
     print(f"📖 {ending}\n")
     print("🎉 === 게임 종료 === 🎉")
@@ -204,11 +404,21 @@ def main():
     
     app = create_story_game_graph()
     
+    # 추측 실행 모드: 선택지를 고르는 동안 다음 장면을 미리 생성 (대신 LLM 호출이 늘어남)
+    speculative = input("⚡ 추측 실행 모드를 사용하시겠습니까? (y/n): ").lower() == 'y'
+    speculator = SceneSpeculator() if speculative else None
+    
     # 게임 실행
     initial_state = StoryGameState(max_turns=4)  # 4턴 진행
-    result = app.invoke(initial_state)
+    try:
+        result = app.invoke(initial_state, {"configurable": {"speculator": speculator}})
+    finally:
+        if speculator:
+            speculator.shutdown()
     
     print(f"\n총 {result['turn_count']}턴 진행됨")
+    if speculator:
+        print(f"\n📊 {speculator.report()}")
     
     # 그래프 시각화
     try:
@@ -1,9 +1,16 @@
-from typing import Dict, Any
+import asyncio
+import operator
+from typing import Annotated, Dict, Any, Awaitable, Callable
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel
 import time
 import random
 
+# 대시보드 전체 마감 시간(초): 이 시간이 지나면 도착한 데이터만으로 리포트를 만듭니다.
+DASHBOARD_DEADLINE = 2.5
+# 데이터 소스별 최대 대기 시간(초). 마감까지 남은 시간보다 길면 남은 시간만 기다립니다.
+BRANCH_TIMEOUTS = {"weather": 2.0, "news": 2.5, "stock": 2.5}
+
 
 # ① State 클래스 정의
 class DashboardState(BaseModel):
@@ -11,38 +18,29 @@ class DashboardState(BaseModel):
     weather_data: Dict[str, Any] = {}
     news_data: Dict[str, Any] = {}
     stock_data: Dict[str, Any] = {}
+    # 병렬 노드가 동시에 쓰므로 dict를 합치는 reducer를 지정합니다.
+    branch_results: Annotated[Dict[str, Dict[str, Any]], operator.or_] = {}
     dashboard_report: str = ""
     start_time: float = 0.0
+    deadline: float = 0.0
 
 
-# ② 코디네이터 노드
+# ② 코디네이터 노드: 시작 시각과 마감 시각을 정합니다.
 def coordinator(state: DashboardState) -> Dict[str, Any]:
     print(f"대시보드 생성 시작 - 위치: {state.user_location}")
-    return {"start_time": time.time()}
-
-
-# ③ 병렬 실행 노드 1 - 날씨 데이터 수집
-def weather_checker(state: DashboardState) -> Dict[str, Any]:
-    print("날씨 확인 중...")
-    time.sleep(random.uniform(1.0, 2.0))
-
-    weather_info = {
-        "location": state.user_location,
-        "condition": "맑음",
-        "temperature": 22,
-        "humidity": 65,
-    }
+    start_time = time.time()
+    return {"start_time": start_time, "deadline": start_time + DASHBOARD_DEADLINE}
 
-    print(f"날씨: {weather_info['condition']}, {weather_info['temperature']}°C")
-    return {"weather_data": weather_info}
 
+# 데이터 소스 (실제로는 외부 API를 비동기로 호출하는 부분)
+async def fetch_weather(location: str) -> Dict[str, Any]:
+    await asyncio.sleep(random.uniform(1.0, 2.0))
+    return {"location": location, "condition": "맑음", "temperature": 22, "humidity": 65}
 
-# ④ 병렬 실행 노드 2 - 뉴스 데이터 수집
-def news_fetcher(state: DashboardState) -> Dict[str, Any]:
-    print("뉴스 수집 중...")
-    time.sleep(random.uniform(1.5, 2.5))
 
-    news_info = {
+async def fetch_news(location: str) -> Dict[str, Any]:
+    await asyncio.sleep(random.uniform(1.5, 2.5))
+    return {
         "articles": [
             {"title": "AI 기술 발전 소식", "summary": "AI 분야 새로운 혁신"},
             {"title": "경제 동향 분석", "summary": "글로벌 경제 전망"},
@@ -50,36 +48,95 @@ def news_fetcher(state: DashboardState) -> Dict[str, Any]:
         "count": 2,
     }
 
-    print(f"뉴스 {news_info['count']}개 수집 완료")
-    return {"news_data": news_info}
 
-
-# ⑤ 병렬 실행 노드 3 - 주식 데이터 분석
-def stock_analyzer(state: DashboardState) -> Dict[str, Any]:
-    print("주식 분석 중...")
-    time.sleep(random.uniform(2.0, 3.0))
-
-    stock_info = {
+async def fetch_stock(location: str) -> Dict[str, Any]:
+    await asyncio.sleep(random.uniform(2.0, 3.0))
+    return {
         "KOSPI": {"price": 2650.5, "change": +1.2},
         "NASDAQ": {"price": 15780.3, "change": -0.8},
     }
 
-    print("주식 분석 완료")
-    return {"stock_data": stock_info}
+
+async def run_branch(
+    name: str,
+    field: str,
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    state: DashboardState,
+) -> Dict[str, Any]:
+    """
+    데이터 소스 하나를 제한 시간 안에서 실행하고 결과와 실행 기록을 반환합니다.
+
+    제한 시간은 소스별 시간과 대시보드 마감까지 남은 시간 중 짧은 쪽이므로, 가장 느린
+    소스가 있어도 집계 노드는 마감 시간에 실행됩니다. 시간을 넘긴 호출은 취소합니다.
+
+    Args:
+        name (str): 소스 이름 (BRANCH_TIMEOUTS의 키)
+        field (str): 결과를 저장할 상태 필드
+        fetch: 위치를 받아 데이터를 반환하는 코루틴 함수
+        state (DashboardState): 현재 상태
+
+    Returns:
+        {field: 데이터, "branch_results": {name: 실행 기록}}
+    """
+    timeout = max(0.0, min(BRANCH_TIMEOUTS[name], state.deadline - time.time()))
+    started = time.perf_counter()
+    data: Dict[str, Any] = {}
+    error = ""
+    try:
+        data = await asyncio.wait_for(fetch(state.user_location), timeout)
+        status = "ok"
+    except asyncio.TimeoutError:
+        status = "timeout"
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+
+    elapsed = time.perf_counter() - started
+    print(f"{name}: {status} ({elapsed:.2f}초)")
+    record = {"status": status, "elapsed": elapsed, "timeout": timeout, "error": error}
+    return {field: data, "branch_results": {name: record}}
 
 
-# ⑥ 집계 노드 - 모든 병렬 작업 완료 후 실행
+# ③ 병렬 실행 노드 1 - 날씨 데이터 수집
+async def weather_checker(state: DashboardState) -> Dict[str, Any]:
+    print("날씨 확인 중...")
+    return await run_branch("weather", "weather_data", fetch_weather, state)
+
+
+# ④ 병렬 실행 노드 2 - 뉴스 데이터 수집
+async def news_fetcher(state: DashboardState) -> Dict[str, Any]:
+    print("뉴스 수집 중...")
+    return await run_branch("news", "news_data", fetch_news, state)
+
+
+# ⑤ 병렬 실행 노드 3 - 주식 데이터 분석
+async def stock_analyzer(state: DashboardState) -> Dict[str, Any]:
+    print("주식 분석 중...")
+    return await run_branch("stock", "stock_data", fetch_stock, state)
+
+
+# ⑥ 집계 노드 - 모든 병렬 작업이 끝나거나 마감 시간이 되면 도착한 데이터로 실행
 def aggregator(state: DashboardState) -> Dict[str, Any]:
     print("리포트 생성 중...")
 
     parallel_time = time.time() - state.start_time
+    results = state.branch_results
+
+    def section(name: str, text: str) -> str:
+        status = results.get(name, {}).get("status", "missing")
+        return text if status == "ok" else f"데이터 없음 ({status})"
 
+    weather = state.weather_data
+    timings = ", ".join(
+        f"{name} {record['elapsed']:.2f}초({record['status']})"
+        for name, record in sorted(results.items())
+    )
     report = f"""
 대시보드 리포트
-날씨: {state.weather_data.get("condition", "N/A")} {state.weather_data.get("temperature", "N/A")}°C
-뉴스: {state.news_data.get("count", 0)}개 기사
-주식: KOSPI {state.stock_data.get("KOSPI", {}).get("price", "N/A")}
-실행시간: {parallel_time:.1f}초
+날씨: {section("weather", f"{weather.get('condition')} {weather.get('temperature')}°C")}
+뉴스: {section("news", f"{state.news_data.get('count', 0)}개 기사")}
+주식: {section("stock", f"KOSPI {state.stock_data.get('KOSPI', {}).get('price')}")}
+소스별 시간: {timings}
+실행시간: {parallel_time:.1f}초 (마감 {DASHBOARD_DEADLINE:.1f}초)
 """
 
     print(f"대시보드 완료 ({parallel_time:.1f}초)")
@@ -117,7 +174,8 @@ def main():
     initial_state = DashboardState(user_location="광주")
 
     print("병렬 실행 시작!")
-    result = app.invoke(initial_state)  # ⑨ 워크플로우 실행
+    # ⑨ 워크플로우 실행: 비동기 노드는 한 이벤트 루프에서 동시에 실행됩니다.
+    result = asyncio.run(app.ainvoke(initial_state))
 
     print("\n최종 결과:")
     print(result["dashboard_report"])
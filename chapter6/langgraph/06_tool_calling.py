@@ -1,10 +1,15 @@
+import sys
+from pathlib import Path
 import httpx
 from langchain_core.messages import HumanMessage, ToolMessage
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.prebuilt import ToolNode
 from langchain.chat_models import init_chat_model
 import math
-from geopy.geocoders import Nominatim
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from tools.geocoding import get_coordinates
+from tools.tool_cache import CachedToolNode, ToolCachePolicy
 
 
 def calculator(expression: str) -> str:
@@ -36,16 +41,6 @@ def get_weather(city_name: str) -> dict:  # ① 날씨 관련 도구 함수
     return response.json()
 
 
-def get_coordinates(city_name: str) -> tuple[float, float]:
-    """도시 이름을 받아 위도와 경도를 반환합니다."""
-    geolocator = Nominatim(user_agent="weather_app")
-    location = geolocator.geocode(city_name)
-    if location:
-        return location.latitude, location.longitude
-    else:
-        raise ValueError(f"Could not find coordinates for {city_name}")
-
-
 def currency_converter(amount: float, from_currency: str, to_currency: str) -> str:
     """통화 간 환율을 계산합니다."""
     print(f"{amount} {from_currency}를 {to_currency}로 변환합니다.")
@@ -113,12 +108,25 @@ def create_graph(model_with_tools, tool_node):
     return workflow.compile()
 
 
-def llm_tool_call(query: str):
+TOOLS = [calculator, get_weather, currency_converter]
+
+# 도구별 캐싱 정책: 계산과 고정 환율 변환은 입력이 같으면 결과도 같고, 날씨는 10분간 재사용
+TOOL_CACHE_POLICIES = {
+    "calculator": ToolCachePolicy(pure=True),
+    "currency_converter": ToolCachePolicy(pure=True),
+    "get_weather": ToolCachePolicy(ttl=600),
+}
+
+
+def create_tool_node() -> CachedToolNode:
+    """여러 질문이 함께 쓰는, 결과를 캐싱하는 도구 노드를 생성합니다."""
+    return CachedToolNode(TOOLS, policies=TOOL_CACHE_POLICIES)
+
+
+def llm_tool_call(query: str, tool_node: CachedToolNode):
     """하나의 질문에 대해 전체 LLM 워크플로우를 실행하고 로그를 출력합니다."""
-    tools = [calculator, get_weather, currency_converter]
-    tool_node = ToolNode(tools)
     model = init_chat_model("gpt-5-mini", model_provider="openai")
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = model.bind_tools(TOOLS)
 
     print(f"질문: {query}")
     print("-" * 50)
@@ -147,14 +155,19 @@ def main():
         # "1000원을 달러로 환전해줘",
     ]
 
+    # 질문이 바뀌어도 같은 도구 호출 결과를 재사용하도록 도구 노드를 한 번만 생성
+    tool_node = create_tool_node()
+
     print("\nLLM 기반 도구 호출 시작:")
     for query in test_queries:
         try:
-            llm_tool_call(query)
+            llm_tool_call(query, tool_node)
         except Exception as e:
             print(f"'{query}' 처리 중 오류 발생: {e}")
             print("=" * 50 + "\n")
 
+    print(f"도구 캐시 통계: {tool_node.stats()}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,20 +1,16 @@
+import sys
+from pathlib import Path
 import httpx
-from geopy.geocoders import Nominatim
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.prebuilt import ToolNode
 from langchain.chat_models import init_chat_model
 from typing import Literal
 import json
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-def get_coordinates(city_name: str) -> tuple[float, float]:
-    """도시 이름을 받아 위도와 경도를 반환합니다."""
-    geolocator = Nominatim(user_agent="weather_app_langgraph")
-    location = geolocator.geocode(city_name)
-    if location:
-        return location.latitude, location.longitude
-    raise ValueError(f"좌표를 찾을 수 없습니다: {city_name}")
+from tools.geocoding import get_coordinates
+from tools.tool_cache import CachedToolNode, ToolCachePolicy
 
 
 def get_weather(city_name: str) -> str:
@@ -33,7 +29,10 @@ def create_weather_agent():
     model = init_chat_model("gpt-5-mini", model_provider="openai").bind_tools(
         [get_weather]
     )
-    tool_node = ToolNode([get_weather])
+    # 같은 도시의 날씨는 10분 동안 다시 조회하지 않음
+    tool_node = CachedToolNode(
+        [get_weather], policies={"get_weather": ToolCachePolicy(ttl=600)}
+    )
 
     def call_model(state: MessagesState):
         return {"messages": [model.invoke(state["messages"])]}
@@ -0,0 +1,302 @@
+"""
+회의록 웹 버전의 세션 저장소와 백그라운드 작업 실행기
+
+- 세션 저장소: 메모리(LRU + 유휴 TTL) 또는 SQLite 파일 (여러 워커 프로세스가 공유 가능)
+- 백그라운드 작업: LLM 호출을 요청 스레드가 아닌 별도 이벤트 루프 스레드에서 비동기로 실행
+
+환경 변수:
+    MEETING_SESSION_BACKEND: "memory" 또는 "sqlite" (기본값: "memory")
+    MEETING_SESSION_DB_PATH: SQLite 파일 경로 (기본값: 이 파일 옆의 meeting_sessions.sqlite3)
+    MEETING_MAX_SESSIONS: 보관할 최대 세션 수 (기본값: 1000)
+    MEETING_SESSION_IDLE_TTL: 세션 유휴 만료 시간(초) (기본값: 3600)
+    MEETING_JOB_TIMEOUT: 이 시간(초)이 지나도 running인 작업은 실패로 봅니다 (기본값: 600)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Optional
+
+from project_meeting_assistant import MeetingState
+
+SESSION_BACKEND = os.getenv("MEETING_SESSION_BACKEND", "memory")
+SESSION_DB_PATH = os.getenv(
+    "MEETING_SESSION_DB_PATH",
+    str(Path(__file__).resolve().parent / "meeting_sessions.sqlite3"),
+)
+MAX_SESSIONS = int(os.getenv("MEETING_MAX_SESSIONS", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("MEETING_SESSION_IDLE_TTL", "3600"))
+JOB_TIMEOUT = float(os.getenv("MEETING_JOB_TIMEOUT", "600"))
+
+
+@dataclass
+class MeetingSession:
+    """
+    회의 하나의 진행 상태입니다.
+
+    Attributes:
+        session_id (str): 세션 ID
+        state (MeetingState): 회의록 상태
+        step (str): 화면이 보여줄 단계 (summary_review, action_review, final_review, completed)
+        job_status (str): 백그라운드 작업 상태 (idle, running, error)
+        job_error (str): 마지막 작업의 오류 메시지
+        job_started_at (float): 마지막 작업을 시작한 시각 (time.time())
+        job_failed_step (str): 작업이 실패하면 되돌아갈 단계
+        updated_at (float): 마지막 사용 시각 (time.time())
+    """
+
+    session_id: str
+    state: MeetingState
+    step: str = ""
+    job_status: str = "idle"
+    job_error: str = ""
+    job_started_at: float = 0.0
+    job_failed_step: str = ""
+    updated_at: float = field(default_factory=time.time)
+
+    def expire_stale_job(self, timeout: float = JOB_TIMEOUT) -> bool:
+        """
+        timeout초가 지나도 running인 작업을 실패로 바꿉니다.
+
+        작업을 실행하던 워커 프로세스가 죽으면 running 상태가 영원히 남으므로,
+        세션을 조회할 때 확인해서 사용자가 다시 시도할 수 있게 합니다.
+
+        Returns:
+            상태를 바꿨으면 True
+        """
+        if self.job_status != "running" or time.time() - self.job_started_at <= timeout:
+            return False
+        self.step = self.job_failed_step or self.step
+        self.job_status = "error"
+        self.job_error = "작업이 제한 시간 안에 끝나지 않았습니다. 다시 시도해 주세요."
+        return True
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "session_id": self.session_id,
+                "state": self.state.model_dump(mode="json"),
+                "step": self.step,
+                "job_status": self.job_status,
+                "job_error": self.job_error,
+                "job_started_at": self.job_started_at,
+                "job_failed_step": self.job_failed_step,
+                "updated_at": self.updated_at,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "MeetingSession":
+        values = json.loads(data)
+        values["state"] = MeetingState.model_validate(values["state"])
+        return cls(**values)
+
+
+class MemorySessionStore:
+    """
+    프로세스 메모리에 세션을 보관하는 저장소입니다.
+
+    max_sessions를 넘으면 가장 오래 사용하지 않은 세션부터, idle_ttl초 동안 사용하지 않은
+    세션은 조회/저장 시점에 삭제합니다. 저장된 객체를 바꾼 뒤에는 `put()`으로 다시 저장하세요.
+
+    Args:
+        max_sessions (int): 보관할 최대 세션 수
+        idle_ttl (float): 세션 유휴 만료 시간(초)
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_ttl: float = SESSION_IDLE_TTL):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.evicted = 0
+        self._sessions: OrderedDict[str, MeetingSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[MeetingSession]:
+        with self._lock:
+            self._sweep()
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.updated_at = time.time()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def put(self, session: MeetingSession) -> None:
+        with self._lock:
+            session.updated_at = time.time()
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            self._sweep()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _sweep(self) -> None:
+        """만료되었거나 한도를 넘은 세션을 삭제합니다. lock을 잡은 상태에서 호출합니다."""
+        expire_before = time.time() - self.idle_ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.updated_at > expire_before and len(self._sessions) <= self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "sessions": len(self._sessions), "evicted": self.evicted}
+
+
+class SqliteSessionStore:
+    """
+    SQLite 파일에 세션을 보관하는 저장소입니다. 같은 파일을 쓰는 여러 워커 프로세스가
+    세션을 공유하므로, 작업을 시작한 워커와 결과를 조회하는 워커가 달라도 됩니다.
+
+    Args:
+        db_path (str): SQLite 파일 경로
+        max_sessions (int): 보관할 최대 세션 수
+        idle_ttl (float): 세션 유휴 만료 시간(초)
+        sweep_interval (float): 만료 세션 정리 간격(초)
+    """
+
+    def __init__(
+        self,
+        db_path: str = SESSION_DB_PATH,
+        max_sessions: int = MAX_SESSIONS,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        sweep_interval: float = 60.0,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self.evicted = 0
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        # WAL 모드: 다른 프로세스가 쓰는 동안에도 읽기가 막히지 않습니다.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meeting_sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS meeting_sessions_updated_at "
+            "ON meeting_sessions (updated_at)"
+        )
+        self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[MeetingSession]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM meeting_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None or row[1] <= now - self.idle_ttl:
+                return None
+            self._conn.execute(
+                "UPDATE meeting_sessions SET updated_at = ? WHERE session_id = ?",
+                (now, session_id),
+            )
+            self._conn.commit()
+        session = MeetingSession.from_json(row[0])
+        session.updated_at = now
+        return session
+
+    def put(self, session: MeetingSession) -> None:
+        session.updated_at = time.time()
+        data = session.to_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meeting_sessions (session_id, data, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session.session_id, data, session.updated_at),
+            )
+            self._conn.commit()
+            if session.updated_at - self._last_sweep >= self.sweep_interval:
+                self._sweep(session.updated_at)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM meeting_sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def _sweep(self, now: float) -> None:
+        """만료되었거나 한도를 넘은 세션을 삭제합니다. lock을 잡은 상태에서 호출합니다."""
+        self._last_sweep = now
+        expired = self._conn.execute(
+            "DELETE FROM meeting_sessions WHERE updated_at <= ?", (now - self.idle_ttl,)
+        ).rowcount
+        overflow = self._conn.execute(
+            "DELETE FROM meeting_sessions WHERE session_id IN ("
+            "SELECT session_id FROM meeting_sessions ORDER BY updated_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_sessions,),
+        ).rowcount
+        self._conn.commit()
+        self.evicted += expired + overflow
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM meeting_sessions").fetchone()
+        return {"backend": "sqlite", "sessions": count, "evicted": self.evicted}
+
+
+def create_session_store(backend: str = SESSION_BACKEND):
+    """설정한 백엔드의 세션 저장소를 만듭니다."""
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SqliteSessionStore()
+    raise ValueError(f"지원하지 않는 세션 백엔드입니다: {backend}")
+
+
+class BackgroundJobRunner:
+    """
+    백그라운드 스레드의 이벤트 루프 하나에서 코루틴을 실행합니다.
+
+    Flask 요청 스레드는 작업을 넘기고 바로 응답하며, LLM 호출은 이벤트 루프에서
+    동시에 진행되므로 요청이 많아도 스레드를 작업 수만큼 늘릴 필요가 없습니다.
+    """
+
+    def __init__(self):
+        self.submitted = 0
+        self.failed = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="meeting-jobs", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """코루틴을 이벤트 루프에 넘기고 완료를 기다릴 수 있는 Future를 반환합니다."""
+        with self._lock:
+            self.submitted += 1
+            self._running += 1
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._running -= 1
+            if not future.cancelled() and future.exception() is not None:
+                self.failed += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"running": self._running, "submitted": self.submitted, "failed": self.failed}
+
+    def shutdown(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
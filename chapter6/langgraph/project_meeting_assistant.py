@@ -19,14 +19,33 @@ Human-in-the-Loop 지점:
     - 최종 전송 승인 (실수 방지)
 """
 
-from typing import Dict, Any, Literal, List
+from typing import Dict, Any, Literal, List, Optional
+import asyncio
+import os
+import re
+import sys
+import weakref
+from pathlib import Path
+from uuid import uuid4
 from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command, interrupt
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
-import json
 from datetime import datetime, timedelta
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from utils.structured_output import (
+    StructuredOutputError,
+    StructuredOutputParser,
+    ainvoke_structured,
+    repair_structured,
+)
+from utils.delta_checkpoint import DeltaSqliteSaver
+from utils.tokens import count_tokens
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 상태 정의
@@ -40,6 +59,18 @@ class ActionItem(BaseModel):
     priority: str = "medium"  # low, medium, high
 
 
+class ActionItemList(BaseModel):
+    """액션 아이템 추출 결과"""
+    action_items: List[ActionItem] = Field(default_factory=list)
+
+
+class ChunkNotes(BaseModel):
+    """긴 회의록 한 부분의 정리 결과"""
+    key_points: List[str] = Field(default_factory=list)
+    decisions: List[str] = Field(default_factory=list)
+    action_items: List[ActionItem] = Field(default_factory=list)
+
+
 class MeetingState(BaseModel):
     """회의록 시스템 상태"""
     # 입력
@@ -60,6 +91,12 @@ class MeetingState(BaseModel):
     final_report: str = Field(default="", description="최종 회의록 보고서")
     send_approved: bool = Field(default=False, description="전송 승인 여부")
     
+    # 긴 회의록 map-reduce 결과 (부분별 요점/결정 사항/액션 아이템)
+    chunk_notes: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="긴 회의록을 나눈 부분별 정리 결과"
+    )
+    
     # 메타데이터
     current_step: str = Field(default="", description="현재 진행 단계")
 
@@ -67,20 +104,31 @@ class MeetingState(BaseModel):
 # LLM 초기화
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
 
+# 비동기 그래프에서 한 프로세스가 동시에 보낼 수 있는 최대 LLM 요청 수
+LLM_MAX_CONCURRENCY = int(os.getenv("MEETING_LLM_MAX_CONCURRENCY", "8"))
+# asyncio.Semaphore는 처음 사용한 이벤트 루프에 묶이므로 루프마다 따로 만듭니다.
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# 비동기 그래프의 체크포인트를 저장할 SQLite 파일. 비어 있으면 메모리에만 저장합니다.
+# 회의록 원문처럼 큰 필드는 바뀌지 않는 한 다시 기록하지 않습니다 (utils/delta_checkpoint.py).
+CHECKPOINT_DB_PATH = os.getenv("MEETING_CHECKPOINT_DB_PATH", "")
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 노드 1: 회의 요약 생성 (AI)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def generate_summary(state: MeetingState) -> Dict[str, Any]:
-    """AI가 회의 내용을 요약합니다."""
-    print("\n" + "="*70)
-    print("📝 [1단계] AI가 회의 내용을 요약합니다...")
-    print("="*70)
+def build_summary_messages(state: MeetingState, notes: str = "") -> list:
+    """회의 요약 프롬프트를 만듭니다. notes가 있으면 회의록 대신 부분별 메모를 요약합니다."""
+    if notes:
+        source = f"긴 회의를 부분별로 정리한 메모:\n{notes}"
+    else:
+        source = f"회의 내용:\n{state.meeting_transcript}"
     
     prompt = f"""다음 회의 내용을 간결하게 요약해주세요:
 
-회의 내용:
-{state.meeting_transcript}
+{source}
 
 요약 형식:
 1. 회의 목적 (1-2문장)
@@ -89,13 +137,29 @@ def generate_summary(state: MeetingState) -> Dict[str, Any]:
 
 명확하고 구체적으로 작성하세요."""
     
-    messages = [
+    return [
         SystemMessage(content="당신은 회의록 작성 전문가입니다."),
         HumanMessage(content=prompt)
     ]
+
+
+def generate_summary(state: MeetingState) -> Dict[str, Any]:
+    """AI가 회의 내용을 요약합니다."""
+    print("\n" + "="*70)
+    print("📝 [1단계] AI가 회의 내용을 요약합니다...")
+    print("="*70)
     
-    response = llm.invoke(messages)
-    summary = response.content
+    update: Dict[str, Any] = {}
+    if state.chunk_notes:
+        # 긴 회의록의 요약을 다시 만들 때는 저장된 청크 정리 결과로 reduce만 다시 합니다.
+        update["summary"] = asyncio.run(areduce_summary(state, state.chunk_notes))
+    elif count_tokens(state.meeting_transcript) > LONG_TRANSCRIPT_TOKENS:
+        # 긴 회의록은 청크로 나눠 한 번만 읽고, 요약과 액션 아이템을 함께 만듭니다.
+        print(f"📚 긴 회의록입니다. 청크로 나눠 요약합니다 (기준: {LONG_TRANSCRIPT_TOKENS} 토큰).")
+        update = asyncio.run(amap_reduce_transcript(state))
+    else:
+        update["summary"] = llm.invoke(build_summary_messages(state)).content
+    summary = update["summary"]
     
     print(f"\n✅ 요약 생성 완료:")
     print("-" * 70)
@@ -103,7 +167,7 @@ def generate_summary(state: MeetingState) -> Dict[str, Any]:
     print("-" * 70)
     
     return {
-        "summary": summary,
+        **update,
         "current_step": "summary_generated"
     }
 
@@ -152,12 +216,8 @@ def approve_summary(state: MeetingState) -> Dict[str, Any]:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 노드 3: 액션 아이템 추출 (AI)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def extract_action_items(state: MeetingState) -> Dict[str, Any]:
-    """AI가 액션 아이템을 추출합니다."""
-    print("\n" + "="*70)
-    print("🎯 [2단계] AI가 액션 아이템을 추출합니다...")
-    print("="*70)
-    
+def build_action_items_messages(state: MeetingState) -> list:
+    """액션 아이템 추출 프롬프트를 만듭니다."""
     team_members_str = ", ".join(state.team_members)
     
     prompt = f"""다음 회의 내용에서 액션 아이템을 추출해주세요:
@@ -182,30 +242,21 @@ def extract_action_items(state: MeetingState) -> Dict[str, Any]:
 
 실제로 실행해야 할 구체적인 작업만 추출하세요."""
     
-    messages = [
+    return [
         SystemMessage(content="당신은 회의록에서 액션 아이템을 추출하는 전문가입니다. 응답은 반드시 순수 JSON 형식만 반환하세요."),
         HumanMessage(content=prompt)
     ]
+
+
+def extract_action_items(state: MeetingState) -> Dict[str, Any]:
+    """AI가 액션 아이템을 추출합니다."""
+    print("\n" + "="*70)
+    print("🎯 [2단계] AI가 액션 아이템을 추출합니다...")
+    print("="*70)
     
-    response = llm.invoke(messages)
-    
-    try:
-        # LLM 응답에서 JSON 추출 (마크다운 코드 블록 제거)
-        content = response.content.strip()
-        
-        # ```json ... ``` 형식 제거
-        if content.startswith("```"):
-            # 첫 번째 줄 제거 (```json)
-            lines = content.split("\n")
-            content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
-            # 마지막 ``` 제거
-            content = content.replace("```", "").strip()
-        
-        # JSON 파싱
-        result = json.loads(content)
-        action_items = result.get("action_items", [])
-        
-        print(f"\n✅ {len(action_items)}개의 액션 아이템을 찾았습니다:")
+    if state.chunk_notes:
+        # 긴 회의록은 요약할 때 청크별로 뽑아 둔 액션 아이템을 그대로 사용합니다.
+        action_items = merge_action_items(state.chunk_notes)
         print("-" * 70)
         for i, item in enumerate(action_items, 1):
             print(f"\n{i}. {item['title']}")
@@ -213,19 +264,49 @@ def extract_action_items(state: MeetingState) -> Dict[str, Any]:
             print(f"   마감일: {item['deadline']}")
             print(f"   우선순위: {item['priority']}")
         print("-" * 70)
-        
+        print(f"\n✅ {len(action_items)}개의 액션 아이템을 찾았습니다.")
         return {
             "action_items": action_items,
             "current_step": "action_items_extracted"
         }
-    except Exception as e:
+    
+    # 스트리밍으로 받으면서 다 받은 액션 아이템부터 ActionItem으로 검증해 출력
+    parser = StructuredOutputParser(ActionItemList)
+    print("-" * 70)
+    count = 0
+    for chunk in llm.stream(build_action_items_messages(state)):
+        parser.feed(chunk.content)
+        for item in parser.new_items("action_items", ActionItem):
+            count += 1
+            print(f"\n{count}. {item.title}")
+            print(f"   담당자: {item.assignee}")
+            print(f"   마감일: {item.deadline}")
+            print(f"   우선순위: {item.priority}")
+    print("-" * 70)
+    
+    try:
+        try:
+            result = parser.result()
+        except StructuredOutputError as e:
+            # 형식이 깨졌으면 전체를 다시 생성하지 않고 출력만 고칩니다.
+            print(f"⚠️ 형식 오류를 수정합니다: {str(e).splitlines()[0]}")
+            result = repair_structured(llm, parser.text, e, ActionItemList)
+    except StructuredOutputError as e:
         print(f"⚠️ 액션 아이템 추출 실패: {e}")
         print(f"🔍 LLM 응답 내용:")
-        print(f"{response.content[:500]}...")  # 디버깅용: 응답 일부 출력
+        print(f"{parser.text[:500]}...")  # 디버깅용: 응답 일부 출력
         return {
             "action_items": [],
             "current_step": "action_items_extracted"
         }
+    
+    action_items = [item.model_dump() for item in result.action_items]
+    print(f"\n✅ {len(action_items)}개의 액션 아이템을 찾았습니다.")
+    
+    return {
+        "action_items": action_items,
+        "current_step": "action_items_extracted"
+    }
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -248,15 +329,34 @@ def review_action_items(state: MeetingState) -> Dict[str, Any]:
     
     print("\n" + "-"*70)
     
+    updated_items = choose_action_item_edit(state.action_items)
+    if updated_items is None:
+        return {
+            "action_items_approved": True,
+            "current_step": "action_items_approved"
+        }
+    return {
+        "action_items": updated_items,
+        "current_step": "action_items_modified"
+    }
+
+
+def choose_action_item_edit(action_items: List[Dict[str, str]]) -> Optional[List[Dict[str, str]]]:
+    """
+    액션 아이템을 승인하거나 하나를 추가/삭제/수정하도록 입력받습니다.
+
+    Args:
+        action_items (List[Dict[str, str]]): 현재 액션 아이템 목록
+
+    Returns:
+        승인하면 None, 수정했으면 수정한 목록
+    """
     while True:
         choice = input("\n선택하세요 (y: 승인, a: 추가, d: 삭제, m: 수정): ").lower()
         
         if choice == 'y':
             print("✅ 모든 액션 아이템이 승인되었습니다!")
-            return {
-                "action_items_approved": True,
-                "current_step": "action_items_approved"
-            }
+            return None
         
         elif choice == 'a':
             print("\n➕ 새 액션 아이템 추가:")
@@ -274,34 +374,28 @@ def review_action_items(state: MeetingState) -> Dict[str, Any]:
                 "priority": priority
             }
             
-            updated_items = state.action_items.copy()
+            updated_items = action_items.copy()
             updated_items.append(new_item)
             
             print("✅ 액션 아이템이 추가되었습니다!")
             
-            return {
-                "action_items": updated_items,
-                "current_step": "action_items_modified"
-            }
+            return updated_items
         
         elif choice == 'd':
             idx = int(input("삭제할 항목 번호: ")) - 1
-            updated_items = state.action_items.copy()
+            updated_items = action_items.copy()
             if 0 <= idx < len(updated_items):
                 removed = updated_items.pop(idx)
                 print(f"✅ '{removed['title']}'이(가) 삭제되었습니다!")
-                return {
-                    "action_items": updated_items,
-                    "current_step": "action_items_modified"
-                }
+                return updated_items
         
         elif choice == 'm':
             idx = int(input("수정할 항목 번호: ")) - 1
-            if 0 <= idx < len(state.action_items):
-                print(f"\n현재 값: {state.action_items[idx]}")
+            if 0 <= idx < len(action_items):
+                print(f"\n현재 값: {action_items[idx]}")
                 print("수정할 내용 입력 (Enter = 유지):")
                 
-                updated_items = state.action_items.copy()
+                updated_items = action_items.copy()
                 item = updated_items[idx].copy()
                 
                 title = input(f"제목 [{item['title']}]: ")
@@ -319,10 +413,7 @@ def review_action_items(state: MeetingState) -> Dict[str, Any]:
                 updated_items[idx] = item
                 print("✅ 수정되었습니다!")
                 
-                return {
-                    "action_items": updated_items,
-                    "current_step": "action_items_modified"
-                }
+                return updated_items
         else:
             print("⚠️ y, a, d, m 중 하나를 입력하세요.")
 
@@ -330,12 +421,8 @@ def review_action_items(state: MeetingState) -> Dict[str, Any]:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 노드 5: 최종 보고서 생성 (AI)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def generate_final_report(state: MeetingState) -> Dict[str, Any]:
-    """AI가 최종 회의록 보고서를 생성합니다."""
-    print("\n" + "="*70)
-    print("📄 [3단계] AI가 최종 보고서를 생성합니다...")
-    print("="*70)
-    
+def build_report_messages(state: MeetingState) -> list:
+    """최종 보고서 프롬프트를 만듭니다."""
     # 액션 아이템을 텍스트로 변환
     action_items_text = "\n".join([
         f"- {item['title']} (담당: {item['assignee']}, 마감: {item['deadline']}, 우선순위: {item['priority']})"
@@ -368,12 +455,19 @@ def generate_final_report(state: MeetingState) -> Dict[str, Any]:
 
 전문적이고 명확하게 작성하세요."""
     
-    messages = [
+    return [
         SystemMessage(content="당신은 회의록 보고서 작성 전문가입니다."),
         HumanMessage(content=prompt)
     ]
+
+
+def generate_final_report(state: MeetingState) -> Dict[str, Any]:
+    """AI가 최종 회의록 보고서를 생성합니다."""
+    print("\n" + "="*70)
+    print("📄 [3단계] AI가 최종 보고서를 생성합니다...")
+    print("="*70)
     
-    response = llm.invoke(messages)
+    response = llm.invoke(build_report_messages(state))
     final_report = response.content
     
     print("\n✅ 최종 보고서 생성 완료!")
@@ -499,6 +593,384 @@ def create_meeting_assistant_graph():
     return workflow.compile()
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 비동기 버전: 병렬 LLM 호출 + interrupt 기반 Human-in-the-Loop
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 요약과 액션 아이템 추출은 둘 다 회의 내용만 필요하므로 동시에 실행합니다.
+# 사람의 검토는 input()으로 기다리지 않고 interrupt()로 그래프를 멈춘 뒤,
+# 체크포인터에 상태를 저장하고 Command(resume=...)로 이어서 실행합니다.
+# 검토를 기다리는 동안 워커를 점유하지 않으므로 한 프로세스에서 여러 회의를 처리할 수 있습니다.
+#
+# interrupt 값과 resume 값:
+#   summary_review: {"summary"}            → {"approved": bool, "summary": 수정한 요약(선택)}
+#   action_review:  {"action_items"}       → {"approved": bool, "action_items": 수정한 목록(선택)}
+#   send_review:    {"final_report"}       → {"approved": bool}
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """현재 실행 중인 이벤트 루프에서 LLM 동시 요청 수를 제한하는 세마포어를 반환합니다."""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def ainvoke_llm(messages: list) -> str:
+    """동시 요청 수를 제한하면서 LLM을 비동기로 호출합니다."""
+    async with get_llm_semaphore():
+        response = await llm.ainvoke(messages)
+    return response.content
+
+
+async def ainvoke_llm_structured(messages: list, schema):
+    """동시 요청 수를 제한하면서 schema 형식의 구조화 출력을 받습니다."""
+    async with get_llm_semaphore():
+        return await ainvoke_structured(llm, messages, schema)
+
+
+async def agenerate_summary(state: MeetingState) -> Dict[str, Any]:
+    """AI가 회의 내용을 요약합니다. (비동기)"""
+    summary = await ainvoke_llm(build_summary_messages(state))
+    return {"summary": summary}
+
+
+async def aextract_action_items(state: MeetingState) -> Dict[str, Any]:
+    """AI가 액션 아이템을 추출합니다. (비동기)"""
+    try:
+        result = await ainvoke_llm_structured(build_action_items_messages(state), ActionItemList)
+    except StructuredOutputError as e:
+        print(f"⚠️ 액션 아이템 추출 실패: {e}")
+        return {"action_items": []}
+    return {"action_items": [item.model_dump() for item in result.action_items]}
+
+
+async def agenerate_final_report(state: MeetingState) -> Dict[str, Any]:
+    """AI가 최종 회의록 보고서를 생성합니다. (비동기)"""
+    final_report = await ainvoke_llm(build_report_messages(state))
+    return {"final_report": final_report, "current_step": "report_generated"}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 긴 회의록: 청크 단위 map-reduce
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 회의록이 LONG_TRANSCRIPT_TOKENS보다 길면 발언 단위로 청크를 나누고, 청크마다
+# LLM을 한 번만 호출해 요점·결정 사항·액션 아이템을 함께 뽑습니다 (map, 동시 실행).
+# 요점은 REDUCE_MAX_TOKENS 안에 들어올 때까지 여러 단계로 합친 뒤 최종 요약을 만듭니다 (reduce).
+# 회의록을 한 번만 읽으므로 비용은 길이에 비례하고, 지연 시간은 reduce 단계 수만큼만 늘어납니다.
+LONG_TRANSCRIPT_TOKENS = int(os.getenv("MEETING_LONG_TRANSCRIPT_TOKENS", "6000"))
+CHUNK_MAX_TOKENS = int(os.getenv("MEETING_CHUNK_MAX_TOKENS", "2000"))
+REDUCE_MAX_TOKENS = int(os.getenv("MEETING_REDUCE_MAX_TOKENS", "3000"))
+
+# "[팀장 김철수]: ..." 형식의 발언 시작
+SPEAKER_TURN_PATTERN = re.compile(r"^[ \t]*\[[^\]\n]+\][ \t]*:", re.MULTILINE)
+
+
+def pack_by_tokens(pieces: List[str], max_tokens: int, sep: str = "\n") -> List[str]:
+    """조각들을 순서대로 이어 붙여 max_tokens를 넘지 않는 묶음으로 만듭니다."""
+    packed, current, current_tokens = [], [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            packed.append(sep.join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        packed.append(sep.join(current))
+    return packed
+
+
+def split_speaker_turns(transcript: str) -> List[str]:
+    """회의록을 발언 단위로 나눕니다. 발언 표시가 없으면 빈 줄 기준 문단으로 나눕니다."""
+    starts = [match.start() for match in SPEAKER_TURN_PATTERN.finditer(transcript)]
+    if not starts:
+        return [p.strip() for p in re.split(r"\n\s*\n", transcript) if p.strip()]
+    
+    bounds = [0] + starts[1:] + [len(transcript)]
+    turns = [transcript[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+    return [turn for turn in turns if turn]
+
+
+def split_transcript(transcript: str, max_tokens: int = CHUNK_MAX_TOKENS) -> List[str]:
+    """
+    회의록을 max_tokens 이하의 청크로 나눕니다. 발언 중간에서는 자르지 않으며,
+    한 발언이 max_tokens보다 길 때만 문장 단위로 나눕니다.
+    """
+    turns = []
+    for turn in split_speaker_turns(transcript):
+        if count_tokens(turn) <= max_tokens:
+            turns.append(turn)
+            continue
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+|\n", turn) if s.strip()]
+        turns.extend(pack_by_tokens(sentences, max_tokens, sep=" "))
+    return pack_by_tokens(turns, max_tokens)
+
+
+def build_chunk_notes_messages(chunk: str, index: int, total: int, team_members: List[str]) -> list:
+    """청크 하나에서 요점, 결정 사항, 액션 아이템을 함께 뽑는 프롬프트를 만듭니다."""
+    prompt = f"""다음은 긴 회의록의 {index}/{total}번째 부분입니다. 이 부분의 내용만 정리해주세요.
+
+회의 내용:
+{chunk}
+
+팀원 목록: {", ".join(team_members)}
+
+다음 JSON 형식으로 응답하세요 (오직 JSON만 반환하고 다른 텍스트는 포함하지 마세요):
+{{
+  "key_points": ["주요 논의 사항"],
+  "decisions": ["결정 사항"],
+  "action_items": [
+    {{
+      "title": "액션 아이템 제목",
+      "description": "상세 설명",
+      "assignee": "담당자 이름 (팀원 중에서)",
+      "deadline": "권장 마감일 (오늘부터 며칠 후, 예: '3일 후', '1주일 후')",
+      "priority": "low/medium/high"
+    }}
+  ]
+}}"""
+    
+    return [
+        SystemMessage(content="당신은 회의록을 정리하는 전문가입니다. 응답은 반드시 순수 JSON 형식만 반환하세요."),
+        HumanMessage(content=prompt)
+    ]
+
+
+def build_condense_messages(notes: str) -> list:
+    """여러 부분의 메모를 하나의 짧은 메모로 합치는 프롬프트를 만듭니다."""
+    prompt = f"""다음은 한 회의를 부분별로 정리한 메모입니다.
+중복을 없애고, 주요 논의 사항과 결정 사항을 빠뜨리지 말고 더 짧은 메모 하나로 합쳐주세요.
+
+{notes}"""
+    
+    return [
+        SystemMessage(content="당신은 회의록 작성 전문가입니다."),
+        HumanMessage(content=prompt)
+    ]
+
+
+def format_chunk_notes(notes: Dict[str, Any]) -> str:
+    """청크 정리 결과를 reduce 단계에 넘길 텍스트로 만듭니다."""
+    lines = [f"[부분 {notes['index']}]"]
+    lines += [f"- {point}" for point in notes.get("key_points", [])]
+    lines += [f"- (결정) {decision}" for decision in notes.get("decisions", [])]
+    return "\n".join(lines)
+
+
+def merge_action_items(chunk_notes: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """청크별 액션 아이템을 합치고, 제목과 담당자가 같은 항목은 하나만 남깁니다."""
+    merged, seen = [], set()
+    for notes in chunk_notes:
+        for item in notes.get("action_items", []):
+            key = (" ".join(str(item.get("title", "")).split()).lower(), item.get("assignee", ""))
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
+
+
+async def amap_transcript_chunks(transcript: str, team_members: List[str]) -> List[Dict[str, Any]]:
+    """회의록을 청크로 나누고, 모든 청크를 동시에 정리합니다 (map)."""
+    chunks = split_transcript(transcript)
+    
+    async def map_chunk(index: int, chunk: str) -> Dict[str, Any]:
+        messages = build_chunk_notes_messages(chunk, index, len(chunks), team_members)
+        try:
+            notes = await ainvoke_llm_structured(messages, ChunkNotes)
+        except StructuredOutputError as e:
+            # 수정까지 실패하면 응답 텍스트를 요점으로 사용합니다.
+            notes = ChunkNotes(key_points=[e.text.strip()])
+        return {"index": index, **notes.model_dump()}
+    
+    return await asyncio.gather(
+        *(map_chunk(i, chunk) for i, chunk in enumerate(chunks, 1))
+    )
+
+
+async def areduce_summary(state: MeetingState, chunk_notes: List[Dict[str, Any]]) -> str:
+    """청크 정리 결과를 예산 안에 들어올 때까지 단계적으로 합친 뒤 최종 요약을 만듭니다 (reduce)."""
+    notes = [format_chunk_notes(n) for n in chunk_notes]
+    while len(notes) > 1 and count_tokens("\n\n".join(notes)) > REDUCE_MAX_TOKENS:
+        groups = pack_by_tokens(notes, REDUCE_MAX_TOKENS, sep="\n\n")
+        if len(groups) == len(notes):
+            # 메모 하나하나가 예산에 가까우면 두 개씩 묶어서라도 줄여 나갑니다.
+            groups = ["\n\n".join(notes[i:i + 2]) for i in range(0, len(notes), 2)]
+        notes = await asyncio.gather(
+            *(ainvoke_llm(build_condense_messages(group)) for group in groups)
+        )
+    return await ainvoke_llm(build_summary_messages(state, notes="\n\n".join(notes)))
+
+
+async def amap_reduce_transcript(state: MeetingState) -> Dict[str, Any]:
+    """긴 회의록을 한 번만 읽어 요약과 액션 아이템을 함께 만듭니다."""
+    chunk_notes = await amap_transcript_chunks(state.meeting_transcript, state.team_members)
+    summary = await areduce_summary(state, chunk_notes)
+    return {
+        "chunk_notes": chunk_notes,
+        "summary": summary,
+        "action_items": merge_action_items(chunk_notes),
+    }
+
+
+async def aregenerate_summary(state: MeetingState) -> Dict[str, Any]:
+    """거부된 요약을 다시 만듭니다. 긴 회의록이면 저장된 청크 정리 결과로 reduce만 다시 합니다."""
+    if state.chunk_notes:
+        return {"summary": await areduce_summary(state, state.chunk_notes)}
+    return await agenerate_summary(state)
+
+
+def route_by_transcript_length(state: MeetingState) -> List[str]:
+    """짧은 회의록은 요약과 액션 아이템을 따로 동시에, 긴 회의록은 map-reduce로 처리합니다."""
+    if count_tokens(state.meeting_transcript) > LONG_TRANSCRIPT_TOKENS:
+        return ["map_reduce_transcript"]
+    return ["generate_summary", "extract_actions"]
+
+
+def review_summary_interrupt(state: MeetingState) -> Dict[str, Any]:
+    """요약 검토를 요청하고 사람의 답을 기다립니다."""
+    decision = interrupt({"step": "summary_review", "summary": state.summary})
+    if not decision.get("approved"):
+        return {"summary_approved": False, "current_step": "summary_rejected"}
+    return {
+        "summary": decision.get("summary") or state.summary,
+        "summary_approved": True,
+        "current_step": "summary_approved",
+    }
+
+
+def review_action_items_interrupt(state: MeetingState) -> Dict[str, Any]:
+    """액션 아이템 검토를 요청하고 사람이 수정한 목록을 받습니다."""
+    decision = interrupt({"step": "action_review", "action_items": state.action_items})
+    return {
+        "action_items": decision.get("action_items", state.action_items),
+        "action_items_approved": bool(decision.get("approved")),
+        "current_step": "action_items_approved" if decision.get("approved") else "action_items_modified",
+    }
+
+
+def approve_send_interrupt(state: MeetingState) -> Dict[str, Any]:
+    """최종 보고서 전송 승인을 요청합니다."""
+    decision = interrupt({"step": "send_review", "final_report": state.final_report})
+    if decision.get("approved"):
+        return {"send_approved": True, "current_step": "completed"}
+    return {"send_approved": False, "current_step": "send_cancelled"}
+
+
+def create_async_meeting_assistant_graph(checkpointer=None):
+    """
+    비동기 회의록 자동화 시스템 그래프를 생성합니다.
+
+    Args:
+        checkpointer: interrupt 사이에 상태를 저장할 체크포인터. 없으면 InMemorySaver를 사용합니다.
+
+    Returns:
+        ainvoke / astream으로 실행하는 컴파일된 그래프
+    """
+    workflow = StateGraph(MeetingState)
+    
+    # 노드 추가
+    workflow.add_node("generate_summary", agenerate_summary)
+    workflow.add_node("extract_actions", aextract_action_items)
+    workflow.add_node("approve_summary", review_summary_interrupt)
+    workflow.add_node("map_reduce_transcript", amap_reduce_transcript)
+    workflow.add_node("regenerate_summary", aregenerate_summary)
+    workflow.add_node("review_actions", review_action_items_interrupt)
+    workflow.add_node("generate_report", agenerate_final_report)
+    workflow.add_node("approve_send", approve_send_interrupt)
+    
+    # ① 짧은 회의록: 요약과 액션 아이템 추출을 동시에 실행하고, 둘 다 끝나면 요약 검토
+    #    긴 회의록: 청크 map-reduce 한 번으로 요약과 액션 아이템을 함께 생성
+    workflow.add_conditional_edges(
+        START,
+        route_by_transcript_length,
+        ["generate_summary", "extract_actions", "map_reduce_transcript"]
+    )
+    workflow.add_edge(["generate_summary", "extract_actions"], "approve_summary")
+    workflow.add_edge("map_reduce_transcript", "approve_summary")
+    
+    # ② 요약이 거부되면 요약만 다시 생성 (액션 아이템은 그대로 사용)
+    workflow.add_conditional_edges(
+        "approve_summary",
+        route_after_summary_approval,
+        {
+            "approved": "review_actions",
+            "regenerate": "regenerate_summary"
+        }
+    )
+    workflow.add_edge("regenerate_summary", "approve_summary")
+    
+    workflow.add_conditional_edges(
+        "review_actions",
+        route_after_action_review,
+        {
+            "approved": "generate_report",
+            "modify_again": "review_actions"
+        }
+    )
+    
+    workflow.add_edge("generate_report", "approve_send")
+    workflow.add_conditional_edges(
+        "approve_send",
+        route_after_send_approval,
+        {
+            "sent": END,
+            "cancelled": END
+        }
+    )
+    
+    return workflow.compile(checkpointer=checkpointer or InMemorySaver())
+
+
+def ask_human(request: Dict[str, Any]) -> Dict[str, Any]:
+    """CLI에서 interrupt 요청에 대한 사람의 답을 입력받습니다."""
+    step = request["step"]
+    if step == "summary_review":
+        print(f"\n📋 AI가 생성한 요약:\n\n{request['summary']}\n" + "-"*70)
+        while True:
+            approval = input("\n✅ 이 요약을 승인하시겠습니까? (y: 승인, n: 거부, e: 수정): ").lower()
+            if approval == 'y':
+                return {"approved": True}
+            if approval == 'e':
+                return {"approved": True, "summary": input("\n✏️ 수정할 내용을 입력하세요:\n")}
+            if approval == 'n':
+                return {"approved": False}
+            print("⚠️ y, n, e 중 하나를 입력하세요.")
+    
+    if step == "action_review":
+        print("\n📋 액션 아이템:")
+        for i, item in enumerate(request["action_items"], 1):
+            print(f"  {i}. {item.get('title', '')} - {item.get('assignee', '')} ({item.get('deadline', '')})")
+        # 수정한 목록은 승인되지 않은 채로 돌려보내 다시 검토를 받습니다.
+        updated_items = choose_action_item_edit(request["action_items"])
+        if updated_items is None:
+            return {"approved": True}
+        return {"approved": False, "action_items": updated_items}
+    
+    print(f"\n📄 최종 보고서:\n{'='*70}\n{request['final_report']}\n{'='*70}")
+    return {"approved": input("\n✅ 이 보고서를 팀원들에게 전송하시겠습니까? (y/n): ").lower() == 'y'}
+
+
+async def arun_meeting(
+    transcript: str, team_members: List[str], checkpointer=None
+) -> Dict[str, Any]:
+    """비동기 그래프를 실행하고, 멈출 때마다 CLI에서 답을 받아 이어서 실행합니다."""
+    if checkpointer is None and CHECKPOINT_DB_PATH:
+        with DeltaSqliteSaver.from_conn_string(CHECKPOINT_DB_PATH) as saver:
+            return await arun_meeting(transcript, team_members, saver)
+
+    app = create_async_meeting_assistant_graph(checkpointer)
+    config = {"configurable": {"thread_id": uuid4().hex}}
+    
+    result = await app.ainvoke(
+        MeetingState(meeting_transcript=transcript, team_members=team_members), config
+    )
+    while "__interrupt__" in result:
+        request = result["__interrupt__"][0].value
+        # input()은 블로킹이므로 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+        answer = await asyncio.to_thread(ask_human, request)
+        result = await app.ainvoke(Command(resume=answer), config)
+    return result
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 메인 실행
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -573,20 +1045,25 @@ def main():
         transcript = sample_transcript
         print("\n✅ 샘플 회의록을 사용합니다.")
     
+    use_async = input("\n⚡ 비동기 그래프로 실행하시겠습니까? (요약/액션 아이템 동시 생성, y/n): ").lower() == 'y'
+
     # 그래프 생성 및 실행
-    app = create_meeting_assistant_graph()
-    
+    app = create_async_meeting_assistant_graph() if use_async else create_meeting_assistant_graph()
+
     initial_state = MeetingState(
         meeting_transcript=transcript,
         team_members=team_members
     )
-    
+
     print("\n" + "🚀"*35)
     print("🚀 회의록 자동화 시스템을 시작합니다!")
     print("🚀"*70)
-    
+
     # 실행
-    final_state = app.invoke(initial_state)
+    if use_async:
+        final_state = asyncio.run(arun_meeting(transcript, team_members))
+    else:
+        final_state = app.invoke(initial_state)
     
     # 최종 결과
     print("\n\n" + "🎉"*35)
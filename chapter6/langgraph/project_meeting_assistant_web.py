@@ -3,24 +3,150 @@
 =========================================
 
 Flask 기반 웹 인터페이스로 더욱 실용적!
+
+LLM 호출은 백그라운드 이벤트 루프에서 실행되므로, 작업을 시작하는 API는
+202 응답을 바로 돌려줍니다. 결과는 다음 두 방법 중 하나로 받습니다.
+    - 폴링: GET /api/sessions/<session_id> 를 status가 "running"이 아닐 때까지 호출
+      요청 스레드를 잠깐만 쓰므로 동시 사용자가 많을 때는 이 방법을 권장합니다.
+    - SSE:  GET /api/sessions/<session_id>/events 로 상태 이벤트 수신
+      스트림은 현재 상태를 보내고, 상태가 한 번 바뀌거나 SSE_MAX_WAIT초가 지나면 닫힙니다.
+      EventSource는 retry 간격 뒤에 다시 연결하므로, status가 "running"이 아닌 이벤트를
+      받으면 클라이언트에서 close()하세요. (요청 스레드를 작업 내내 붙잡지 않습니다.)
+
+세션 저장소는 MEETING_SESSION_BACKEND 환경 변수로 고릅니다 (meeting_sessions.py 참고).
+여러 워커 프로세스로 실행할 때는 sqlite를 사용하세요.
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, abort, render_template, request, jsonify, stream_with_context
 from project_meeting_assistant import (
-    MeetingState, 
-    generate_summary,
-    extract_action_items,
-    generate_final_report,
-    create_meeting_assistant_graph
+    LONG_TRANSCRIPT_TOKENS,
+    MeetingState,
+    aextract_action_items,
+    agenerate_final_report,
+    agenerate_summary,
+    amap_reduce_transcript,
+    aregenerate_summary,
+    count_tokens,
 )
+from meeting_sessions import BackgroundJobRunner, MeetingSession, create_session_store
+import asyncio
+import dataclasses
+import json
 import secrets
 import os
+import time
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# 세션 데이터 저장
-sessions_data = {}
+# 세션 저장소와 백그라운드 작업 실행기
+store = create_session_store()
+jobs = BackgroundJobRunner()
+
+# SSE 연결이 세션 상태를 확인하는 간격(초), 상태 변화를 기다리는 최대 시간(초),
+# 연결이 닫힌 뒤 EventSource가 다시 연결할 때까지의 간격(밀리초)
+SSE_POLL_INTERVAL = 0.25
+SSE_MAX_WAIT = 5
+SSE_RETRY_MS = 1000
+
+
+async def analyze_meeting(state: MeetingState) -> dict:
+    """요약과 액션 아이템을 동시에 만듭니다. 긴 회의록은 map-reduce로 한 번에 처리합니다."""
+    if count_tokens(state.meeting_transcript) > LONG_TRANSCRIPT_TOKENS:
+        return await amap_reduce_transcript(state)
+    summary, actions = await asyncio.gather(
+        agenerate_summary(state), aextract_action_items(state)
+    )
+    return {**summary, **actions}
+
+
+async def run_job(
+    session_id: str, state: MeetingState, job, next_step: str, started_at: float
+) -> None:
+    """job 결과를 상태에 반영하고 세션을 next_step 단계로 옮깁니다. 실패하면 이전 단계로 되돌립니다."""
+    try:
+        update = await job(state)
+        error = None
+    except Exception as e:
+        update, error = None, e
+
+    # 저장소의 현재 세션이 이 작업을 기다리는 경우에만 반영합니다. 제한 시간을 넘겨
+    # 실패 처리되었거나 새 작업이 시작되었으면 늦게 끝난 결과는 버립니다.
+    # (메모리 저장소는 저장된 객체를 그대로 돌려주므로 바꾸기 전에 확인하고, 복사본을 저장합니다.)
+    current = store.get(session_id)
+    if current is None or current.job_status != "running" or current.job_started_at != started_at:
+        return
+    if error is not None:
+        result = dataclasses.replace(
+            current, step=current.job_failed_step, job_status="error", job_error=str(error)
+        )
+    else:
+        result = dataclasses.replace(
+            current,
+            state=current.state.model_copy(update=update),
+            step=next_step,
+            job_status="idle",
+            job_error="",
+        )
+    store.put(result)
+
+
+def start_job(session: MeetingSession, running_step: str, job, next_step: str):
+    """백그라운드 작업을 시작하고 202 응답을 반환합니다."""
+    session.job_failed_step = session.step
+    session.job_started_at = time.time()
+    session.step = running_step
+    session.job_status = "running"
+    session.job_error = ""
+    store.put(session)
+    jobs.submit(
+        run_job(session.session_id, session.state, job, next_step, session.job_started_at)
+    )
+    return jsonify(session_view(session)), 202
+
+
+def session_view(session: MeetingSession) -> dict:
+    """클라이언트에 보낼 세션 상태. 현재 단계에 필요한 데이터만 담습니다."""
+    view = {
+        'session_id': session.session_id,
+        'step': session.step,
+        'status': session.job_status,
+    }
+    if session.job_error:
+        view['error'] = session.job_error
+    if session.step == 'summary_review':
+        view['summary'] = session.state.summary
+    elif session.step == 'action_review':
+        view['action_items'] = session.state.action_items
+    elif session.step == 'final_review':
+        view['final_report'] = session.state.final_report
+    return view
+
+
+def load_session(session_id: str) -> MeetingSession | None:
+    """세션을 찾고, 제한 시간을 넘긴 running 작업은 실패로 바꿔 저장합니다."""
+    session = store.get(session_id)
+    if session is not None and session.expire_stale_job():
+        store.put(session)
+    return session
+
+
+def get_idle_session(session_id: str, step: str) -> MeetingSession:
+    """step 단계의 세션을 찾습니다. 없으면 404, 작업 중이거나 다른 단계이면 409로 응답합니다."""
+    session = load_session(session_id)
+    if session is None:
+        abort(404, description='Session not found')
+    if session.job_status == 'running':
+        abort(409, description='Job already running')
+    if session.step != step:
+        abort(409, description=f'Session is at step {session.step!r}, not {step!r}')
+    return session
+
+
+@app.errorhandler(404)
+@app.errorhandler(409)
+def json_error(error):
+    return jsonify({'error': error.description}), error.code
 
 
 @app.route('/')
@@ -45,18 +171,9 @@ def start_meeting():
         team_members=team_members
     )
     
-    # 요약 생성
-    summary_result = generate_summary(state)
-    state.summary = summary_result['summary']
-    
-    # 세션에 저장
-    sessions_data[session_id] = state
-    
-    return jsonify({
-        'session_id': session_id,
-        'summary': state.summary,
-        'step': 'summary_review'
-    })
+    # 요약 + 액션 아이템 생성 (백그라운드)
+    session = MeetingSession(session_id=session_id, state=state)
+    return start_job(session, 'analyzing', analyze_meeting, 'summary_review')
 
 
 @app.route('/api/approve_summary', methods=['POST'])
@@ -67,34 +184,20 @@ def approve_summary_api():
     approved = data.get('approved', False)
     edited_summary = data.get('edited_summary', '')
     
-    state = sessions_data.get(session_id)
-    if not state:
-        return jsonify({'error': 'Session not found'}), 404
+    session = get_idle_session(session_id, 'summary_review')
     
     if edited_summary:
-        state.summary = edited_summary
+        session.state.summary = edited_summary
     
     if approved:
-        # 액션 아이템 추출
-        action_result = extract_action_items(state)
-        state.action_items = action_result['action_items']
-        
-        sessions_data[session_id] = state
-        
-        return jsonify({
-            'action_items': state.action_items,
-            'step': 'action_review'
-        })
-    else:
-        # 재생성 요청
-        summary_result = generate_summary(state)
-        state.summary = summary_result['summary']
-        sessions_data[session_id] = state
-        
-        return jsonify({
-            'summary': state.summary,
-            'step': 'summary_review'
-        })
+        # 액션 아이템은 요약과 함께 이미 추출되어 있습니다.
+        session.state.summary_approved = True
+        session.step = 'action_review'
+        store.put(session)
+        return jsonify(session_view(session))
+    
+    # 재생성 요청 (백그라운드)
+    return start_job(session, 'regenerating_summary', aregenerate_summary, 'summary_review')
 
 
 @app.route('/api/approve_actions', methods=['POST'])
@@ -104,22 +207,13 @@ def approve_actions_api():
     session_id = data.get('session_id')
     action_items = data.get('action_items', [])
     
-    state = sessions_data.get(session_id)
-    if not state:
-        return jsonify({'error': 'Session not found'}), 404
+    session = get_idle_session(session_id, 'action_review')
     
-    state.action_items = action_items
+    session.state.action_items = action_items
+    session.state.action_items_approved = True
     
-    # 최종 보고서 생성
-    report_result = generate_final_report(state)
-    state.final_report = report_result['final_report']
-    
-    sessions_data[session_id] = state
-    
-    return jsonify({
-        'final_report': state.final_report,
-        'step': 'final_review'
-    })
+    # 최종 보고서 생성 (백그라운드)
+    return start_job(session, 'generating_report', agenerate_final_report, 'final_review')
 
 
 @app.route('/api/send_report', methods=['POST'])
@@ -128,13 +222,15 @@ def send_report_api():
     data = request.json
     session_id = data.get('session_id')
     
-    state = sessions_data.get(session_id)
-    if not state:
-        return jsonify({'error': 'Session not found'}), 404
+    session = get_idle_session(session_id, 'final_review')
     
     # 실제로는 이메일 전송 등을 수행
     print(f"📧 보고서 전송:")
-    print(state.final_report)
+    print(session.state.final_report)
+    
+    session.state.send_approved = True
+    session.step = 'completed'
+    store.put(session)
     
     return jsonify({
         'success': True,
@@ -142,6 +238,55 @@ def send_report_api():
     })
 
 
+@app.route('/api/sessions/<session_id>')
+def get_session_api(session_id):
+    """세션 상태 조회 (폴링)"""
+    session = load_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+    return jsonify(session_view(session))
+
+
+@app.route('/api/sessions/<session_id>/events')
+def session_events_api(session_id):
+    """
+    현재 세션 상태를 SSE 이벤트로 보내고, 작업 중이면 상태가 한 번 바뀔 때까지만 기다립니다.
+
+    요청 스레드를 LLM 작업 내내 점유하지 않도록 스트림을 짧게 유지하고,
+    retry 필드로 EventSource가 다시 연결할 간격을 알려줍니다.
+    """
+    def generate():
+        last_view = None
+        deadline = time.monotonic() + SSE_MAX_WAIT
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            session = load_session(session_id)
+            if session is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Session not found'})}\n\n"
+                return
+            view = session_view(session)
+            if view != last_view:
+                yield f"event: session\ndata: {json.dumps(view, ensure_ascii=False)}\n\n"
+                if last_view is not None or session.job_status != 'running':
+                    return
+                last_view = view
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(SSE_POLL_INTERVAL)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/stats')
+def stats_api():
+    """세션 저장소와 백그라운드 작업 현황"""
+    return jsonify({'sessions': store.stats(), 'jobs': jobs.stats()})
+
+
 if __name__ == '__main__':
     # templates 디렉토리가 없으면 생성
     os.makedirs('templates', exist_ok=True)
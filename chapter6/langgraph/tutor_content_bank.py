@@ -0,0 +1,404 @@
+"""
+AI 학습 튜터의 주제별 설명 캐시와 퀴즈 은행
+
+인기 있는 주제는 학습자마다 같은 설명과 비슷한 퀴즈를 매번 새로 생성하게 됩니다.
+이 모듈은 주제별 설명을 한 번만 생성해 저장하고, 퀴즈를 미리 여러 개 만들어 두어
+학습 세션이 LLM을 기다리지 않고 은행에서 바로 출제하도록 합니다.
+
+- 설명 캐시: 정규화한 주제 문자열을 키로 SQLite에 저장
+- 퀴즈 은행: 백그라운드에서 여러 퀴즈를 동시에 생성하고,
+  질문 임베딩의 코사인 유사도가 기준 이상인 (사실상 같은) 문제는 버립니다.
+
+환경 변수:
+    TUTOR_BANK_DB_PATH: SQLite 파일 경로 (기본값: 이 파일 옆의 tutor_content_bank.sqlite3)
+    TUTOR_QUIZ_BANK_SIZE: 주제마다 미리 만들어 둘 퀴즈 수 (기본값: 12)
+    TUTOR_BANK_CONCURRENCY: 동시에 보낼 최대 퀴즈 생성 요청 수 (기본값: 4)
+    TUTOR_QUIZ_DEDUP_SIMILARITY: 같은 문제로 볼 질문 유사도 (기본값: 0.9)
+
+미리 채우기:
+    python tutor_content_bank.py "파이썬 리스트 컴프리헨션" "파이썬 데코레이터"
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from utils.structured_output import ainvoke_structured
+
+BANK_DB_PATH = os.getenv(
+    "TUTOR_BANK_DB_PATH", str(Path(__file__).resolve().parent / "tutor_content_bank.sqlite3")
+)
+QUIZ_BANK_SIZE = int(os.getenv("TUTOR_QUIZ_BANK_SIZE", "12"))
+BANK_CONCURRENCY = int(os.getenv("TUTOR_BANK_CONCURRENCY", "4"))
+DEDUP_SIMILARITY = float(os.getenv("TUTOR_QUIZ_DEDUP_SIMILARITY", "0.9"))
+AVOID_QUESTIONS_IN_PROMPT = 5  # 퀴즈 생성 프롬프트에 넣을 기존 문제의 최대 개수
+
+# 동시에 생성하는 퀴즈가 서로 겹치지 않도록 요청마다 다른 출제 관점을 줍니다.
+QUIZ_ANGLES = [
+    "핵심 개념의 정의",
+    "코드나 실제 사례의 결과 예측",
+    "초보자가 자주 하는 실수",
+    "비슷한 개념과의 차이점",
+    "언제 사용하면 좋은지 (활용 상황)",
+    "동작 원리",
+]
+
+
+# 퀴즈 생성 결과 형식
+class Quiz(BaseModel):
+    question: str = Field(description="질문")
+    choices: list[str] = Field(description="선택지 4개")
+    answer: str = Field(description="정답 선택지의 정확한 텍스트")
+
+
+@dataclass
+class BankedQuiz:
+    """퀴즈 은행에 저장된 퀴즈"""
+
+    quiz_id: int
+    question: str
+    choices: List[str]
+    answer: str
+
+
+def normalize_topic(topic: str) -> str:
+    """대소문자와 공백이 달라도 같은 주제가 같은 키가 되도록 정리합니다."""
+    return " ".join(topic.split()).casefold()
+
+
+def build_explanation_messages(topic: str) -> List[BaseMessage]:
+    system_prompt = f"""당신은 친절한 선생님입니다.
+'{topic}' 주제를 쉽고 명확하게 설명하세요.
+
+3-4문장으로 핵심 개념을 설명하되, 예시를 포함하세요."""
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=f"{topic}에 대해 설명해주세요."),
+    ]
+
+
+def build_quiz_messages(
+    explanation: str, avoid_questions: Sequence[str] = (), angle: str = ""
+) -> List[BaseMessage]:
+    """
+    퀴즈 생성 프롬프트를 만듭니다.
+
+    Args:
+        explanation (str): 주제 설명
+        avoid_questions: 겹치지 않아야 할 기존 문제 (최근 AVOID_QUESTIONS_IN_PROMPT개만 사용)
+        angle (str): 출제 관점
+    """
+    avoid_questions = list(avoid_questions)[-AVOID_QUESTIONS_IN_PROMPT:]
+    previous_questions_text = ""
+    if avoid_questions:
+        previous_questions_text = "\n\n이미 낸 문제들 (중복 금지):\n" + "\n".join(
+            f"- {q}" for q in avoid_questions
+        )
+    angle_text = f"\n- 이번 문제는 '{angle}'을(를) 묻는 문제로 만드세요" if angle else ""
+
+    system_prompt = f"""당신은 퀴즈 출제자입니다.
+다음 설명을 바탕으로 4지선다 퀴즈를 만드세요:
+
+{explanation}
+{previous_questions_text}
+
+다음 JSON 형식으로 응답하세요:
+{{
+  "question": "질문 (명확하고 구체적으로)",
+  "choices": ["선택지1", "선택지2", "선택지3", "선택지4"],
+  "answer": "정답 선택지의 정확한 텍스트"
+}}
+
+중요:
+- 이전에 낸 문제와 완전히 다른 각도의 문제를 만드세요
+- 같은 개념의 다른 측면을 다루세요
+- 난이도는 중간 정도로, 이해도를 확인할 수 있는 문제를 만드세요{angle_text}"""
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content="퀴즈를 만들어주세요."),
+    ]
+
+
+def is_valid_quiz(quiz: Quiz) -> bool:
+    """정답이 선택지에 그대로 들어 있고 선택지가 중복되지 않는지 확인합니다."""
+    choices = quiz.choices
+    return len(choices) >= 2 and len(set(choices)) == len(choices) and quiz.answer in choices
+
+
+def _unit_vectors(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """코사인 유사도를 내적으로 구할 수 있도록 길이를 1로 맞춘 float32 행렬"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+class ContentBank:
+    """
+    주제별 설명 캐시와 퀴즈 은행입니다.
+
+    하나의 SQLite 연결을 lock으로 보호하므로, 학습 세션과 백그라운드 생성 스레드가
+    같은 인스턴스를 함께 써도 됩니다.
+
+    Args:
+        llm: 설명과 퀴즈를 생성할 채팅 모델
+        embeddings: 퀴즈 중복 판정에 사용할 임베딩 모델
+        db_path (str): SQLite 파일 경로
+        similarity_threshold (float): 이 값 이상으로 비슷한 질문은 같은 문제로 보고 버립니다
+        concurrency (int): 백그라운드에서 동시에 보낼 최대 퀴즈 생성 요청 수
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        embeddings: Embeddings,
+        db_path: str = BANK_DB_PATH,
+        similarity_threshold: float = DEDUP_SIMILARITY,
+        concurrency: int = BANK_CONCURRENCY,
+    ):
+        self.llm = llm
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.concurrency = concurrency
+        self.duplicates = 0
+        self._lock = threading.Lock()
+        self._filling: Dict[str, threading.Thread] = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS explanations ("
+            "topic_key TEXT PRIMARY KEY, topic TEXT NOT NULL, explanation TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quizzes ("
+            "quiz_id INTEGER PRIMARY KEY AUTOINCREMENT, topic_key TEXT NOT NULL, "
+            "question TEXT NOT NULL, choices TEXT NOT NULL, answer TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS quizzes_topic ON quizzes (topic_key)")
+        self._conn.commit()
+
+    # ---------- 설명 캐시 ----------
+
+    def get_explanation(self, topic: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT explanation FROM explanations WHERE topic_key = ?",
+                (normalize_topic(topic),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_explanation(self, topic: str, explanation: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO explanations (topic_key, topic, explanation, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (normalize_topic(topic), topic, explanation, time.time()),
+            )
+            self._conn.commit()
+
+    def explanation(self, topic: str) -> str:
+        """캐시된 설명을 반환하고, 없으면 생성해서 저장합니다."""
+        cached = self.get_explanation(topic)
+        if cached is not None:
+            return cached
+        explanation = self.llm.invoke(build_explanation_messages(topic)).text()
+        self.put_explanation(topic, explanation)
+        return explanation
+
+    async def aexplanation(self, topic: str) -> str:
+        """explanation의 비동기 버전"""
+        cached = await asyncio.to_thread(self.get_explanation, topic)
+        if cached is not None:
+            return cached
+        explanation = (await self.llm.ainvoke(build_explanation_messages(topic))).text()
+        await asyncio.to_thread(self.put_explanation, topic, explanation)
+        return explanation
+
+    # ---------- 퀴즈 은행 ----------
+
+    def quiz_count(self, topic: str) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM quizzes WHERE topic_key = ?", (normalize_topic(topic),)
+            ).fetchone()
+        return count
+
+    def questions(self, topic: str) -> List[str]:
+        """주제의 저장된 질문 목록 (오래된 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT question FROM quizzes WHERE topic_key = ? ORDER BY quiz_id",
+                (normalize_topic(topic),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def draw_quiz(self, topic: str, exclude_ids: Sequence[int] = ()) -> Optional[BankedQuiz]:
+        """학습자가 아직 풀지 않은 퀴즈 하나를 무작위로 꺼냅니다. 없으면 None"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT quiz_id, question, choices, answer FROM quizzes WHERE topic_key = ?",
+                (normalize_topic(topic),),
+            ).fetchall()
+        excluded = set(exclude_ids)
+        candidates = [row for row in rows if row[0] not in excluded]
+        if not candidates:
+            return None
+        quiz_id, question, choices, answer = random.choice(candidates)
+        return BankedQuiz(quiz_id, question, json.loads(choices), answer)
+
+    def add_quizzes(
+        self, topic: str, quizzes: Sequence[Quiz], vectors: Sequence[Sequence[float]]
+    ) -> List[BankedQuiz]:
+        """
+        퀴즈를 은행에 추가합니다. 기존 문제나 함께 추가하는 문제와 질문이 너무 비슷하면 버립니다.
+
+        Args:
+            topic (str): 주제
+            quizzes: 추가할 퀴즈
+            vectors: 각 퀴즈 질문의 임베딩
+
+        Returns:
+            실제로 추가된 퀴즈 목록
+        """
+        if not quizzes:
+            return []
+        topic_key = normalize_topic(topic)
+        new_vectors = _unit_vectors(vectors)
+        added = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding FROM quizzes WHERE topic_key = ?", (topic_key,)
+            ).fetchall()
+            kept = [np.frombuffer(row[0], dtype=np.float32) for row in rows]
+            for quiz, vector in zip(quizzes, new_vectors):
+                if kept and float(np.max(np.stack(kept) @ vector)) >= self.similarity_threshold:
+                    self.duplicates += 1
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT INTO quizzes (topic_key, question, choices, answer, embedding, "
+                    "created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        topic_key,
+                        quiz.question,
+                        json.dumps(quiz.choices, ensure_ascii=False),
+                        quiz.answer,
+                        vector.tobytes(),
+                        time.time(),
+                    ),
+                )
+                kept.append(vector)
+                added.append(BankedQuiz(cursor.lastrowid, quiz.question, quiz.choices, quiz.answer))
+            self._conn.commit()
+        return added
+
+    def add_quiz(self, topic: str, quiz: Quiz) -> Optional[BankedQuiz]:
+        """퀴즈 하나를 임베딩해서 추가합니다. 중복이면 None"""
+        added = self.add_quizzes(topic, [quiz], [self.embeddings.embed_query(quiz.question)])
+        return added[0] if added else None
+
+    async def afill(self, topic: str, target_size: int = QUIZ_BANK_SIZE, max_rounds: int = 3) -> int:
+        """
+        주제의 퀴즈가 target_size개가 될 때까지 퀴즈를 동시에 생성해 채웁니다.
+
+        한 라운드에서 모자란 수만큼 (최대 concurrency개씩 동시에) 생성하고,
+        중복으로 버려진 만큼은 다음 라운드에서 다시 생성합니다.
+
+        Returns:
+            추가된 퀴즈 수
+        """
+        explanation = await self.aexplanation(topic)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        added = 0
+
+        async def generate(avoid: List[str], angle: str) -> Quiz:
+            async with semaphore:
+                return await ainvoke_structured(
+                    self.llm, build_quiz_messages(explanation, avoid, angle), Quiz
+                )
+
+        for _ in range(max_rounds):
+            existing = await asyncio.to_thread(self.questions, topic)
+            missing = target_size - len(existing)
+            if missing <= 0:
+                break
+            angles = [QUIZ_ANGLES[(len(existing) + i) % len(QUIZ_ANGLES)] for i in range(missing)]
+            results = await asyncio.gather(
+                *(generate(existing, angle) for angle in angles), return_exceptions=True
+            )
+            quizzes = [q for q in results if isinstance(q, Quiz) and is_valid_quiz(q)]
+            if not quizzes:
+                continue
+            vectors = await self.embeddings.aembed_documents([q.question for q in quizzes])
+            added += len(await asyncio.to_thread(self.add_quizzes, topic, quizzes, vectors))
+        return added
+
+    def fill_in_background(
+        self, topic: str, target_size: int = QUIZ_BANK_SIZE
+    ) -> Optional[threading.Thread]:
+        """
+        별도 스레드에서 afill을 실행합니다. 이미 채우는 중이거나 가득 찼으면 None을 반환합니다.
+        """
+        topic_key = normalize_topic(topic)
+        if self.quiz_count(topic) >= target_size:
+            return None
+        with self._lock:
+            running = self._filling.get(topic_key)
+            if running is not None and running.is_alive():
+                return None
+
+            def run() -> None:
+                try:
+                    asyncio.run(self.afill(topic, target_size))
+                except Exception as e:
+                    print(f"⚠️ 퀴즈 은행 채우기 실패 ({topic}): {e}")
+
+            thread = threading.Thread(target=run, name=f"quiz-bank-{topic_key}", daemon=True)
+            self._filling[topic_key] = thread
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (explanations,) = self._conn.execute("SELECT COUNT(*) FROM explanations").fetchone()
+            (quizzes,) = self._conn.execute("SELECT COUNT(*) FROM quizzes").fetchone()
+        return {"explanations": explanations, "quizzes": quizzes, "duplicates": self.duplicates}
+
+
+async def aprefill(bank: ContentBank, topics: Sequence[str], target_size: int = QUIZ_BANK_SIZE):
+    """여러 주제의 설명과 퀴즈 은행을 동시에 미리 채웁니다."""
+    added = await asyncio.gather(*(bank.afill(topic, target_size) for topic in topics))
+    for topic, count in zip(topics, added):
+        print(f"✅ {topic}: 퀴즈 {count}개 추가 (총 {bank.quiz_count(topic)}개)")
+
+
+def main():
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+    topics = sys.argv[1:] or ["파이썬 리스트 컴프리헨션"]
+    bank = ContentBank(
+        ChatOpenAI(model="gpt-4o-mini", temperature=0.7),
+        OpenAIEmbeddings(model="text-embedding-3-small"),
+    )
+    asyncio.run(aprefill(bank, topics))
+    print(f"📦 퀴즈 은행: {bank.stats()}")
+
+
+if __name__ == "__main__":
+    main()
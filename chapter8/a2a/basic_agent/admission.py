@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class AdmissionRejected(Exception):
+    """동시 실행 한도와 대기열이 모두 차서 요청을 받을 수 없을 때 발생합니다."""
+
+
+class AdmissionController:
+    """
+    에이전트 실행의 동시 실행 수를 제한하는 입장 제어기입니다.
+
+    동시 실행 수가 max_concurrency에 도달하면 최대 max_queue개까지 대기시키고,
+    대기열이 가득 찼거나 queue_timeout초 안에 차례가 오지 않으면 요청을 거절합니다.
+
+    Args:
+        max_concurrency (int): 동시에 실행할 수 있는 최대 요청 수
+        max_queue (int): 차례를 기다릴 수 있는 최대 요청 수
+        queue_timeout (float): 대기열에서 기다릴 최대 시간(초)
+
+    사용 예시:
+        admission = AdmissionController(max_concurrency=8)
+        async with admission.slot():
+            ...
+    """
+
+    def __init__(
+        self, max_concurrency: int = 8, max_queue: int = 32, queue_timeout: float = 30.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        """실행 슬롯을 하나 얻습니다. 얻지 못하면 AdmissionRejected가 발생합니다."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected("대기열이 가득 찼습니다.")
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    f"{self.queue_timeout:.0f}초 동안 차례가 오지 않았습니다."
+                ) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
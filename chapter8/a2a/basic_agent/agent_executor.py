@@ -1,17 +1,33 @@
+import asyncio
+import time
+from typing import AsyncIterator
+from uuid import uuid4
+
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
-from a2a.types import Message
-from a2a.utils import new_agent_text_message
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, Task, TaskNotCancelableError, TaskState, TextPart
+from a2a.utils import new_agent_text_message, new_task
+from a2a.utils.errors import ServerError
+
+from basic_agent.admission import AdmissionController, AdmissionRejected
+from basic_agent.task_store import FINISHED_STATES
+
+# 작은 토큰을 모아서 하나의 아티팩트 청크로 보내는 기준 (글자 수, 초)
+STREAM_CHUNK_CHARS = 32
+STREAM_CHUNK_INTERVAL = 0.05
 
 
 class HelloAgent:
     """① 랭체인과 OpenAI를 사용한 간단한 Hello World 에이전트."""
 
-    def __init__(self):
-        self.chat = ChatOpenAI(
+    def __init__(self, chat: BaseChatModel | None = None):
+        # 부하 테스트에서는 가짜 LLM을 넘겨서 사용합니다.
+        self.chat = chat or ChatOpenAI(
             model="gpt-5-mini",
         )
 
@@ -27,60 +43,132 @@ class HelloAgent:
             ]
         )
 
+        # 체인은 요청마다 만들지 않고 한 번만 구성합니다.
+        self.chain = self.prompt | self.chat
+
     async def invoke(self, user_message: str) -> str:
         """② 유저 메시지를 처리하고 응답을 생성합니다."""
-        chain = self.prompt | self.chat
-        response = await chain.ainvoke({"message": user_message})
+        response = await self.chain.ainvoke({"message": user_message})
         return response.content
 
+    async def stream(self, user_message: str) -> AsyncIterator[str]:
+        """유저 메시지에 대한 응답을 토큰 단위로 생성합니다."""
+        async for chunk in self.chain.astream({"message": user_message}):
+            if chunk.content:
+                yield chunk.content
+
 
 class HelloAgentExecutor(AgentExecutor):
     """③ 간단한 Hello World 에이전트의 Executor"""
 
-    def __init__(self):
-        self.agent = HelloAgent()
+    def __init__(
+        self,
+        admission: AdmissionController | None = None,
+        agent: HelloAgent | None = None,
+    ):
+        self.agent = agent or HelloAgent()
+        self.admission = admission or AdmissionController()
+        # 실행 중인 요청: 태스크 ID -> 요청을 처리하는 asyncio 태스크
+        self._running: dict[str, asyncio.Task] = {}
 
     async def execute(
         self,
         context: RequestContext,
         event_queue: EventQueue,
     ):
-        """④ 요청을 처리하고 응답을 생성합니다."""
+        """④ 요청을 처리하고 응답을 토큰 단위 아티팩트로 스트리밍합니다."""
         # 유저 메시지를 추출
-        message = context.message
-        user_message = ""
-        
-        for part in message.parts:
-            if hasattr(part, 'text') and part.text:
-                user_message = part.text
-                break
-            elif hasattr(part.root, 'text') and part.root.text:
-                user_message = part.root.text
-                break
-        
+        user_message = context.get_user_input()
+
         if not user_message:
             await event_queue.enqueue_event(
                 new_agent_text_message("메시지를 받지 못했습니다.")
             )
             return
 
-        # 에이전트 실행
-        result = await self.agent.invoke(user_message)
+        # ⑤ 태스크를 만들고, 진행 상황은 TaskUpdater로 이벤트 큐에 보냅니다.
+        task = context.current_task
+        if task is None:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+        # 대기 중인 요청도 취소할 수 있도록 입장 전에 등록합니다.
+        self._running[task.id] = asyncio.current_task()
+        try:
+            # ⑥ 동시 실행 한도 안에서만 실행하고, 대기열이 넘치면 거절합니다.
+            async with self.admission.slot():
+                await updater.update_status(TaskState.working)
+                await self._stream_response(user_message, task, updater)
+        except AdmissionRejected as e:
+            await updater.reject(
+                new_agent_text_message(
+                    f"요청이 많아 지금은 처리할 수 없습니다. ({e})", task.context_id, task.id
+                )
+            )
+        finally:
+            self._running.pop(task.id, None)
+
+    async def _stream_response(
+        self, user_message: str, task: Task, updater: TaskUpdater
+    ) -> None:
+        """LLM 응답을 아티팩트 청크로 보내고 태스크를 완료합니다."""
+        artifact_id = str(uuid4())
+        buffer: list[str] = []
+        sent_chunks = 0
+        last_flush = time.monotonic()
 
-        # ⑤ 응답 메시지를 생성하고 이벤트 큐에 추가
-        await event_queue.enqueue_event(new_agent_text_message(result))
+        async def flush(last_chunk: bool = False) -> None:
+            nonlocal sent_chunks, last_flush
+            await updater.add_artifact(
+                [Part(root=TextPart(text="".join(buffer)))],
+                artifact_id=artifact_id,
+                name="response",
+                append=sent_chunks > 0,
+                last_chunk=last_chunk,
+            )
+            buffer.clear()
+            sent_chunks += 1
+            last_flush = time.monotonic()
+
+        try:
+            # ⑦ 첫 토큰은 바로 보내고, 이후에는 일정 길이나 시간이 쌓이면 모아서 전송
+            async for token in self.agent.stream(user_message):
+                buffer.append(token)
+                if (
+                    sent_chunks == 0
+                    or sum(map(len, buffer)) >= STREAM_CHUNK_CHARS
+                    or time.monotonic() - last_flush >= STREAM_CHUNK_INTERVAL
+                ):
+                    await flush()
+            await flush(last_chunk=True)
+        except Exception as e:
+            await updater.failed(
+                new_agent_text_message(
+                    f"응답 생성 중 오류가 발생했습니다: {e}", task.context_id, task.id
+                )
+            )
+            return
+
+        # ⑧ 태스크 완료
+        await updater.complete()
 
     async def cancel(
         self,
         context: RequestContext,
         event_queue: EventQueue,
     ):
-        """요청을 취소"""
-        # 취소 기능은 지원하지 않음
-        error_msg = "취소 기능은 지원되지 않습니다. Hello 에이전트는 즉시 응답합니다."
-        error_message = Message(
-            role="agent",
-            parts=[{"type": "text", "text": error_msg}],
-            messageId="cancel_error",
+        """⑨ 실행 중이거나 대기 중인 요청을 취소하고, 진행 중인 LLM 호출을 중단합니다."""
+        task = context.current_task
+        if task is None or task.status.state in FINISHED_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+
+        # asyncio 태스크를 취소하면 LLM 스트리밍 연결도 함께 닫혀 토큰 생성이 멈춥니다.
+        running = self._running.pop(task.id, None)
+        if running is not None:
+            running.cancel()
+
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        await updater.cancel(
+            new_agent_text_message("요청이 취소되었습니다.", task.context_id, task.id)
         )
-        event_queue.enqueue_event(error_message)
@@ -0,0 +1,85 @@
+"""
+부하 테스트용 Hello World 에이전트 서버
+
+실제 서버(server.py)와 같은 executor, 요청 핸들러, 태스크 저장소를 사용하되
+OpenAI 대신 일정한 속도로 토큰을 내보내는 가짜 LLM을 사용합니다.
+API 비용 없이 executor 변경의 처리량을 비교할 때 사용합니다.
+
+실행:
+    python basic_agent/fake_llm_server.py --port 9999 --tokens 60 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+from pathlib import Path
+
+import uvicorn
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# ① 파이썬 패스에 chapter8/a2a 패키지 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from a2a.server.apps import A2AFastAPIApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+
+from basic_agent.admission import AdmissionController
+from basic_agent.agent_executor import HelloAgent, HelloAgentExecutor
+from basic_agent.server import create_agent_card
+from basic_agent.task_store import BoundedTaskStore
+
+
+class FakeStreamingChatModel(GenericFakeChatModel):
+    """정해진 응답을 token_delay초 간격으로 한 단어씩 스트리밍하는 가짜 LLM"""
+
+    token_delay: float = 0.02
+
+    async def _astream(self, *args, **kwargs):
+        async for chunk in super()._astream(*args, **kwargs):
+            await asyncio.sleep(self.token_delay)
+            yield chunk
+
+
+def create_fake_chat(tokens: int, token_delay: float) -> FakeStreamingChatModel:
+    """tokens개의 단어로 이루어진 응답을 반복해서 돌려주는 가짜 LLM을 만듭니다."""
+    words = itertools.islice(itertools.cycle(["안녕하세요!", "무엇을", "도와드릴까요?"]), tokens)
+    response = AIMessage(content=" ".join(words))
+    return FakeStreamingChatModel(
+        messages=itertools.repeat(response), token_delay=token_delay
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 LLM을 사용하는 A2A 에이전트 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--tokens", type=int, default=60, help="응답 한 개의 토큰(단어) 수")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="토큰 사이 지연(초)")
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--max-queue", type=int, default=256)
+    args = parser.parse_args()
+
+    # ② 실제 서버와 같은 구성에 LLM만 가짜로 교체
+    agent_card = create_agent_card()
+    agent_card.url = f"http://localhost:{args.port}/"
+    executor = HelloAgentExecutor(
+        AdmissionController(
+            max_concurrency=args.max_concurrency, max_queue=args.max_queue
+        ),
+        agent=HelloAgent(chat=create_fake_chat(args.tokens, args.token_delay)),
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=executor,
+        task_store=BoundedTaskStore(),
+    )
+    server = A2AFastAPIApplication(agent_card=agent_card, http_handler=request_handler)
+
+    print(f"가짜 LLM 에이전트 서버 시작: http://{args.host}:{args.port}")
+    print(f"응답 {args.tokens}토큰, 토큰 간격 {args.token_delay}s")
+    uvicorn.run(server.build(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
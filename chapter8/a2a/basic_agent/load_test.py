@@ -0,0 +1,305 @@
+"""
+Hello World A2A 에이전트 부하 테스트 클라이언트
+
+test_client.py와 같은 A2ACardResolver / ClientFactory 경로로 여러 대화를 동시에 실행하고
+지연 시간 p50/p95/p99, 스트리밍의 첫 청크 도착 시간(TTFC), 오류율을 보고합니다.
+
+- --rps를 주면 초당 그만큼 요청을 보내고(open loop), 동시 실행 수는 --concurrency로 제한합니다.
+  지연 시간은 요청을 보내기로 예정된 시각부터 재므로, 서버가 밀려 비어 있는 대화를 기다린
+  시간(queue_wait)도 포함됩니다. 대기 중인 요청이 --max-backlog를 넘으면 보내지 않고
+  client_backlog 오류로 셉니다.
+- --rps가 0이면 --concurrency개의 대화가 응답을 받는 즉시 다음 요청을 보냅니다(closed loop).
+
+실행 예시:
+    # 터미널 1: 가짜 LLM 서버
+    python basic_agent/fake_llm_server.py --port 9999
+    # 터미널 2: 부하 테스트
+    python basic_agent/load_test.py --concurrency 32 --rps 50 --duration 30 --streaming
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional
+from uuid import uuid4
+
+import httpx
+
+from a2a.client import A2ACardResolver
+from a2a.client.client import ClientConfig
+from a2a.client.client_factory import ClientFactory
+from a2a.types import Message, TaskArtifactUpdateEvent, TaskState
+
+TEST_MESSAGES = ["안녕하세요", "날씨가 어때요?", "고마워요", "이름이 뭔가요?", "오늘 기분이 어때요?"]
+
+
+@dataclass
+class RequestResult:
+    """요청 하나의 측정 결과"""
+
+    latency: float
+    ttfc: Optional[float] = None
+    error: Optional[str] = None
+    queue_wait: float = 0.0
+
+
+@dataclass
+class LoadTestReport:
+    """부하 테스트 전체 결과"""
+
+    results: List[RequestResult] = field(default_factory=list)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> dict:
+        ok = [r for r in self.results if r.error is None]
+        errors = Counter(r.error for r in self.results if r.error is not None)
+        latencies = sorted(r.latency for r in ok)
+        ttfcs = sorted(r.ttfc for r in ok if r.ttfc is not None)
+        total = len(self.results)
+        return {
+            "requests": total,
+            "succeeded": len(ok),
+            "error_rate": (total - len(ok)) / total if total else 0.0,
+            "errors": dict(errors),
+            "elapsed": self.elapsed,
+            "throughput_rps": len(ok) / self.elapsed if self.elapsed else 0.0,
+            "latency": summarize(latencies),
+            "ttfc": summarize(ttfcs),
+            "queue_wait": summarize(sorted(r.queue_wait for r in ok)),
+        }
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값에서 nearest-rank 방식으로 백분위수를 구합니다."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(sorted_values: List[float]) -> dict:
+    if not sorted_values:
+        return {}
+    return {
+        "min": sorted_values[0],
+        "p50": percentile(sorted_values, 50),
+        "p95": percentile(sorted_values, 95),
+        "p99": percentile(sorted_values, 99),
+        "max": sorted_values[-1],
+        "mean": sum(sorted_values) / len(sorted_values),
+    }
+
+
+def print_histogram(title: str, values: List[float], width: int = 40) -> None:
+    """값을 2배씩 커지는 구간(ms)으로 나눈 텍스트 히스토그램을 출력합니다."""
+    if not values:
+        return
+    buckets = Counter()
+    for value in values:
+        ms = max(value * 1000, 1.0)
+        buckets[2 ** math.ceil(math.log2(ms))] += 1
+
+    print(f"\n{title}")
+    peak = max(buckets.values())
+    for upper in sorted(buckets):
+        count = buckets[upper]
+        bar = "█" * max(1, round(count / peak * width))
+        print(f"  ≤{upper:>7}ms | {bar} {count}")
+
+
+def print_report(report: LoadTestReport) -> None:
+    summary = report.to_dict()
+    print("\n" + "=" * 60)
+    print(
+        f"요청 {summary['requests']}개, 성공 {summary['succeeded']}개, "
+        f"오류율 {summary['error_rate']:.2%}, 처리량 {summary['throughput_rps']:.1f} req/s"
+    )
+    if summary["errors"]:
+        print(f"오류 종류: {summary['errors']}")
+    for name in ("latency", "ttfc", "queue_wait"):
+        stats = summary[name]
+        if stats:
+            print(
+                f"{name:>10}: p50 {stats['p50'] * 1000:.0f}ms, p95 {stats['p95'] * 1000:.0f}ms, "
+                f"p99 {stats['p99'] * 1000:.0f}ms, max {stats['max'] * 1000:.0f}ms"
+            )
+
+    ok = [r for r in report.results if r.error is None]
+    print_histogram("지연 시간 분포", [r.latency for r in ok])
+    print_histogram("첫 청크 도착 시간 분포", [r.ttfc for r in ok if r.ttfc is not None])
+    print("=" * 60)
+
+
+class Conversation:
+    """같은 context_id로 메시지를 이어서 보내는 대화 하나"""
+
+    def __init__(self, client, index: int):
+        self.client = client
+        self.index = index
+        self.context_id: Optional[str] = None
+        self.turn = 0
+
+    def next_message(self) -> Message:
+        text = TEST_MESSAGES[(self.index + self.turn) % len(TEST_MESSAGES)]
+        self.turn += 1
+        return Message(
+            role="user",
+            parts=[{"kind": "text", "text": text}],
+            messageId=uuid4().hex,
+            contextId=self.context_id,
+        )
+
+    async def send(self, scheduled_at: Optional[float] = None) -> RequestResult:
+        """
+        메시지 하나를 보내고 지연 시간과 첫 청크 도착 시간을 측정합니다.
+
+        scheduled_at을 주면 실제로 보낸 시각이 아니라 보내기로 예정된 시각부터 잽니다.
+        그래야 서버가 밀려 요청이 기다린 시간이 지연 시간에서 빠지지 않습니다
+        (coordinated omission 방지).
+        """
+        started = time.perf_counter() if scheduled_at is None else scheduled_at
+        queue_wait = time.perf_counter() - started
+        ttfc = None
+        final_state = None
+        try:
+            async for event in self.client.send_message(self.next_message()):
+                if isinstance(event, Message):
+                    ttfc = ttfc or time.perf_counter() - started
+                    final_state = TaskState.completed
+                    continue
+                task, update = event
+                self.context_id = task.context_id
+                if isinstance(update, TaskArtifactUpdateEvent) and ttfc is None:
+                    ttfc = time.perf_counter() - started
+                final_state = task.status.state
+        except Exception as e:
+            return RequestResult(
+                time.perf_counter() - started, error=type(e).__name__, queue_wait=queue_wait
+            )
+
+        latency = time.perf_counter() - started
+        if final_state != TaskState.completed:
+            state = final_state.value if final_state else "no_response"
+            return RequestResult(latency, ttfc, error=f"task_{state}", queue_wait=queue_wait)
+        return RequestResult(latency, ttfc, queue_wait=queue_wait)
+
+
+async def run_load_test(
+    base_url: str,
+    concurrency: int,
+    rps: float,
+    duration: float,
+    max_requests: Optional[int],
+    streaming: bool,
+    timeout: float,
+    max_backlog: Optional[int] = None,
+) -> LoadTestReport:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as httpx_client:
+        # ① 에이전트 카드를 가져와서 클라이언트 생성 (test_client.py와 같은 경로)
+        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
+        agent_card = await resolver.get_agent_card()
+        config = ClientConfig(httpx_client=httpx_client, streaming=streaming)
+        client = ClientFactory(config).create(agent_card)
+
+        conversations = asyncio.Queue()
+        for i in range(concurrency):
+            conversations.put_nowait(Conversation(client, i))
+
+        report = LoadTestReport(started_at=time.perf_counter())
+        deadline = report.started_at + duration
+
+        def can_send(sent: int) -> bool:
+            if max_requests is not None and sent >= max_requests:
+                return False
+            return time.perf_counter() < deadline
+
+        async def send_one(scheduled_at: Optional[float] = None) -> None:
+            conversation = await conversations.get()
+            try:
+                report.results.append(await conversation.send(scheduled_at))
+            finally:
+                conversations.put_nowait(conversation)
+
+        sent = 0
+        if rps > 0:
+            # ② open loop: 응답 속도와 관계없이 일정한 간격으로 요청을 보냅니다.
+            #    비어 있는 대화가 없으면 요청은 대화가 빌 때까지 기다리고, 그 시간도 지연 시간에
+            #    포함됩니다. 기다리는 요청이 max_backlog를 넘으면 클라이언트 과부하로 기록합니다.
+            backlog_limit = max_backlog if max_backlog is not None else concurrency * 4
+            pending = set()
+            while can_send(sent):
+                next_at = report.started_at + sent / rps
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+                sent += 1
+                if len(pending) >= backlog_limit:
+                    report.results.append(RequestResult(0.0, error="client_backlog"))
+                    continue
+                task = asyncio.create_task(send_one(next_at))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        else:
+            # ③ closed loop: 각 대화가 응답을 받는 즉시 다음 메시지를 보냅니다.
+            async def worker() -> None:
+                nonlocal sent
+                while can_send(sent):
+                    sent += 1
+                    await send_one()
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        report.finished_at = time.perf_counter()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A2A 에이전트 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:9999")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 대화 수")
+    parser.add_argument("--rps", type=float, default=0.0, help="초당 요청 수 (0이면 closed loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="테스트 시간(초)")
+    parser.add_argument("--requests", type=int, default=None, help="보낼 최대 요청 수")
+    parser.add_argument("--streaming", action="store_true", help="스트리밍 모드로 요청")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--max-backlog",
+        type=int,
+        default=None,
+        help="open loop에서 대기할 수 있는 최대 요청 수 (기본값: 동시 대화 수 × 4)",
+    )
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    mode = f"{args.rps} req/s" if args.rps > 0 else "closed loop"
+    print(f"부하 테스트 시작: {args.url}, 동시 대화 {args.concurrency}개, {mode}, {args.duration}s")
+    report = asyncio.run(
+        run_load_test(
+            args.url,
+            args.concurrency,
+            args.rps,
+            args.duration,
+            args.requests,
+            args.streaming,
+            args.timeout,
+            args.max_backlog,
+        )
+    )
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 from a2a.server.apps import A2AFastAPIApplication
 
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
+from basic_agent.admission import AdmissionController
 from basic_agent.agent_executor import HelloAgentExecutor
+from basic_agent.task_store import BoundedTaskStore
 
 
 def create_agent_card() -> AgentCard:
@@ -56,9 +57,12 @@ def main():
     print("이것은 A2A 프로토콜 학습을 위한 기본 예제입니다")
 
     # ③ 기본 요청 핸들러 생성
+    # 동시에 8개까지 실행하고 32개까지 대기, 끝난 태스크는 10분 뒤 저장소에서 삭제
     request_handler = DefaultRequestHandler(
-        agent_executor=HelloAgentExecutor(),
-        task_store=InMemoryTaskStore(),
+        agent_executor=HelloAgentExecutor(
+            AdmissionController(max_concurrency=8, max_queue=32, queue_timeout=30.0)
+        ),
+        task_store=BoundedTaskStore(max_tasks=10_000, finished_ttl=600.0),
     )
 
     # ④ A2A FastAPI 애플리케이션 생성
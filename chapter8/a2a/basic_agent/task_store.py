@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Task, TaskState
+
+# 더 이상 상태가 바뀌지 않는 태스크 상태
+FINISHED_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+
+class BoundedTaskStore(InMemoryTaskStore):
+    """
+    끝난 태스크를 정리하는 메모리 태스크 저장소입니다.
+
+    InMemoryTaskStore는 모든 태스크를 영원히 보관하므로 요청이 쌓일수록 메모리가 늘어납니다.
+    이 저장소는 끝난 태스크를 finished_ttl초 동안만 보관하고, 전체 태스크 수가
+    max_tasks를 넘으면 가장 먼저 끝난 태스크부터 삭제합니다. 실행 중인 태스크는 삭제하지 않습니다.
+
+    Args:
+        max_tasks (int): 보관할 최대 태스크 수
+        finished_ttl (float): 끝난 태스크를 보관할 시간(초)
+    """
+
+    def __init__(self, max_tasks: int = 10_000, finished_ttl: float = 600.0):
+        super().__init__()
+        self.max_tasks = max_tasks
+        self.finished_ttl = finished_ttl
+        self.evicted = 0
+        self._finished_at: OrderedDict[str, float] = OrderedDict()
+
+    async def save(self, task: Task) -> None:
+        async with self.lock:
+            self.tasks[task.id] = task
+            if task.status.state in FINISHED_STATES:
+                self._finished_at.setdefault(task.id, time.monotonic())
+            else:
+                self._finished_at.pop(task.id, None)
+            self._evict()
+
+    async def delete(self, task_id: str) -> None:
+        await super().delete(task_id)
+        async with self.lock:
+            self._finished_at.pop(task_id, None)
+
+    def _evict(self) -> None:
+        """만료되었거나 한도를 넘은 끝난 태스크를 삭제합니다. lock을 잡은 상태에서 호출합니다."""
+        expire_before = time.monotonic() - self.finished_ttl
+        while self._finished_at:
+            task_id, finished_at = next(iter(self._finished_at.items()))
+            if finished_at > expire_before and len(self.tasks) <= self.max_tasks:
+                break
+            self._finished_at.popitem(last=False)
+            self.tasks.pop(task_id, None)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        return {
+            "tasks": len(self.tasks),
+            "finished": len(self._finished_at),
+            "evicted": self.evicted,
+        }
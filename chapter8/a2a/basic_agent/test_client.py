@@ -9,8 +9,9 @@ import httpx
 from a2a.client import A2ACardResolver
 from a2a.client.client_factory import ClientFactory
 from a2a.client.client import ClientConfig
-from a2a.types import Message
+from a2a.types import Message, TaskArtifactUpdateEvent
 from a2a.utils import get_message_text
+from a2a.utils.message import get_text_parts
 
 
 def create_user_message(text: str, message_id: Optional[str] = None) -> Message:
@@ -76,12 +77,15 @@ async def test_basic_agent():
                 # ⑥ 사용자 메시지 생성
                 user_message = create_user_message(message_text)
 
-                # ⑦ 비스트리밍 메시지 전송
+                # ⑦ 비스트리밍 메시지 전송 (완료된 태스크의 아티팩트에 전체 응답이 담김)
                 async for event in non_streaming_client.send_message(user_message):
                     if isinstance(event, Message):
-                        response_text = get_message_text(event)
-                        print(response_text)
-                        break  # 첫 번째 Message 응답만 처리
+                        print(get_message_text(event))
+                    else:
+                        task, _ = event
+                        for artifact in task.artifacts or []:
+                            print("".join(get_text_parts(artifact.parts)))
+                    break  # 첫 번째 응답만 처리
 
             print("\n" + "=" * 50)
 
@@ -96,12 +100,16 @@ async def test_basic_agent():
                 # ⑨ 사용자 메시지 생성
                 user_message = create_user_message(message_text)
 
-                # ⑩ 스트리밍 메시지 전송
+                # ⑩ 스트리밍 메시지 전송 (아티팩트 청크가 도착하는 대로 출력)
                 print("   에이전트 (스트리밍): ", end="", flush=True)
                 async for event in streaming_client.send_message(user_message):
                     if isinstance(event, Message):
-                        response_text = get_message_text(event)
-                        print(response_text, end="", flush=True)
+                        print(get_message_text(event), end="", flush=True)
+                        continue
+                    _, update = event
+                    if isinstance(update, TaskArtifactUpdateEvent):
+                        chunk = "".join(get_text_parts(update.artifact.parts))
+                        print(chunk, end="", flush=True)
                 print()
 
             print("\n테스트 완료!")
@@ -44,6 +44,15 @@ class AgentState(BaseModel):
 # ============================================================
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 tools_cache = None  # 전역 변수로 도구 캐싱
+tools_by_name = {}  # 도구 이름 → 도구 (로드할 때 한 번 생성)
+MAX_CONCURRENT_TOOLS = int(os.getenv("MAX_CONCURRENT_TOOLS", "4"))  # 동시에 실행할 최대 도구 수
+
+
+def set_tools(tools) -> None:
+    """로드한 도구를 저장하고 이름으로 바로 찾을 수 있는 인덱스를 만듭니다."""
+    global tools_cache, tools_by_name
+    tools_cache = tools
+    tools_by_name = {tool.name: tool for tool in tools}
 
 
 # ============================================================
@@ -77,41 +86,50 @@ def llm_node(state: AgentState) -> dict:
     return {"ai_message": ai_msg}
 
 
+async def run_tool_call(tool_call: dict, semaphore: asyncio.Semaphore) -> ToolMessage:
+    """도구 호출 하나를 실행하고 ToolMessage로 반환"""
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+    tool_call_id = tool_call["id"]
+    
+    tool = tools_by_name.get(tool_name)
+    if tool is None:
+        result = f"도구 '{tool_name}'를 찾을 수 없습니다."
+        print(f"  ❌ {result}")
+        return ToolMessage(content=result, tool_call_id=tool_call_id, status="error")
+    
+    # 동시에 실행하는 도구 수를 semaphore로 제한
+    async with semaphore:
+        print(f"  ⚙️  도구 실행 중: {tool_name}({tool_args})")
+        try:
+            result = await tool.ainvoke(tool_args)
+        except Exception as e:
+            # 한 도구가 실패해도 나머지 도구 결과는 그대로 사용
+            print(f"  ❌ 도구 오류: {tool_name}: {e}")
+            return ToolMessage(
+                content=f"도구 '{tool_name}' 실행 오류: {e}",
+                tool_call_id=tool_call_id,
+                status="error",
+            )
+    
+    print(f"  ✅ 도구 결과: {result[:100]}..." if len(str(result)) > 100 else f"  ✅ 도구 결과: {result}")
+    return ToolMessage(content=str(result), tool_call_id=tool_call_id)
+
+
 async def tool_node(state: AgentState) -> dict:
-    """도구를 실행 (비동기) - 모든 tool_calls 처리"""
+    """도구를 실행 (비동기) - 모든 tool_calls를 동시에 처리"""
     ai_msg = state.ai_message
     
     if not ai_msg.tool_calls:
         return {"tool_results": []}
     
-    tool_messages = []
-    
-    # 모든 도구 호출 처리
-    for tool_call in ai_msg.tool_calls:
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-        tool_call_id = tool_call["id"]
-        
-        print(f"  ⚙️  도구 실행 중: {tool_name}({tool_args})")
-        
-        # 도구 실행 (비동기)
-        result = None
-        for tool in tools_cache:
-            if tool.name == tool_name:
-                result = await tool.ainvoke(tool_args)
-                print(f"  ✅ 도구 결과: {result[:100]}..." if len(str(result)) > 100 else f"  ✅ 도구 결과: {result}")
-                break
-        
-        if result is None:
-            result = f"도구 '{tool_name}'를 찾을 수 없습니다."
-            print(f"  ❌ {result}")
-        
-        # ToolMessage 생성
-        tool_messages.append(
-            ToolMessage(content=str(result), tool_call_id=tool_call_id)
-        )
+    # 모든 도구 호출을 동시에 실행 (gather는 호출 순서대로 결과를 돌려줌)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+    tool_messages = await asyncio.gather(
+        *(run_tool_call(tool_call, semaphore) for tool_call in ai_msg.tool_calls)
+    )
     
-    return {"tool_results": tool_messages}
+    return {"tool_results": list(tool_messages)}
 
 
 def response_node(state: AgentState) -> dict:
@@ -174,8 +192,6 @@ def create_simple_graph():
 # ============================================================
 async def main():
     """메인 실행 함수"""
-    global tools_cache
-    
     # 환경 체크
     if not os.getenv("OPENAI_API_KEY"):
         print("❌ OPENAI_API_KEY 환경변수가 필요합니다.")
@@ -191,8 +207,8 @@ async def main():
             async with ClientSession(read, write) as session:
                 # 1. 세션 초기화 및 도구 로드
                 await session.initialize()
-                tools_cache = await load_mcp_tools(session)
-                print(f"✅ 로드된 도구: {[tool.name for tool in tools_cache]}\n")
+                set_tools(await load_mcp_tools(session))
+                print(f"✅ 로드된 도구: {list(tools_by_name)}\n")
                 
                 # 2. 그래프 생성
                 graph = create_simple_graph()
@@ -0,0 +1,137 @@
+import asyncio
+import operator
+import os
+import sys
+from typing import Annotated
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+sys.path.insert(
+    0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "../../chapter10/mcp_langgraph_agent")),
+)
+
+from session_store import InMemorySaver, SessionStore, open_checkpointer
+
+
+class CounterState(TypedDict):
+    values: Annotated[list, operator.add]
+
+
+def build_graph(checkpointer):
+    workflow = StateGraph(CounterState)
+    workflow.add_node("first", lambda state: {"values": [1]})
+    workflow.add_node("second", lambda state: {"values": [2]})
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+async def run_turns(app, thread_id: str, count: int = 3) -> None:
+    for _ in range(count):
+        await app.ainvoke({"values": []}, config(thread_id))
+
+
+def test_memory_prune_keeps_latest_state():
+    """InMemorySaver에서 prune이 최신 체크포인트만 남기고 상태는 유지하는지 테스트합니다."""
+
+    async def main():
+        saver = InMemorySaver()
+        store = SessionStore(saver)
+        app = build_graph(saver)
+        await run_turns(app, "x")
+        before = await store.usage()
+        await store.prune("x")
+        after = await store.usage()
+        state = await app.aget_state(config("x"))
+        return before, after, state.values["values"]
+
+    before, after, values = asyncio.run(main())
+
+    assert before["stored_checkpoints"] > 1
+    assert after["stored_checkpoints"] == 1
+    assert values == [1, 2] * 3
+
+
+def test_memory_evicts_least_recently_used():
+    """max_sessions를 넘으면 가장 오래 사용하지 않은 세션의 체크포인트를 지우는지 테스트합니다."""
+
+    async def main():
+        saver = InMemorySaver()
+        store = SessionStore(saver, max_sessions=2, idle_ttl=3600)
+        app = build_graph(saver)
+        for thread_id in ("a", "b", "c"):
+            await store.touch(thread_id)
+            await run_turns(app, thread_id, 1)
+            if thread_id == "b":
+                await store.touch("a")
+        return store, saver
+
+    store, saver = asyncio.run(main())
+
+    assert set(saver.storage) == {"a", "c"}
+    assert store.evictions == 1
+
+
+def test_sqlite_activity_is_shared_between_workers(tmp_path):
+    """같은 SQLite 파일을 쓰는 다른 워커의 사용 기록을 보고 세션을 지우는지 테스트합니다."""
+    pytest.importorskip("langgraph.checkpoint.sqlite.aio")
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+
+    async def main():
+        async with open_checkpointer("sqlite", db_path) as saver_1, open_checkpointer(
+            "sqlite", db_path
+        ) as saver_2:
+            worker_1 = SessionStore(saver_1, max_sessions=2, idle_ttl=3600)
+            worker_2 = SessionStore(saver_2, max_sessions=2, idle_ttl=3600)
+            await worker_1.setup()
+            await worker_2.setup()
+            app = build_graph(saver_1)
+            for thread_id in ("a", "b"):
+                await worker_1.touch(thread_id)
+                await run_turns(app, thread_id)
+
+            await worker_1.prune("a")
+            pruned = [item async for item in saver_1.alist(config("a"))]
+
+            # 워커 2가 a를 사용했으므로, 워커 1이 c를 추가하면 b가 지워집니다.
+            await worker_2.touch("a")
+            await worker_1.touch("c")
+            threads = {
+                item.config["configurable"]["thread_id"] async for item in saver_1.alist(None)
+            }
+            return pruned, threads
+
+    pruned, threads = asyncio.run(main())
+
+    assert len(pruned) == 1
+    assert threads == {"a"}
+
+
+def test_sqlite_setup_tracks_existing_threads(tmp_path):
+    """재시작 전에 저장된 세션도 setup 이후 유휴 시간이 지나면 지우는지 테스트합니다."""
+    pytest.importorskip("langgraph.checkpoint.sqlite.aio")
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+
+    async def main():
+        async with open_checkpointer("sqlite", db_path) as saver:
+            await run_turns(build_graph(saver), "old", 1)
+
+        async with open_checkpointer("sqlite", db_path) as saver:
+            store = SessionStore(saver, max_sessions=10, idle_ttl=0.05)
+            await store.setup()
+            tracked = (await store.usage())["active_sessions"]
+            await asyncio.sleep(0.1)
+            evicted = await store.evict()
+            return tracked, evicted, await saver.aget_tuple(config("old"))
+
+    tracked, evicted, remaining = asyncio.run(main())
+
+    assert (tracked, evicted, remaining) == (1, 1, None)
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+import time
+
+# 회의록 모듈은 임포트할 때 ChatOpenAI를 만들므로 테스트용 키를 지정합니다. (네트워크는 사용하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test_api_key")
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../chapter6/langgraph"))
+)
+
+import project_meeting_assistant_web as web
+from meeting_sessions import MeetingSession, MemorySessionStore, SqliteSessionStore
+from project_meeting_assistant import MeetingState
+
+
+def make_session(session_id: str, **kwargs) -> MeetingSession:
+    state = MeetingState(meeting_transcript="[팀장]: 회의를 시작합니다.", team_members=["팀장"])
+    return MeetingSession(session_id, state, **kwargs)
+
+
+def test_memory_store_evicts_least_recently_used():
+    """max_sessions를 넘으면 가장 오래 사용하지 않은 세션부터 삭제하는지 테스트합니다."""
+    store = MemorySessionStore(max_sessions=2, idle_ttl=3600)
+    store.put(make_session("a"))
+    store.put(make_session("b"))
+    store.get("a")
+    store.put(make_session("c"))
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats() == {"backend": "memory", "sessions": 2, "evicted": 1}
+
+
+def test_memory_store_expires_idle_sessions():
+    """idle_ttl 동안 사용하지 않은 세션은 조회되지 않는지 테스트합니다."""
+    store = MemorySessionStore(max_sessions=10, idle_ttl=0.05)
+    store.put(make_session("a"))
+    time.sleep(0.1)
+
+    assert store.get("a") is None
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+    """같은 파일을 쓰는 두 저장소(워커)가 세션을 공유하는지 테스트합니다."""
+    db_path = str(tmp_path / "sessions.sqlite3")
+    worker_a = SqliteSessionStore(db_path, max_sessions=10, idle_ttl=3600)
+    worker_b = SqliteSessionStore(db_path, max_sessions=10, idle_ttl=3600)
+
+    session = make_session("s1", step="summary_review")
+    session.state = session.state.model_copy(update={"summary": "요약"})
+    worker_a.put(session)
+    loaded = worker_b.get("s1")
+
+    assert loaded.step == "summary_review"
+    assert loaded.state.summary == "요약"
+    worker_b.delete("s1")
+    assert worker_a.get("s1") is None
+
+
+def test_stale_running_job_is_failed():
+    """제한 시간을 넘긴 running 작업은 실패로 바뀌고 이전 단계로 돌아가는지 테스트합니다."""
+    session = make_session(
+        "s1",
+        step="generating_report",
+        job_status="running",
+        job_started_at=time.time() - 10,
+        job_failed_step="action_review",
+    )
+
+    assert not session.expire_stale_job(timeout=60)
+    assert session.expire_stale_job(timeout=5)
+    assert (session.step, session.job_status) == ("action_review", "error")
+    assert session.job_error
+
+    restored = MeetingSession.from_json(session.to_json())
+    assert (restored.step, restored.job_status) == ("action_review", "error")
+
+
+def start_fake_job(store, session_id: str, started_at: float) -> MeetingSession:
+    """start_job처럼 세션을 running으로 바꿉니다. (백그라운드 실행기는 사용하지 않음)"""
+    session = store.get(session_id)
+    session.job_failed_step = session.step
+    session.job_started_at = started_at
+    session.step = "regenerating_summary"
+    session.job_status = "running"
+    store.put(session)
+    return session
+
+
+def make_summary_job(summary: str):
+    async def job(state: MeetingState) -> dict:
+        return {"summary": summary}
+
+    return job
+
+
+def test_late_job_does_not_overwrite_newer_job(monkeypatch):
+    """제한 시간을 넘겨 실패 처리된 작업이 늦게 끝나도 새 작업의 세션을 덮어쓰지 않는지 테스트합니다."""
+    store = MemorySessionStore(max_sessions=10, idle_ttl=3600)
+    monkeypatch.setattr(web, "store", store)
+    store.put(make_session("s1", step="summary_review"))
+
+    # 첫 번째 작업이 제한 시간을 넘겨 실패 처리되고, 사용자가 두 번째 작업을 시작합니다.
+    first = start_fake_job(store, "s1", started_at=time.time() - 10)
+    first_state, first_started_at = first.state, first.job_started_at
+    assert first.expire_stale_job(timeout=5)
+    store.put(first)
+    second = start_fake_job(store, "s1", started_at=time.time())
+    second_state, second_started_at = second.state, second.job_started_at
+
+    # 첫 번째 작업이 늦게 끝나도 반영하지 않습니다.
+    job = make_summary_job("첫 번째 요약")
+    asyncio.run(web.run_job("s1", first_state, job, "summary_review", first_started_at))
+    session = store.get("s1")
+    assert (session.step, session.job_status, session.state.summary) == (
+        "regenerating_summary", "running", ""
+    )
+
+    # 두 번째 작업의 결과는 반영됩니다.
+    job = make_summary_job("두 번째 요약")
+    asyncio.run(web.run_job("s1", second_state, job, "summary_review", second_started_at))
+    session = store.get("s1")
+    assert (session.step, session.job_status, session.state.summary) == (
+        "summary_review", "idle", "두 번째 요약"
+    )
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from a2a.types import Task, TaskState, TaskStatus
+
+# server.py와 같이 chapter8/a2a 경로를 추가하여 basic_agent 패키지를 임포트할 수 있도록 합니다.
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../chapter8/a2a"))
+)
+
+from basic_agent.admission import AdmissionController, AdmissionRejected
+from basic_agent.task_store import BoundedTaskStore
+
+
+def make_task(task_id: str, state: TaskState) -> Task:
+    return Task(id=task_id, context_id="ctx", status=TaskStatus(state=state))
+
+
+def test_admission_rejects_when_queue_is_full():
+    """동시 실행 한도와 대기열이 모두 차면 바로 거절하는지 테스트합니다."""
+    admission = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.slot():
+                await release.wait()
+
+        running = [asyncio.create_task(hold()), asyncio.create_task(hold())]
+        await asyncio.sleep(0)
+        assert (admission.active, admission.waiting) == (1, 1)
+
+        with pytest.raises(AdmissionRejected):
+            async with admission.slot():
+                pass
+
+        release.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(main())
+    assert admission.stats() == {
+        "max_concurrency": 1, "active": 0, "waiting": 0, "admitted": 2, "rejected": 1
+    }
+
+
+def test_admission_rejects_after_queue_timeout():
+    """queue_timeout 안에 차례가 오지 않으면 거절하고 대기 수를 되돌리는지 테스트합니다."""
+    admission = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+
+    async def main():
+        async with admission.slot():
+            with pytest.raises(AdmissionRejected):
+                async with admission.slot():
+                    pass
+            assert admission.waiting == 0
+
+    asyncio.run(main())
+    assert admission.rejected == 1
+
+
+def test_task_store_evicts_finished_tasks_only():
+    """한도를 넘으면 먼저 끝난 태스크부터 지우고 실행 중인 태스크는 남기는지 테스트합니다."""
+    store = BoundedTaskStore(max_tasks=2, finished_ttl=600)
+
+    async def main():
+        await store.save(make_task("running", TaskState.working))
+        await store.save(make_task("done-1", TaskState.completed))
+        await store.save(make_task("done-2", TaskState.failed))
+        return [await store.get(task_id) for task_id in ("running", "done-1", "done-2")]
+
+    running, first, second = asyncio.run(main())
+
+    assert running is not None and second is not None
+    assert first is None
+    assert store.stats() == {"tasks": 2, "finished": 1, "evicted": 1}
+
+
+def test_task_store_expires_finished_tasks():
+    """finished_ttl이 지난 끝난 태스크는 다음 저장 때 삭제되는지 테스트합니다."""
+    store = BoundedTaskStore(max_tasks=100, finished_ttl=0)
+
+    async def main():
+        await store.save(make_task("done", TaskState.completed))
+        await store.save(make_task("running", TaskState.working))
+        return await store.get("done")
+
+    assert asyncio.run(main()) is None
+    assert store.stats()["tasks"] == 1
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+# 프로젝트 루트를 sys.path에 추가하여 tools 패키지를 임포트할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from tools.tool_cache import CachedToolNode, ToolCachePolicy, make_cache_key
+
+calls = []
+calls_lock = threading.Lock()
+
+
+@tool
+def slow_weather(city_name: str) -> str:
+    """도시의 날씨를 조회합니다."""
+    with calls_lock:
+        calls.append(city_name)
+    time.sleep(0.1)
+    return f"{city_name}: 맑음"
+
+
+@tool
+def broken(city_name: str) -> str:
+    """항상 실패하는 도구"""
+    with calls_lock:
+        calls.append(city_name)
+    raise ValueError("업스트림 오류")
+
+
+def tool_calls(*cities: str, name: str = "slow_weather") -> dict:
+    return {
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": {"city_name": city}, "id": f"call_{i}"}
+                    for i, city in enumerate(cities)
+                ],
+            )
+        ]
+    }
+
+
+def make_node(ttl: float = 60.0) -> CachedToolNode:
+    calls.clear()
+    return CachedToolNode(
+        [slow_weather, broken],
+        policies={"slow_weather": ToolCachePolicy(ttl=ttl), "broken": ToolCachePolicy(ttl=ttl)},
+    )
+
+
+def test_parallel_duplicate_calls_are_coalesced():
+    """한 AIMessage 안의 같은 호출은 한 번만 실행하고 각자의 tool_call_id로 돌려주는지 테스트합니다."""
+    node = make_node()
+
+    messages = node.invoke(tool_calls("서울", "서울", "부산"))["messages"]
+
+    assert sorted(calls) == ["부산", "서울"]
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert [m.content for m in messages] == ["서울: 맑음", "서울: 맑음", "부산: 맑음"]
+    assert node.stats()["tools"]["slow_weather"] == {
+        "hits": 0, "misses": 2, "coalesced": 1, "hit_rate": 1 / 3
+    }
+
+
+def test_concurrent_async_calls_are_coalesced():
+    """서로 다른 실행에서 동시에 들어온 같은 호출도 한 번만 실행하는지 테스트합니다."""
+    node = make_node()
+
+    async def main():
+        return await asyncio.gather(*(node.ainvoke(tool_calls("서울")) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert calls == ["서울"]
+    assert all(r["messages"][0].content == "서울: 맑음" for r in results)
+
+
+def test_results_expire_after_ttl():
+    """ttl이 지나기 전에는 캐시를 쓰고, 지나면 다시 실행하는지 테스트합니다."""
+    node = make_node(ttl=0.3)
+
+    node.invoke(tool_calls("서울"))
+    node.invoke(tool_calls("서울"))
+    assert calls == ["서울"]
+
+    time.sleep(0.35)
+    node.invoke(tool_calls("서울"))
+    assert calls == ["서울", "서울"]
+
+
+def test_errors_are_not_cached():
+    """오류로 끝난 호출은 캐싱하지 않는지 테스트합니다."""
+    node = make_node()
+
+    first = node.invoke(tool_calls("서울", name="broken"))["messages"][0]
+    node.invoke(tool_calls("서울", name="broken"))
+
+    assert first.status == "error"
+    assert calls == ["서울", "서울"]
+
+
+def test_cache_key_keeps_inner_whitespace():
+    """앞뒤 공백만 무시하고, 안쪽 공백과 키 순서는 그대로 구분하는지 테스트합니다."""
+
+    def key(args: dict) -> str:
+        return make_cache_key({"name": "search", "args": args, "id": "x"})
+
+    assert key({"q": " 서울 날씨 ", "n": 3.0}) == key({"n": 3, "q": "서울 날씨"})
+    assert key({"q": "서울  날씨"}) != key({"q": "서울 날씨"})
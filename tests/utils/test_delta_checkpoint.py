@@ -0,0 +1,110 @@
+import os
+import sys
+from typing import List
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel
+
+# 프로젝트 루트를 sys.path에 추가하여 utils 패키지를 임포트할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.delta_checkpoint import DeltaSqliteSaver
+
+
+class ChatState(BaseModel):
+    document: str = ""
+    turns: List[str] = []
+
+
+def reply(state: ChatState) -> dict:
+    return {"turns": state.turns + [f"turn {len(state.turns) + 1}"]}
+
+
+def build_graph(checkpointer):
+    workflow = StateGraph(ChatState)
+    workflow.add_node("reply", reply)
+    workflow.add_edge(START, "reply")
+    workflow.add_edge("reply", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.sqlite3")
+
+
+def run_turns(app, config, count: int) -> None:
+    app.invoke({"document": "긴 문서 " * 1000}, config)
+    for _ in range(count - 1):
+        app.invoke({}, config)
+
+
+def test_round_trip_after_reopen(db_path):
+    """다시 연 저장소에서 마지막 상태와 이전 체크포인트를 그대로 읽을 수 있는지 테스트합니다."""
+    config = {"configurable": {"thread_id": "t1"}}
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        run_turns(build_graph(saver), config, 3)
+
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        app = build_graph(saver)
+        state = app.get_state(config).values
+        assert state["turns"] == ["turn 1", "turn 2", "turn 3"]
+        assert state["document"] == "긴 문서 " * 1000
+
+        history = list(app.get_state_history(config))
+        assert len(history) == len(list(saver.list(config)))
+        assert history[-1].values.get("turns", []) == []
+
+        app.invoke({}, config)
+        assert app.get_state(config).values["turns"][-1] == "turn 4"
+
+
+def test_unchanged_channels_are_not_rewritten(db_path):
+    """바뀌지 않은 채널은 체크포인트마다 다시 기록하지 않는지 테스트합니다."""
+    config = {"configurable": {"thread_id": "t1"}}
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        app = build_graph(saver)
+        run_turns(app, config, 1)
+        first = saver.stats()["bytes_written"]
+        for _ in range(5):
+            app.invoke({}, config)
+        # 큰 문서는 한 번만 기록되므로 이후 턴은 첫 턴보다 훨씬 적게 씁니다.
+        assert saver.stats()["bytes_written"] - first < first
+
+
+def test_prune_keep_latest(db_path):
+    """keep_latest는 최신 체크포인트만 남기고 다른 스레드는 건드리지 않는지 테스트합니다."""
+    pruned = {"configurable": {"thread_id": "pruned"}}
+    other = {"configurable": {"thread_id": "other"}}
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        app = build_graph(saver)
+        run_turns(app, pruned, 3)
+        run_turns(app, other, 2)
+        other_count = len(list(saver.list(other)))
+        before = app.get_state(pruned).values
+
+        saver.prune(["pruned"], strategy="keep_latest")
+
+        assert len(list(saver.list(pruned))) == 1
+        assert len(list(saver.list(other))) == other_count
+        assert app.get_state(pruned).values == before
+
+        app.invoke({}, pruned)
+        assert app.get_state(pruned).values["turns"][-1] == "turn 4"
+
+
+def test_prune_delete_collects_blobs(db_path):
+    """delete는 스레드를 지우고 더 이상 참조되지 않는 blob도 정리하는지 테스트합니다."""
+    config = {"configurable": {"thread_id": "t1"}}
+    with DeltaSqliteSaver.from_conn_string(db_path) as saver:
+        run_turns(build_graph(saver), config, 3)
+        assert saver.stats()["blobs"] > 0
+
+        saver.prune(["t1"], strategy="delete")
+
+        stats = saver.stats()
+        assert saver.get_tuple(config) is None
+        assert stats["checkpoints"] == 0
+        assert stats["channel_values"] == 0
+        assert stats["blobs"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import io
+import os
+import sys
+from typing import List
+
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel
+
+# 프로젝트 루트를 sys.path에 추가하여 utils 패키지를 임포트할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.messages import (
+    AsyncTerminalRenderer,
+    GraphEventBroadcaster,
+    NodeUpdateEvent,
+    StreamEndEvent,
+    TerminalRenderer,
+)
+
+
+class StepState(BaseModel):
+    steps: List[str] = []
+
+
+def build_graph(node_count: int = 3):
+    workflow = StateGraph(StepState)
+    previous = START
+    for i in range(node_count):
+        name = f"step_{i}"
+        workflow.add_node(name, lambda state, name=name: {"steps": state.steps + [name]})
+        workflow.add_edge(previous, name)
+        previous = name
+    workflow.add_edge(previous, END)
+    return workflow.compile()
+
+
+async def collect(subscription) -> list:
+    return [event async for event in subscription]
+
+
+def test_broadcaster_delivers_one_run_to_every_subscriber():
+    """그래프를 한 번 실행하고 모든 구독자가 같은 이벤트를 받는지 테스트합니다."""
+
+    async def main():
+        broadcaster = GraphEventBroadcaster(build_graph(), {}, stream_mode="updates")
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        broadcaster.start()
+        return await asyncio.gather(collect(first), collect(second))
+
+    first, second = asyncio.run(main())
+
+    nodes = [e.node for e in first if isinstance(e, NodeUpdateEvent)]
+    assert nodes == ["step_0", "step_1", "step_2"]
+    assert isinstance(first[-1], StreamEndEvent)
+    assert [e.kind for e in first] == [e.kind for e in second]
+
+
+def test_broadcaster_slow_subscriber_policies():
+    """느린 구독자는 정책에 따라 이벤트를 버리거나 연결이 끊기는지 테스트합니다."""
+
+    async def main():
+        broadcaster = GraphEventBroadcaster(build_graph(5), {}, stream_mode="updates")
+        latest = broadcaster.subscribe(maxsize=2, policy="drop_oldest")
+        audit = broadcaster.subscribe(maxsize=2, policy="disconnect")
+        # 구독자가 읽지 않는 동안 실행을 끝냅니다.
+        await broadcaster.start()
+        return latest, await collect(latest), audit
+
+    latest, events, audit = asyncio.run(main())
+
+    assert latest.dropped > 0
+    assert isinstance(events[-1], StreamEndEvent)
+    assert audit.disconnected
+
+
+def test_terminal_renderer_buffers_until_flush():
+    """토큰을 바로 쓰지 않고 모아 두었다가 flush 때 한 번에 쓰는지 테스트합니다."""
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream, flush_interval=60)
+    renderer.write("안녕")
+    renderer.print("하세요", end="!")
+
+    assert stream.getvalue() == ""
+    renderer.flush()
+    assert stream.getvalue() == "안녕하세요!"
+
+
+def test_async_renderer_flushes_on_timer():
+    """토큰이 끊겨도 flush_interval 뒤에 버퍼를 비우는지 테스트합니다."""
+    stream = io.StringIO()
+
+    async def main():
+        renderer = AsyncTerminalRenderer(stream, flush_interval=0.05)
+        renderer.write("마지막 토큰")
+        await asyncio.sleep(0.2)
+        output = stream.getvalue()
+        await renderer.aclose()
+        return output
+
+    assert asyncio.run(main()) == "마지막 토큰"
+
+
+def test_async_renderer_writes_directly_without_loop():
+    """실행 중인 이벤트 루프가 없으면 바로 출력하는지 테스트합니다."""
+    stream = io.StringIO()
+    with AsyncTerminalRenderer(stream) as renderer:
+        renderer.write("루프 밖")
+
+    assert stream.getvalue() == "루프 밖"
@@ -0,0 +1,120 @@
+import json
+import os
+import sys
+from typing import List
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from pydantic import BaseModel
+
+# 프로젝트 루트를 sys.path에 추가하여 utils 패키지를 임포트할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.messages import IncrementalJSONParser
+from utils.structured_output import (
+    StructuredOutputError,
+    StructuredOutputParser,
+    invoke_structured,
+    parse_json,
+)
+
+
+class ActionItem(BaseModel):
+    title: str
+    assignee: str = ""
+
+
+class ActionItemList(BaseModel):
+    action_items: List[ActionItem]
+
+
+SAMPLE = {
+    "title": "회의 \"요약\"\n",
+    "count": -12.5e1,
+    "flags": [True, False, None],
+    "nested": {"emoji": "\\u2603 ☃", "empty": {}},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_incremental_parser_matches_json_loads(chunk_size):
+    """어떤 크기로 잘라서 넣어도 json.loads와 같은 결과가 나오는지 테스트합니다."""
+    text = json.dumps(SAMPLE, ensure_ascii=False)
+    parser = IncrementalJSONParser()
+    for i in range(0, len(text), chunk_size):
+        parser.feed(text[i:i + chunk_size])
+
+    assert parser.done and not parser.failed
+    assert parser.root == json.loads(text)
+
+
+def test_incremental_parser_snapshot_fills_open_string():
+    """닫히지 않은 문자열 값이 지금까지 받은 내용으로 채워지는지 테스트합니다."""
+    parser = IncrementalJSONParser()
+    parser.feed('{"summary": "회의는 예정보다')
+
+    assert not parser.done
+    assert parser.snapshot() == {"summary": "회의는 예정보다"}
+
+    parser.feed(' 일찍 끝났다", "items": [1, 2')
+    assert parser.snapshot()["summary"] == "회의는 예정보다 일찍 끝났다"
+    assert parser.is_open(parser.snapshot()["items"])
+
+
+def test_parse_json_skips_surrounding_text():
+    """설명 문장과 코드 블록 표시를 건너뛰고 JSON만 파싱하는지 테스트합니다."""
+    text = '결과입니다.\n```json\n{"a": [1, {"b": "}"}]}\n```\n끝'
+
+    assert parse_json(text) == {"a": [1, {"b": "}"}]}
+
+
+def test_parse_json_reports_partial_output():
+    """중간에 끊긴 JSON은 오류와 함께 지금까지 파싱한 값을 돌려주는지 테스트합니다."""
+    with pytest.raises(StructuredOutputError) as excinfo:
+        parse_json('{"action_items": [{"title": "배포"}, {"title": "리뷰')
+
+    assert excinfo.value.partial == {"action_items": [{"title": "배포"}, {"title": "리뷰"}]}
+
+
+def test_structured_output_parser_emits_completed_items():
+    """목록 필드에서 다 받은 항목만 먼저 꺼내는지 테스트합니다."""
+    text = "앞 설명 " + json.dumps(
+        {"action_items": [{"title": "배포", "assignee": "이영희"}, {"title": "시안"}]},
+        ensure_ascii=False,
+    )
+    parser = StructuredOutputParser(ActionItemList)
+    emitted_at = {}
+    for i, ch in enumerate(text):
+        parser.feed(ch)
+        for item in parser.new_items("action_items", ActionItem):
+            emitted_at[item.title] = i
+
+    # 각 항목은 그 항목의 닫는 괄호를 받은 직후에 한 번만 나옵니다.
+    assert list(emitted_at) == ["배포", "시안"]
+    assert emitted_at["배포"] == text.index("}")
+    assert emitted_at["시안"] == text.rindex("}") - 2
+    assert parser.result().action_items[0].assignee == "이영희"
+
+
+def test_invoke_structured_repairs_broken_output():
+    """깨진 출력은 전체를 다시 생성하지 않고 수정 요청 한 번으로 고치는지 테스트합니다."""
+    llm = FakeListChatModel(
+        responses=[
+            '{"action_items": [{"title": "배포",}]',
+            '{"action_items": [{"title": "배포"}]}',
+        ]
+    )
+
+    result = invoke_structured(llm, [HumanMessage(content="액션 아이템")], ActionItemList)
+
+    assert result == ActionItemList(action_items=[ActionItem(title="배포")])
+    assert llm.i == 0  # 두 응답을 모두 사용해 목록이 처음으로 돌아왔습니다.
+
+
+def test_invoke_structured_gives_up_after_max_repairs():
+    """수정 요청까지 실패하면 StructuredOutputError가 발생하는지 테스트합니다."""
+    llm = FakeListChatModel(responses=["JSON이 아닙니다", "여전히 아닙니다"])
+
+    with pytest.raises(StructuredOutputError):
+        invoke_structured(llm, [HumanMessage(content="액션 아이템")], ActionItemList)
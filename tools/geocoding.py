@@ -0,0 +1,332 @@
+"""
+도시 이름을 좌표로 바꾸는 지오코딩 서비스
+
+날씨 도구들이 매번 `Nominatim`을 새로 만들어 외부 지오코더를 호출하던 것을 대신합니다.
+조회는 아래 순서로 진행되며, 앞 단계에서 찾으면 네트워크를 사용하지 않습니다.
+
+1. 메모리 LRU 캐시
+2. 내장 지명 사전 (자주 쓰는 국내외 도시)
+3. SQLite 영구 캐시 (프로세스를 다시 시작해도 유지)
+4. Nominatim 조회 (초당 1회 제한, 같은 도시의 동시 요청은 한 번만 호출)
+
+Nominatim에서도 찾지 못한 이름은 잠시(negative_ttl) 기억해 두고 바로 오류를 냅니다.
+
+사용 예시:
+    from tools.geocoding import get_coordinates
+
+    latitude, longitude = get_coordinates("서울")
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from geopy.geocoders import Nominatim
+
+Coordinates = Tuple[float, float]
+
+# 내장 지명 사전: (이름 목록, 위도, 경도)
+_GAZETTEER_ENTRIES = [
+    # 국내 주요 도시
+    (("서울", "서울특별시", "seoul"), 37.5665, 126.9780),
+    (("부산", "부산광역시", "busan"), 35.1796, 129.0756),
+    (("인천", "인천광역시", "incheon"), 37.4563, 126.7052),
+    (("대구", "대구광역시", "daegu"), 35.8714, 128.6014),
+    (("대전", "대전광역시", "daejeon"), 36.3504, 127.3845),
+    (("광주", "광주광역시", "gwangju"), 35.1595, 126.8526),
+    (("울산", "울산광역시", "ulsan"), 35.5384, 129.3114),
+    (("세종", "세종특별자치시", "sejong"), 36.4800, 127.2890),
+    (("수원", "수원시", "suwon"), 37.2636, 127.0286),
+    (("성남", "성남시", "seongnam"), 37.4200, 127.1267),
+    (("고양", "고양시", "goyang"), 37.6584, 126.8320),
+    (("용인", "용인시", "yongin"), 37.2411, 127.1776),
+    (("부천", "부천시", "bucheon"), 37.5034, 126.7660),
+    (("안양", "안양시", "anyang"), 37.3943, 126.9568),
+    (("화성", "화성시", "hwaseong"), 37.1995, 126.8310),
+    (("평택", "평택시", "pyeongtaek"), 36.9921, 127.1129),
+    (("파주", "파주시", "paju"), 37.7599, 126.7802),
+    (("김포", "김포시", "gimpo"), 37.6152, 126.7156),
+    (("남양주", "남양주시", "namyangju"), 37.6360, 127.2165),
+    (("춘천", "춘천시", "chuncheon"), 37.8813, 127.7298),
+    (("원주", "원주시", "wonju"), 37.3422, 127.9202),
+    (("강릉", "강릉시", "gangneung"), 37.7519, 128.8761),
+    (("속초", "속초시", "sokcho"), 38.2070, 128.5918),
+    (("청주", "청주시", "cheongju"), 36.6424, 127.4890),
+    (("천안", "천안시", "cheonan"), 36.8151, 127.1139),
+    (("전주", "전주시", "jeonju"), 35.8242, 127.1480),
+    (("목포", "목포시", "mokpo"), 34.8118, 126.3922),
+    (("여수", "여수시", "yeosu"), 34.7604, 127.6622),
+    (("포항", "포항시", "pohang"), 36.0190, 129.3435),
+    (("경주", "경주시", "gyeongju"), 35.8562, 129.2247),
+    (("안동", "안동시", "andong"), 36.5684, 128.7294),
+    (("창원", "창원시", "changwon"), 35.2280, 128.6811),
+    (("김해", "김해시", "gimhae"), 35.2285, 128.8894),
+    (("제주", "제주시", "제주도", "jeju"), 33.4996, 126.5312),
+    (("서귀포", "서귀포시", "seogwipo"), 33.2541, 126.5600),
+    # 해외 주요 도시
+    (("도쿄", "동경", "tokyo"), 35.6762, 139.6503),
+    (("오사카", "osaka"), 34.6937, 135.5023),
+    (("교토", "kyoto"), 35.0116, 135.7681),
+    (("후쿠오카", "fukuoka"), 33.5904, 130.4017),
+    (("삿포로", "sapporo"), 43.0618, 141.3545),
+    (("베이징", "북경", "beijing"), 39.9042, 116.4074),
+    (("상하이", "상해", "shanghai"), 31.2304, 121.4737),
+    (("홍콩", "hong kong"), 22.3193, 114.1694),
+    (("타이베이", "taipei"), 25.0330, 121.5654),
+    (("싱가포르", "singapore"), 1.3521, 103.8198),
+    (("방콕", "bangkok"), 13.7563, 100.5018),
+    (("하노이", "hanoi"), 21.0278, 105.8342),
+    (("호치민", "ho chi minh city"), 10.8231, 106.6297),
+    (("다낭", "da nang"), 16.0544, 108.2022),
+    (("마닐라", "manila"), 14.5995, 120.9842),
+    (("자카르타", "jakarta"), -6.2088, 106.8456),
+    (("쿠알라룸푸르", "kuala lumpur"), 3.1390, 101.6869),
+    (("뉴델리", "new delhi"), 28.6139, 77.2090),
+    (("두바이", "dubai"), 25.2048, 55.2708),
+    (("시드니", "sydney"), -33.8688, 151.2093),
+    (("멜버른", "melbourne"), -37.8136, 144.9631),
+    (("오클랜드", "auckland"), -36.8485, 174.7633),
+    (("뉴욕", "new york"), 40.7128, -74.0060),
+    (("로스앤젤레스", "la", "los angeles"), 34.0522, -118.2437),
+    (("샌프란시스코", "san francisco"), 37.7749, -122.4194),
+    (("시애틀", "seattle"), 47.6062, -122.3321),
+    (("시카고", "chicago"), 41.8781, -87.6298),
+    (("워싱턴", "washington"), 38.9072, -77.0369),
+    (("보스턴", "boston"), 42.3601, -71.0589),
+    (("라스베이거스", "las vegas"), 36.1699, -115.1398),
+    (("호놀룰루", "honolulu"), 21.3069, -157.8583),
+    (("밴쿠버", "vancouver"), 49.2827, -123.1207),
+    (("토론토", "toronto"), 43.6532, -79.3832),
+    (("멕시코시티", "mexico city"), 19.4326, -99.1332),
+    (("상파울루", "sao paulo", "são paulo"), -23.5505, -46.6333),
+    (("런던", "london"), 51.5074, -0.1278),
+    (("파리", "paris"), 48.8566, 2.3522),
+    (("베를린", "berlin"), 52.5200, 13.4050),
+    (("로마", "rome"), 41.9028, 12.4964),
+    (("마드리드", "madrid"), 40.4168, -3.7038),
+    (("바르셀로나", "barcelona"), 41.3851, 2.1734),
+    (("암스테르담", "amsterdam"), 52.3676, 4.9041),
+    (("프라하", "prague"), 50.0755, 14.4378),
+    (("빈", "비엔나", "vienna"), 48.2082, 16.3738),
+    (("취리히", "zurich"), 47.3769, 8.5417),
+    (("모스크바", "moscow"), 55.7558, 37.6173),
+    (("이스탄불", "istanbul"), 41.0082, 28.9784),
+    (("카이로", "cairo"), 30.0444, 31.2357),
+]
+
+GAZETTEER: Dict[str, Coordinates] = {
+    name: (latitude, longitude)
+    for names, latitude, longitude in _GAZETTEER_ENTRIES
+    for name in names
+}
+
+# "광주광역시" -> "광주"처럼 지명 사전 조회 시 떼어 볼 행정구역 접미사.
+# "시"는 떼지 않습니다. 경기도 "광주시"가 "광주"(광주광역시)로 바뀌기 때문입니다.
+# "수원시"처럼 "시"가 붙은 이름은 지명 사전에 직접 적어 둡니다.
+_ADMIN_SUFFIX = re.compile(r"(특별자치시|특별자치도|특별시|광역시)$")
+
+DEFAULT_DB_PATH = Path(
+    os.getenv(
+        "GEOCODING_CACHE_PATH",
+        Path.home() / ".cache" / "yozm-ai-agent" / "geocoding.sqlite3",
+    )
+)
+
+
+def normalize_city_name(city_name: str) -> str:
+    """캐시 키로 쓸 수 있도록 도시 이름을 정규화합니다."""
+    return " ".join(city_name.split()).casefold()
+
+
+class GeocodingService:
+    """
+    메모리 LRU, 내장 지명 사전, SQLite 캐시, Nominatim을 차례로 조회하는 지오코딩 서비스
+
+    Args:
+        db_path (Optional[Path]): SQLite 캐시 파일 경로. None이면 영구 캐시를 사용하지 않습니다.
+        maxsize (int): 메모리 LRU 캐시 크기. 기본값은 1024
+        user_agent (str): Nominatim 요청에 사용할 user agent
+        min_interval (float): Nominatim 요청 사이의 최소 간격(초). 기본값은 1.0 (이용 정책)
+        negative_ttl (float): 찾지 못한 이름을 다시 조회하지 않는 시간(초). 기본값은 300
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = DEFAULT_DB_PATH,
+        maxsize: int = 1024,
+        user_agent: str = "yozm_ai_agent_geocoding",
+        min_interval: float = 1.0,
+        negative_ttl: float = 300.0,
+    ):
+        self.maxsize = maxsize
+        self.min_interval = min_interval
+        self.negative_ttl = negative_ttl
+        self.stats = {"memory": 0, "gazetteer": 0, "sqlite": 0, "remote": 0, "negative": 0}
+
+        self._memory: OrderedDict[str, Coordinates] = OrderedDict()
+        self._misses: OrderedDict[str, float] = OrderedDict()  # key -> 만료 시각
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._geolocator = Nominatim(user_agent=user_agent)
+        self._remote_lock = threading.Lock()
+        self._last_remote_call = 0.0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "name TEXT PRIMARY KEY, latitude REAL NOT NULL, longitude REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get_coordinates(self, city_name: str) -> Coordinates:
+        """도시 이름을 받아 위도와 경도를 반환합니다."""
+        key = normalize_city_name(city_name)
+        if not key:
+            raise ValueError("도시 이름이 비어 있습니다.")
+
+        coordinates = self._lookup_local(key)
+        if coordinates is not None:
+            return coordinates
+        self._check_miss(city_name, key)
+
+        # 같은 도시를 동시에 조회하면 첫 요청만 원격 조회하고 나머지는 결과를 기다립니다.
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            coordinates = self._lookup_sqlite(key) or self._lookup_remote(city_name, key)
+            future.set_result(coordinates)
+            return coordinates
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_coordinates(self, city_name: str) -> Coordinates:
+        """`get_coordinates`의 비동기 버전. 로컬에서 찾지 못한 경우에만 스레드를 사용합니다."""
+        coordinates = self._lookup_local(normalize_city_name(city_name))
+        if coordinates is not None:
+            return coordinates
+        return await asyncio.to_thread(self.get_coordinates, city_name)
+
+    def _lookup_local(self, key: str) -> Optional[Coordinates]:
+        """네트워크나 디스크 없이 메모리 캐시와 내장 지명 사전에서 찾습니다."""
+        with self._lock:
+            coordinates = self._memory.get(key)
+            if coordinates is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory"] += 1
+                return coordinates
+
+        coordinates = GAZETTEER.get(key) or GAZETTEER.get(_ADMIN_SUFFIX.sub("", key))
+        if coordinates is not None:
+            self.stats["gazetteer"] += 1
+            self._remember(key, coordinates)
+        return coordinates
+
+    def _lookup_sqlite(self, key: str) -> Optional[Coordinates]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT latitude, longitude FROM geocode WHERE name = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        self.stats["sqlite"] += 1
+        coordinates = (row[0], row[1])
+        self._remember(key, coordinates)
+        return coordinates
+
+    def _lookup_remote(self, city_name: str, key: str) -> Coordinates:
+        with self._remote_lock:
+            wait = self._last_remote_call + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                location = self._geolocator.geocode(city_name)
+            finally:
+                self._last_remote_call = time.monotonic()
+
+        if not location:
+            self._remember_miss(key)
+            raise ValueError(f"좌표를 찾을 수 없습니다: {city_name}")
+
+        self.stats["remote"] += 1
+        coordinates = (location.latitude, location.longitude)
+        self._remember(key, coordinates)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode (name, latitude, longitude) VALUES (?, ?, ?)",
+                    (key, *coordinates),
+                )
+                self._db.commit()
+        return coordinates
+
+    def _check_miss(self, city_name: str, key: str) -> None:
+        """최근에 찾지 못한 이름이면 원격 조회 없이 바로 오류를 냅니다."""
+        with self._lock:
+            expires_at = self._misses.get(key)
+            if expires_at is None:
+                return
+            if expires_at <= time.monotonic():
+                del self._misses[key]
+                return
+            self.stats["negative"] += 1
+        raise ValueError(f"좌표를 찾을 수 없습니다: {city_name}")
+
+    def _remember_miss(self, key: str) -> None:
+        with self._lock:
+            self._misses[key] = time.monotonic() + self.negative_ttl
+            self._misses.move_to_end(key)
+            while len(self._misses) > self.maxsize:
+                self._misses.popitem(last=False)
+
+    def _remember(self, key: str, coordinates: Coordinates) -> None:
+        with self._lock:
+            self._memory[key] = coordinates
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+
+_default_service: Optional[GeocodingService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_geocoding_service() -> GeocodingService:
+    """프로세스 전체에서 공유하는 기본 지오코딩 서비스를 반환합니다."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = GeocodingService()
+        return _default_service
+
+
+def get_coordinates(city_name: str) -> Coordinates:
+    """도시 이름을 받아 위도와 경도를 반환합니다."""
+    return get_geocoding_service().get_coordinates(city_name)
+
+
+async def aget_coordinates(city_name: str) -> Coordinates:
+    """도시 이름을 받아 위도와 경도를 비동기로 반환합니다."""
+    return await get_geocoding_service().aget_coordinates(city_name)
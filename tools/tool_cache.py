@@ -0,0 +1,251 @@
+"""
+도구 실행 결과를 캐싱하는 ToolNode
+
+같은 계산식, 같은 도시의 날씨처럼 결과가 바뀌지 않거나 천천히 바뀌는 도구 호출은
+대화 안에서도, 대화를 넘어서도 반복됩니다. `CachedToolNode`는 도구 이름과 정규화한
+인자를 키로 ToolMessage를 저장해 두고, 같은 호출이 오면 도구를 실행하지 않고 재사용합니다.
+
+- 도구마다 `ToolCachePolicy`로 캐싱 여부를 정합니다. 정책이 없는 도구는 매번 실행합니다.
+  - pure=True: 입력이 같으면 결과도 같은 도구 (계산기 등). 만료되지 않습니다.
+  - ttl=초: 결과가 천천히 바뀌는 도구 (날씨 등). ttl초가 지나면 다시 실행합니다.
+- 한 AIMessage 안의 병렬 도구 호출에 같은 호출이 여러 번 있으면 한 번만 실행합니다.
+- 오류로 끝난 호출과 Command를 반환하는 호출은 캐싱하지 않습니다.
+- InjectedState / InjectedStore 인자를 받는 도구는 상태가 키에 포함되므로 정책을 주지 마세요.
+
+사용 예시:
+    from tools.tool_cache import CachedToolNode, ToolCachePolicy
+
+    tool_node = CachedToolNode(
+        [calculator, get_weather],
+        policies={
+            "calculator": ToolCachePolicy(pure=True),
+            "get_weather": ToolCachePolicy(ttl=600),
+        },
+    )
+    ...
+    print(tool_node.stats())
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Literal, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.messages.tool import ToolCall
+from langchain_core.runnables import RunnableConfig
+from langgraph.prebuilt import ToolNode
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """
+    도구 하나의 캐싱 정책입니다.
+
+    Args:
+        ttl (Optional[float]): 결과를 재사용할 시간(초). pure=True이면 무시됩니다.
+        pure (bool): 같은 입력에 항상 같은 결과를 내는 도구인지 여부
+    """
+
+    ttl: Optional[float] = None
+    pure: bool = False
+
+    def expires_at(self, now: float) -> float:
+        if self.pure or self.ttl is None:
+            return float("inf")
+        return now + self.ttl
+
+
+def _canonical(value: Any) -> Any:
+    """
+    같은 의미의 인자가 같은 키가 되도록 값을 정규화합니다.
+
+    문자열은 앞뒤 공백만 제거합니다. 계산식이나 검색어처럼 안쪽 공백이 결과를 바꿀 수 있는
+    인자가 있으므로 안쪽 공백은 그대로 둡니다.
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def make_cache_key(call: ToolCall) -> str:
+    """도구 이름과 정규화한 인자로 캐시 키를 만듭니다."""
+    args = json.dumps(
+        _canonical(call["args"]),
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f"{call['name']}:{args}"
+
+
+class CachedToolNode(ToolNode):
+    """
+    도구 실행 결과를 캐싱하는 ToolNode입니다. ToolNode 대신 그대로 사용할 수 있습니다.
+
+    Args:
+        tools: ToolNode에 넘길 도구 목록
+        policies (Dict[str, ToolCachePolicy]): 도구 이름별 캐싱 정책
+        maxsize (int): 저장할 최대 결과 수. 넘으면 가장 오래 사용하지 않은 결과부터 삭제
+        **kwargs: ToolNode에 그대로 전달할 인자 (name, handle_tool_errors 등)
+    """
+
+    def __init__(
+        self,
+        tools,
+        policies: Optional[Dict[str, ToolCachePolicy]] = None,
+        maxsize: int = 1024,
+        **kwargs,
+    ):
+        super().__init__(tools, **kwargs)
+        self.policies = dict(policies or {})
+        self.maxsize = maxsize
+        self._cache: OrderedDict[str, tuple[float, ToolMessage]] = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, field: str) -> None:
+        stats = self._stats.setdefault(name, {"hits": 0, "misses": 0, "coalesced": 0})
+        stats[field] += 1
+
+    def _begin(self, call: ToolCall) -> tuple[Optional[ToolMessage], Optional[Future], bool]:
+        """
+        캐시를 조회합니다.
+
+        Returns:
+            (캐시된 결과, 기다릴 Future, 직접 실행해야 하는지) 튜플
+        """
+        key = make_cache_key(call)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self._count(call["name"], "hits")
+                return cached[1], None, False
+
+            future = self._inflight.get(key)
+            if future is not None:
+                # 같은 호출이 이미 실행 중이면 (병렬 도구 호출 포함) 그 결과를 기다립니다.
+                self._count(call["name"], "coalesced")
+                return None, future, False
+
+            self._count(call["name"], "misses")
+            future = self._inflight[key] = Future()
+            return None, future, True
+
+    def _finish(self, call: ToolCall, future: Future, result: Any) -> None:
+        key = make_cache_key(call)
+        policy = self.policies[call["name"]]
+        with self._lock:
+            self._inflight.pop(key, None)
+            if isinstance(result, ToolMessage) and result.status != "error":
+                self._cache[key] = (policy.expires_at(time.monotonic()), result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        future.set_result(result)
+
+    def _fail(self, call: ToolCall, future: Future, error: BaseException) -> None:
+        with self._lock:
+            self._inflight.pop(make_cache_key(call), None)
+        future.set_exception(error)
+
+    @staticmethod
+    def _replay(result: ToolMessage, call: ToolCall) -> ToolMessage:
+        """저장된 결과를 이번 호출의 tool_call_id로 다시 만듭니다."""
+        return ToolMessage(
+            content=result.content,
+            name=result.name,
+            tool_call_id=call["id"],
+            artifact=result.artifact,
+            status=result.status,
+        )
+
+    def _run_one(
+        self,
+        call: ToolCall,
+        input_type: Literal["list", "dict", "tool_calls"],
+        config: RunnableConfig,
+    ):
+        if call["name"] not in self.policies:
+            return super()._run_one(call, input_type, config)
+
+        cached, future, owner = self._begin(call)
+        if cached is not None:
+            return self._replay(cached, call)
+        if not owner:
+            result = future.result()
+            if isinstance(result, ToolMessage):
+                return self._replay(result, call)
+            # Command처럼 호출마다 달라야 하는 결과는 직접 실행합니다.
+            return super()._run_one(call, input_type, config)
+
+        try:
+            result = super()._run_one(call, input_type, config)
+        except BaseException as e:
+            self._fail(call, future, e)
+            raise
+        self._finish(call, future, result)
+        return result
+
+    async def _arun_one(
+        self,
+        call: ToolCall,
+        input_type: Literal["list", "dict", "tool_calls"],
+        config: RunnableConfig,
+    ):
+        if call["name"] not in self.policies:
+            return await super()._arun_one(call, input_type, config)
+
+        cached, future, owner = self._begin(call)
+        if cached is not None:
+            return self._replay(cached, call)
+        if not owner:
+            result = await asyncio.wrap_future(future)
+            if isinstance(result, ToolMessage):
+                return self._replay(result, call)
+            return await super()._arun_one(call, input_type, config)
+
+        try:
+            result = await super()._arun_one(call, input_type, config)
+        except BaseException as e:
+            self._fail(call, future, e)
+            raise
+        self._finish(call, future, result)
+        return result
+
+    def hit_rate(self, name: Optional[str] = None) -> float:
+        """캐시 적중률 (실행 중인 같은 호출을 기다린 경우 포함). name이 없으면 전체 적중률"""
+        with self._lock:
+            if name is None:
+                rows = list(self._stats.values())
+            else:
+                rows = [self._stats.get(name, {"hits": 0, "misses": 0, "coalesced": 0})]
+        served = sum(row["hits"] + row["coalesced"] for row in rows)
+        total = served + sum(row["misses"] for row in rows)
+        return served / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """도구별 적중/실행 횟수와 적중률을 반환합니다."""
+        with self._lock:
+            tools = {name: dict(row) for name, row in self._stats.items()}
+            size = len(self._cache)
+        for name, row in tools.items():
+            row["hit_rate"] = self.hit_rate(name)
+        return {"size": size, "hit_rate": self.hit_rate(), "tools": tools}
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,513 @@
+"""
+변경된 채널만 저장하는 SQLite 체크포인터
+
+`SqliteSaver`는 단계마다 상태 전체(channel_values)를 체크포인트 한 행에 통째로 저장합니다.
+회의록 원문처럼 큰 필드가 있는 Pydantic 상태는 작은 필드 하나만 바뀌어도 같은 값을 매번
+다시 직렬화하고 기록하므로, 저장 공간과 쓰기 I/O가 "단계 수 × 상태 크기"로 늘어납니다.
+
+이 모듈의 `DeltaSqliteSaver`는 다음과 같이 저장합니다.
+
+1. 체크포인트 행에는 채널 버전 목록(channel_versions)과 메타데이터만 저장합니다.
+2. 채널 값은 LangGraph가 알려주는 변경된 채널(new_versions)만 (채널, 버전) 단위로 기록합니다.
+3. 값 본문은 내용 해시(sha256)를 키로 blobs 테이블에 한 번만 저장하므로,
+   같은 내용은 버전·스레드가 달라도 다시 기록하지 않습니다 (중간 쓰기(writes)도 같음).
+4. 한 번의 put/put_writes는 트랜잭션 하나로 묶어 커밋합니다.
+
+체크포인트가 모든 채널의 버전을 직접 가리키므로, 읽을 때 이전 변경분을 차례로 재생할
+필요가 없고 주기적인 전체 스냅샷도 필요 없습니다. 어느 체크포인트든 채널 수만큼의 조회로 복원됩니다.
+
+사용 예시:
+    from utils.delta_checkpoint import DeltaSqliteSaver
+
+    with DeltaSqliteSaver.from_conn_string("checkpoints.sqlite3") as checkpointer:
+        app = workflow.compile(checkpointer=checkpointer)
+        app.invoke(inputs, {"configurable": {"thread_id": "1"}})
+        print(checkpointer.stats())
+"""
+
+import asyncio
+import hashlib
+import random
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.constants import TASKS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS channel_values (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    hash TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    data BLOB
+);
+"""
+
+
+class DeltaSqliteSaver(BaseCheckpointSaver[str]):
+    """
+    변경된 채널 값만, 내용 해시로 중복을 없애 저장하는 SQLite 체크포인터입니다.
+
+    하나의 연결을 lock으로 보호하므로 여러 스레드에서 같은 인스턴스를 써도 됩니다.
+    비동기 메서드(ainvoke/astream)는 동기 메서드를 `asyncio.to_thread`로 실행합니다.
+
+    Args:
+        conn (sqlite3.Connection): SQLite 연결. `check_same_thread=False`로 열어야 합니다.
+        serde: 값 직렬화 도구 (기본값: JsonPlusSerializer)
+    """
+
+    def __init__(self, conn: sqlite3.Connection, *, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.conn = conn
+        self.lock = threading.Lock()
+        # 실제로 기록한 양 (이미 저장된 blob은 세지 않습니다)
+        self.bytes_written = 0
+        self.blobs_written = 0
+        self.blobs_reused = 0
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(cls, conn_string: str) -> Iterator["DeltaSqliteSaver"]:
+        """SQLite 파일 경로(또는 ":memory:")로 체크포인터를 엽니다."""
+        with closing(sqlite3.connect(conn_string, check_same_thread=False)) as conn:
+            yield cls(conn)
+
+    # ---------- 내부 도구 ----------
+
+    def _put_blob(self, cur: sqlite3.Cursor, value: Any) -> str:
+        """값을 직렬화해 내용 해시로 저장하고 해시를 반환합니다. lock을 잡은 상태에서 호출합니다."""
+        type_, data = self.serde.dumps_typed(value)
+        digest = hashlib.sha256(type_.encode() + b"\0" + data).hexdigest()
+        cur.execute(
+            "INSERT OR IGNORE INTO blobs (hash, type, data) VALUES (?, ?, ?)",
+            (digest, type_, data),
+        )
+        if cur.rowcount:
+            self.blobs_written += 1
+            self.bytes_written += len(data)
+        else:
+            self.blobs_reused += 1
+        return digest
+
+    def _load_blob(self, cur: sqlite3.Cursor, digest: str) -> Any:
+        type_, data = cur.execute(
+            "SELECT type, data FROM blobs WHERE hash = ?", (digest,)
+        ).fetchone()
+        return self.serde.loads_typed((type_, data))
+
+    def _load_channel_values(
+        self, cur: sqlite3.Cursor, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        """체크포인트가 가리키는 버전의 채널 값을 읽습니다. 값이 비어 있는 채널은 제외합니다."""
+        values = {}
+        for channel, version in versions.items():
+            row = cur.execute(
+                "SELECT b.type, b.data FROM channel_values c JOIN blobs b ON b.hash = c.hash "
+                "WHERE c.thread_id = ? AND c.checkpoint_ns = ? AND c.channel = ? AND c.version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is not None:
+                values[channel] = self.serde.loads_typed((row[0], row[1]))
+        return values
+
+    def _load_writes(
+        self, cur: sqlite3.Cursor, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> List[Tuple[str, str, str, str]]:
+        """(task_id, channel, hash, task_path) 목록을 task_path, task_id, idx 순서로 읽습니다."""
+        return cur.execute(
+            "SELECT task_id, channel, hash, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+    def _build_tuple(self, cur: sqlite3.Cursor, row: tuple) -> CheckpointTuple:
+        (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_id,
+            type_,
+            checkpoint,
+            metadata_type,
+            metadata,
+        ) = row
+        checkpoint_: Checkpoint = self.serde.loads_typed((type_, checkpoint))
+        writes = self._load_writes(cur, thread_id, checkpoint_ns, checkpoint_id)
+        sends = []
+        if parent_id:
+            sends = [
+                self._load_blob(cur, digest)
+                for _, channel, digest, _ in self._load_writes(
+                    cur, thread_id, checkpoint_ns, parent_id
+                )
+                if channel == TASKS
+            ]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint_,
+                "channel_values": self._load_channel_values(
+                    cur, thread_id, checkpoint_ns, checkpoint_["channel_versions"]
+                ),
+                "pending_sends": sends,
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            pending_writes=[
+                (task_id, channel, self._load_blob(cur, digest))
+                for task_id, channel, digest, _ in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    # ---------- BaseCheckpointSaver 구현 ----------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """config의 체크포인트(checkpoint_id가 없으면 최신 체크포인트)를 읽습니다."""
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: List[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        with self.lock, closing(self.conn.cursor()) as cur:
+            row = cur.execute(query, params).fetchone()
+            return self._build_tuple(cur, row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """조건에 맞는 체크포인트를 최신 순으로 반환합니다."""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+            "checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        where, params = [], []
+        if config is not None:
+            where.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self.lock, closing(self.conn.cursor()) as cur:
+            rows = cur.execute(query, params).fetchall()
+            results = []
+            for row in rows:
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._build_tuple(cur, row))
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """체크포인트를 저장합니다. 채널 값은 new_versions에 있는 (바뀐) 채널만 기록합니다."""
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_copy = checkpoint.copy()
+        values: Dict[str, Any] = checkpoint_copy.pop("channel_values")
+        checkpoint_copy.pop("pending_sends", None)
+        type_, serialized = self.serde.dumps_typed(checkpoint_copy)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self.lock, self.conn, closing(self.conn.cursor()) as cur:
+            rows = []
+            for channel, version in new_versions.items():
+                # 값이 비어 있는 채널은 해시 없이 버전만 기록합니다.
+                digest = self._put_blob(cur, values[channel]) if channel in values else None
+                rows.append((thread_id, checkpoint_ns, channel, str(version), digest))
+            cur.executemany(
+                "INSERT OR REPLACE INTO channel_values "
+                "(thread_id, checkpoint_ns, channel, version, hash) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            cur.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                "parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized,
+                    metadata_type,
+                    serialized_metadata,
+                ),
+            )
+            self.bytes_written += len(serialized) + len(serialized_metadata)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """노드의 중간 쓰기(writes)를 체크포인트에 연결해 저장합니다."""
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # 오류/인터럽트 같은 특수 쓰기는 덮어쓰고, 일반 쓰기는 처음 기록한 값을 유지합니다.
+        verb = (
+            "INSERT OR REPLACE"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE"
+        )
+        with self.lock, self.conn, closing(self.conn.cursor()) as cur:
+            rows = [
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    task_path,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    self._put_blob(cur, value),
+                )
+                for idx, (channel, value) in enumerate(writes)
+            ]
+            cur.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, "
+                "task_path, idx, channel, hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 체크포인트와 쓰기를 모두 삭제하고, 아무도 참조하지 않는 blob을 정리합니다."""
+        with self.lock, self.conn:
+            for table in ("checkpoints", "channel_values", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (str(thread_id),))
+            self._collect_garbage()
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """
+        스레드마다 최신 체크포인트와 그 체크포인트가 가리키는 채널 버전만 남깁니다.
+
+        Args:
+            thread_ids: 정리할 스레드 ID 목록
+            strategy (str): "keep_latest"(최신만 유지) 또는 "delete"(모두 삭제)
+        """
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"지원하지 않는 정리 방식입니다: {strategy}")
+
+        with self.lock, self.conn, closing(self.conn.cursor()) as cur:
+            for thread_id in map(str, thread_ids):
+                # 네임스페이스(서브그래프)마다 최신 체크포인트를 찾습니다.
+                latest = cur.execute(
+                    "SELECT checkpoint_ns, MAX(checkpoint_id) FROM checkpoints "
+                    "WHERE thread_id = ? GROUP BY checkpoint_ns",
+                    (thread_id,),
+                ).fetchall()
+                for checkpoint_ns, keep in latest:
+                    type_, checkpoint = cur.execute(
+                        "SELECT type, checkpoint FROM checkpoints "
+                        "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                        (thread_id, checkpoint_ns, keep),
+                    ).fetchone()
+                    versions = self.serde.loads_typed((type_, checkpoint))["channel_versions"]
+                    for table in ("checkpoints", "writes"):
+                        cur.execute(
+                            f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                            "AND checkpoint_id != ?",
+                            (thread_id, checkpoint_ns, keep),
+                        )
+                    stale = [
+                        (thread_id, checkpoint_ns, channel, version)
+                        for channel, version in cur.execute(
+                            "SELECT channel, version FROM channel_values "
+                            "WHERE thread_id = ? AND checkpoint_ns = ?",
+                            (thread_id, checkpoint_ns),
+                        ).fetchall()
+                        if str(versions.get(channel)) != version
+                    ]
+                    cur.executemany(
+                        "DELETE FROM channel_values WHERE thread_id = ? AND checkpoint_ns = ? "
+                        "AND channel = ? AND version = ?",
+                        stale,
+                    )
+            self._collect_garbage()
+
+    def _collect_garbage(self) -> None:
+        """참조가 없는 blob을 삭제합니다. lock을 잡은 트랜잭션 안에서 호출합니다."""
+        self.conn.execute(
+            "DELETE FROM blobs WHERE hash NOT IN ("
+            "SELECT hash FROM channel_values WHERE hash IS NOT NULL "
+            "UNION SELECT hash FROM writes)"
+        )
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        """InMemorySaver와 같은 형식("순번.난수")의 문자열 버전을 만듭니다."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def stats(self) -> Dict[str, int]:
+        """저장된 행 수와 blob 크기, 지금까지 기록한 양을 반환합니다."""
+        with self.lock:
+            counts = {
+                table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("checkpoints", "channel_values", "writes", "blobs")
+            }
+            (blob_bytes,) = self.conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+            return {
+                **counts,
+                "blob_bytes": blob_bytes,
+                "bytes_written": self.bytes_written,
+                "blobs_written": self.blobs_written,
+                "blobs_reused": self.blobs_reused,
+            }
+
+    # ---------- 비동기 버전 ----------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
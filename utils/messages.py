@@ -1,10 +1,14 @@
 from langchain_core.messages import AIMessageChunk
-from typing import Any, Dict, List, Callable, Optional
+from typing import Any, AsyncIterator, ClassVar, Dict, List, Callable, Optional, TextIO
 from dataclasses import dataclass
 from langchain_core.agents import AgentAction, AgentFinish, AgentStep
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph.state import CompiledStateGraph
+from .profiler import GraphProfiler
+import asyncio
+import sys
+import time
 import uuid
 
 
@@ -249,19 +253,267 @@ def display_message_tree(message):
         _display_message_tree(message, is_root=True)
 
 
+_JSON_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_JSON_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class IncrementalJSONParser:
+    """
+    스트리밍되는 JSON 문자열을 이어서 파싱하는 클래스입니다.
+
+    `feed()`로 들어온 새 텍스트만 훑으면서 객체를 조금씩 완성해 나가므로,
+    매 청크마다 전체 문자열을 다시 파싱하지 않습니다. 아직 닫히지 않은 문자열 값은
+    `snapshot()` 시점에 지금까지 받은 내용으로 채워집니다.
+    최상위 객체(또는 배열)가 닫히면 `done`이 True가 되고, 그 뒤의 텍스트는 무시합니다.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.failed = False
+        self.done = False
+        # 열려 있는 컨테이너 스택: [컨테이너, 대기 중인 키, 다음에 기대하는 토큰]
+        self._stack: List[list] = []
+        self._string: List[str] | None = None  # 읽는 중인 문자열 조각
+        self._string_is_key = False
+        self._string_target = None  # 부분 문자열을 채워 넣을 (컨테이너, 키/인덱스)
+        self._escape: str | None = None  # 이스케이프 처리 중인 문자 ("\\" 또는 "u....")
+        self._literal: List[str] | None = None  # 숫자, true/false/null
+
+    def feed(self, text: str) -> None:
+        """새로 도착한 텍스트 조각을 파싱합니다."""
+        i, n = 0, len(text)
+        while i < n and not self.failed and not self.done:
+            if self._string is not None:
+                i = self._consume_string(text, i)
+                continue
+
+            ch = text[i]
+            if self._literal is not None:
+                if ch in ",:]} \t\r\n":
+                    self._finish_literal()
+                    if self.failed:
+                        break
+                else:
+                    self._literal.append(ch)
+                    i += 1
+                    continue
+
+            if ch in " \t\r\n":
+                pass
+            elif ch == '"':
+                self._start_string()
+            elif ch in "{[":
+                container = {} if ch == "{" else []
+                self._attach(container)
+                self._stack.append([container, None, "key" if ch == "{" else "value"])
+            elif ch in "}]":
+                if not self._stack:
+                    self.failed = True
+                    break
+                self._stack.pop()
+                self.done = not self._stack
+            elif ch == ":":
+                if self._stack and self._stack[-1][2] == "colon":
+                    self._stack[-1][2] = "value"
+                else:
+                    self.failed = True
+            elif ch == ",":
+                if self._stack and isinstance(self._stack[-1][0], dict):
+                    self._stack[-1][2] = "key"
+            else:
+                self._literal = [ch]
+            i += 1
+
+    def snapshot(self):
+        """현재까지 파싱된 객체를 반환합니다. 닫히지 않은 문자열 값도 반영합니다."""
+        if self._string is not None and self._string_target is not None:
+            container, key = self._string_target
+            container[key] = "".join(self._string)
+        return self.root
+
+    def is_open(self, container) -> bool:
+        """container가 아직 닫히지 않은(값이 더 들어올 수 있는) 객체/배열인지 확인합니다."""
+        return any(frame[0] is container for frame in self._stack)
+
+    def _consume_string(self, text: str, i: int) -> int:
+        """문자열 내부를 읽습니다. 특수 문자가 나올 때까지는 한 번에 잘라 붙입니다."""
+        if self._escape is not None:
+            return self._consume_escape(text, i)
+
+        quote = text.find('"', i)
+        backslash = text.find("\\", i)
+        stops = [pos for pos in (quote, backslash) if pos != -1]
+        if not stops:
+            self._string.append(text[i:])
+            return len(text)
+
+        stop = min(stops)
+        if stop > i:
+            self._string.append(text[i:stop])
+        if stop == quote:
+            self._finish_string()
+        else:
+            self._escape = ""
+        return stop + 1
+
+    def _consume_escape(self, text: str, i: int) -> int:
+        ch = text[i]
+        if self._escape == "":
+            if ch == "u":
+                self._escape = "u"
+                return i + 1
+            if ch not in _JSON_ESCAPES:
+                self.failed = True
+                return i + 1
+            self._string.append(_JSON_ESCAPES[ch])
+            self._escape = None
+            return i + 1
+
+        # \uXXXX 형식: 4자리 16진수가 모일 때까지 누적
+        self._escape += ch
+        if len(self._escape) == 5:
+            try:
+                self._string.append(chr(int(self._escape[1:], 16)))
+            except ValueError:
+                self.failed = True
+            self._escape = None
+        return i + 1
+
+    def _start_string(self) -> None:
+        self._string = []
+        self._string_target = None
+        frame = self._stack[-1] if self._stack else None
+        self._string_is_key = frame is not None and frame[2] == "key"
+        if self._string_is_key:
+            return
+        # 값 위치의 문자열은 자리를 먼저 만들어 두고 snapshot 때 채웁니다.
+        self._attach("")
+        if frame is None:
+            return
+        container = frame[0]
+        if isinstance(container, dict):
+            self._string_target = (container, frame[1])
+        else:
+            self._string_target = (container, len(container) - 1)
+
+    def _finish_string(self) -> None:
+        value = "".join(self._string)
+        self._string = None
+        if self._string_is_key:
+            self._stack[-1][1] = value
+            self._stack[-1][2] = "colon"
+        elif self._string_target is not None:
+            container, key = self._string_target
+            container[key] = value
+        else:
+            self.root = value
+        self._string_target = None
+
+    def _finish_literal(self) -> None:
+        token = "".join(self._literal)
+        self._literal = None
+        if token in _JSON_LITERALS:
+            self._attach(_JSON_LITERALS[token])
+            return
+        try:
+            value = int(token)
+        except ValueError:
+            try:
+                value = float(token)
+            except ValueError:
+                self.failed = True
+                return
+        self._attach(value)
+
+    def _attach(self, value) -> None:
+        """완성된(또는 자리만 잡은) 값을 현재 컨테이너에 연결합니다."""
+        if not self._stack:
+            self.root = value
+            return
+        frame = self._stack[-1]
+        container = frame[0]
+        if isinstance(container, list):
+            container.append(value)
+        elif frame[2] == "value":
+            container[frame[1]] = value
+            frame[2] = "comma"
+        else:
+            self.failed = True
+
+
+class _ToolCallBuffer:
+    """하나의 도구 호출(index 단위) 청크를 누적하는 버퍼"""
+
+    __slots__ = ("name", "id", "args_parts", "parser")
+
+    def __init__(self):
+        self.name = ""
+        self.id = None
+        self.args_parts: List[str] = []
+        self.parser = IncrementalJSONParser()
+
+    def add(self, tool_call_chunk: dict) -> None:
+        if tool_call_chunk.get("name"):
+            self.name += tool_call_chunk["name"]
+        if tool_call_chunk.get("id"):
+            self.id = tool_call_chunk["id"]
+        if args := tool_call_chunk.get("args"):
+            self.args_parts.append(args)
+            self.parser.feed(args)
+
+    @property
+    def args(self) -> dict | None:
+        """지금까지 파싱된 인자. 객체가 아니거나 파싱에 실패하면 None"""
+        if not self.args_parts:
+            return {}
+        if self.parser.failed:
+            return None
+        snapshot = self.parser.snapshot()
+        return snapshot if isinstance(snapshot, dict) else None
+
+
 class ToolChunkHandler:
-    """Tool Message 청크를 처리하고 관리하는 클래스"""
+    """Tool Message 청크를 처리하고 관리하는 클래스
+
+    청크를 `AIMessageChunk` 덧셈으로 합치면 매번 메시지 전체를 다시 만들고
+    도구 인자 JSON을 처음부터 다시 파싱하므로, 본문과 도구 호출 청크를 따로 누적하고
+    인자는 `IncrementalJSONParser`로 이어서 파싱합니다.
+    """
 
     def __init__(self):
         self._reset_state()
 
     def _reset_state(self) -> None:
         """상태 초기화"""
-        self.gathered = None
-        self.first = True
+        self._content_parts: List[Any] = []
+        self._tool_calls: Dict[Any, _ToolCallBuffer] = {}
         self.current_node = None
         self.current_namespace = None
 
+    @property
+    def content(self) -> str:
+        """지금까지 누적된 텍스트 본문"""
+        return "".join(part for part in self._content_parts if isinstance(part, str))
+
+    @property
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        """지금까지 누적된 도구 호출 목록 (인자는 부분 파싱 결과)"""
+        tool_calls = []
+        for buffer in self._tool_calls.values():
+            args = buffer.args
+            if args is not None:
+                tool_calls.append({"name": buffer.name, "args": args, "id": buffer.id})
+        return tool_calls
+
     def _should_reset(self, node: str | None, namespace: str | None) -> bool:
         """상태 리셋 여부 확인"""
         # 파라미터가 모두 None인 경우 초기화하지 않음
@@ -306,18 +558,30 @@ class ToolChunkHandler:
 
     def _accumulate_chunk(self, chunk: AIMessageChunk) -> None:
         """청크 누적"""
-        self.gathered = chunk if self.first else self.gathered + chunk
-        self.first = False
-
-    def _display_tool_calls(self) -> None:
+        if chunk.content:
+            if isinstance(chunk.content, str):
+                self._content_parts.append(chunk.content)
+            else:
+                self._content_parts.extend(chunk.content)
+
+        for tool_call_chunk in chunk.tool_call_chunks:
+            index = tool_call_chunk.get("index")
+            # index가 없는 청크는 병합 대상이 아니므로 별도의 호출로 취급
+            key = index if index is not None else ("unindexed", len(self._tool_calls))
+            buffer = self._tool_calls.get(key)
+            if buffer is None:
+                buffer = self._tool_calls[key] = _ToolCallBuffer()
+            buffer.add(tool_call_chunk)
+
+    def _display_tool_calls(self) -> Dict[str, Any] | None:
         """도구 호출 정보 출력"""
-        if (
-            self.gathered
-            and not self.gathered.content
-            and self.gathered.tool_call_chunks
-            and self.gathered.tool_calls
-        ):
-            return self.gathered.tool_calls[0]["args"]
+        if self._content_parts or not self._tool_calls:
+            return None
+        for buffer in self._tool_calls.values():
+            args = buffer.args
+            if args is not None:
+                return args
+        return None
 
 
 def get_role_from_messages(msg):
@@ -335,12 +599,166 @@ def messages_to_history(messages):
     )
 
 
+class TerminalRenderer:
+    """
+    스트리밍 토큰을 모아서 터미널에 출력하는 렌더러입니다.
+
+    토큰마다 `print(..., flush=True)`를 호출하면 토큰 하나가 시스템 콜 하나가 되므로,
+    버퍼에 쌓아 두었다가 일정 시간(`flush_interval`)이 지나거나 버퍼 크기가
+    `max_buffer_size`를 넘으면 한 번에 내보냅니다.
+
+    시간 조건은 다음 `write()`가 호출될 때만 확인하므로, 토큰이 끊기면 마지막 내용이
+    버퍼에 남습니다. 노드가 바뀌거나 출력이 끝나는 지점에서 `flush()`를 호출해야 합니다.
+    (`AsyncTerminalRenderer`는 타이머로 `flush_interval` 뒤에 자동으로 비웁니다.)
+
+    Args:
+        stream: 출력 대상 스트림. 기본값은 sys.stdout
+        flush_interval (float): 버퍼를 비우는 최대 간격(초). 기본값은 0.05
+        max_buffer_size (int): 버퍼를 비우는 최대 글자 수. 기본값은 4096
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        flush_interval: float = 0.05,
+        max_buffer_size: int = 4096,
+    ):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self._buffer: List[str] = []
+        self._buffer_size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: Any) -> None:
+        """텍스트를 버퍼에 추가하고, 임계값을 넘으면 버퍼를 비웁니다."""
+        text = text if isinstance(text, str) else str(text)
+        if not text:
+            return
+        self._buffer.append(text)
+        self._buffer_size += len(text)
+        if (
+            self._buffer_size >= self.max_buffer_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def print(self, *values: Any, sep: str = " ", end: str = "\n") -> None:
+        """`print()`와 같은 형식으로 버퍼에 출력합니다."""
+        self.write(sep.join(str(value) for value in values) + end)
+
+    def flush(self) -> None:
+        """버퍼에 쌓인 텍스트를 한 번에 출력합니다."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffer_size = 0
+        self._write_out(text)
+
+    def _write_out(self, text: str) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+class AsyncTerminalRenderer(TerminalRenderer):
+    """
+    이벤트 루프를 막지 않는 `TerminalRenderer`입니다.
+
+    버퍼를 비울 때 직접 출력하지 않고 백그라운드 writer 태스크에 넘기며,
+    writer는 밀린 출력을 합쳐서 별도 스레드에서 한 번에 씁니다.
+    버퍼가 비어 있다가 채워지면 `flush_interval` 뒤에 비우는 타이머를 걸어 두므로,
+    토큰이 끊겨도 출력이 버퍼에 남지 않습니다.
+    사용이 끝나면 `aclose()`를 호출하거나 `async with`로 사용해야 합니다.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        flush_interval: float = 0.05,
+        max_buffer_size: int = 4096,
+    ):
+        super().__init__(stream, flush_interval, max_buffer_size)
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._flush_timer: asyncio.TimerHandle | None = None
+
+    def write(self, text: Any) -> None:
+        was_empty = not self._buffer
+        super().write(text)
+        if was_empty and self._buffer and self._flush_timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._flush_timer = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        super().flush()
+
+    def _write_out(self, text: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 실행 중인 이벤트 루프가 없으면(예: 루프 밖의 `with` 블록) 바로 출력합니다.
+            super()._write_out(text)
+            return
+        if self._writer_task is None:
+            self._queue = asyncio.Queue()
+            self._writer_task = loop.create_task(self._writer())
+        self._queue.put_nowait(text)
+
+    async def _writer(self) -> None:
+        """큐에 쌓인 출력을 모아서 스레드에서 기록하는 백그라운드 태스크"""
+        while True:
+            text = await self._queue.get()
+            if text is None:
+                return
+            parts = [text]
+            closing = False
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if pending is None:
+                    closing = True
+                    break
+                parts.append(pending)
+            await asyncio.to_thread(super()._write_out, "".join(parts))
+            if closing:
+                return
+
+    async def aclose(self) -> None:
+        """남은 버퍼를 비우고 writer 태스크가 끝날 때까지 기다립니다."""
+        self.flush()
+        if self._writer_task is not None:
+            self._queue.put_nowait(None)
+            await self._writer_task
+            self._writer_task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
 def stream_graph(
     graph: CompiledStateGraph,
     inputs: dict,
     config: RunnableConfig,
     node_names: List[str] = [],
     callback: Callable = None,
+    renderer: Optional[TerminalRenderer] = None,
 ):
     """
     LangGraph의 실행 결과를 스트리밍하여 출력하는 함수입니다.
@@ -352,10 +770,13 @@ def stream_graph(
         node_names (List[str], optional): 출력할 노드 이름 목록. 기본값은 빈 리스트
         callback (Callable, optional): 각 청크 처리를 위한 콜백 함수. 기본값은 None
             콜백 함수는 {"node": str, "content": str} 형태의 딕셔너리를 인자로 받습니다.
+        renderer (TerminalRenderer, optional): 기본 출력에 사용할 렌더러. 기본값은 None
+            지정하지 않으면 함수 안에서 만든 `TerminalRenderer`로 출력합니다.
 
     Returns:
         None: 함수는 스트리밍 결과를 출력만 하고 반환값은 없습니다.
     """
+    renderer = renderer or TerminalRenderer()
     prev_node = ""
     for chunk_msg, metadata in graph.stream(inputs, config, stream_mode="messages"):
         curr_node = metadata["langgraph_node"]
@@ -367,15 +788,18 @@ def stream_graph(
                 callback({"node": curr_node, "content": chunk_msg.content})
             # 콜백이 없는 경우 기본 출력
             else:
-                # 노드가 변경된 경우에만 구분선 출력
+                # 노드가 변경된 경우에만 구분선 출력 (이전 노드의 남은 출력을 먼저 비움)
                 if curr_node != prev_node:
-                    print("\n" + "=" * 50)
-                    print(f"🔄 Node: \033[1;36m{curr_node}\033[0m 🔄")
-                    print("- " * 25)
-                print(chunk_msg.content, end="", flush=True)
+                    renderer.flush()
+                    renderer.print("\n" + "=" * 50)
+                    renderer.print(f"🔄 Node: \033[1;36m{curr_node}\033[0m 🔄")
+                    renderer.print("- " * 25)
+                renderer.write(chunk_msg.content)
 
             prev_node = curr_node
 
+    renderer.flush()
+
 
 def invoke_graph(
     graph: CompiledStateGraph,
@@ -383,6 +807,7 @@ def invoke_graph(
     config: RunnableConfig,
     node_names: List[str] = [],
     callback: Callable = None,
+    profiler: Optional[GraphProfiler] = None,
 ):
     """
     LangGraph 앱의 실행 결과를 예쁘게 스트리밍하여 출력하는 함수입니다.
@@ -394,6 +819,7 @@ def invoke_graph(
         node_names (List[str], optional): 출력할 노드 이름 목록. 기본값은 빈 리스트
         callback (Callable, optional): 각 청크 처리를 위한 콜백 함수. 기본값은 None
             콜백 함수는 {"node": str, "content": str} 형태의 딕셔너리를 인자로 받습니다.
+        profiler (GraphProfiler, optional): 노드별 실행 시간과 토큰 사용량을 기록할 프로파일러. 기본값은 None
 
     Returns:
         None: 함수는 스트리밍 결과를 출력만 하고 반환값은 없습니다.
@@ -402,51 +828,533 @@ def invoke_graph(
     def format_namespace(namespace):
         return namespace[-1].split(":")[0] if len(namespace) > 0 else "root graph"
 
-    # subgraphs=True 를 통해 서브그래프의 출력도 포함
-    for namespace, chunk in graph.stream(
-        inputs, config, stream_mode="updates", subgraphs=True
-    ):
-        for node_name, node_chunk in chunk.items():
-            # node_names가 비어있지 않은 경우에만 필터링
-            if len(node_names) > 0 and node_name not in node_names:
-                continue
+    if profiler is not None:
+        profiler.start()
 
-            # 콜백 함수가 있는 경우 실행
-            if callback is not None:
-                callback({"node": node_name, "content": node_chunk})
-            # 콜백이 없는 경우 기본 출력
-            else:
-                print("\n" + "=" * 50)
-                formatted_namespace = format_namespace(namespace)
-                if formatted_namespace == "root graph":
-                    print(f"🔄 Node: \033[1;36m{node_name}\033[0m 🔄")
+    try:
+        # subgraphs=True 를 통해 서브그래프의 출력도 포함
+        for namespace, chunk in graph.stream(
+            inputs, config, stream_mode="updates", subgraphs=True
+        ):
+            for node_name, node_chunk in chunk.items():
+                # 프로파일링은 node_names 필터와 관계없이 모든 노드를 기록
+                if profiler is not None:
+                    profiler.record(namespace, node_name, node_chunk)
+
+                # node_names가 비어있지 않은 경우에만 필터링
+                if len(node_names) > 0 and node_name not in node_names:
+                    continue
+
+                # 콜백 함수가 있는 경우 실행
+                if callback is not None:
+                    callback({"node": node_name, "content": node_chunk})
+                # 콜백이 없는 경우 기본 출력
                 else:
-                    print(
-                        f"🔄 Node: \033[1;36m{node_name}\033[0m in [\033[1;33m{formatted_namespace}\033[0m] 🔄"
+                    print("\n" + "=" * 50)
+                    formatted_namespace = format_namespace(namespace)
+                    if formatted_namespace == "root graph":
+                        print(f"🔄 Node: \033[1;36m{node_name}\033[0m 🔄")
+                    else:
+                        print(
+                            f"🔄 Node: \033[1;36m{node_name}\033[0m in [\033[1;33m{formatted_namespace}\033[0m] 🔄"
+                        )
+                    print("- " * 25)
+
+                    # 노드의 청크 데이터 출력
+                    if isinstance(node_chunk, dict):
+                        for k, v in node_chunk.items():
+                            if isinstance(v, BaseMessage):
+                                v.pretty_print()
+                            elif isinstance(v, list):
+                                for list_item in v:
+                                    if isinstance(list_item, BaseMessage):
+                                        list_item.pretty_print()
+                                    else:
+                                        print(list_item)
+                            elif isinstance(v, dict):
+                                for node_chunk_key, node_chunk_value in node_chunk.items():
+                                    print(f"{node_chunk_key}:\n{node_chunk_value}")
+                            else:
+                                print(f"\033[1;32m{k}\033[0m:\n{v}")
+                    else:
+                        if node_chunk is not None:
+                            for item in node_chunk:
+                                print(item)
+                    print("=" * 50)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+
+def _content_text(content: Any) -> str:
+    """메시지 content에서 텍스트만 추출합니다. (Anthropic/Claude의 리스트 content 포함)"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            item["text"]
+            for item in content
+            if isinstance(item, dict) and "text" in item
+        )
+    return str(content)
+
+
+def _message_text(message: BaseMessage) -> str:
+    return _content_text(message.content)
+
+
+def _dict_text(value: dict) -> str:
+    return value["text"] if "text" in value else str(value)
+
+
+def _sequence_text(value) -> str:
+    return "".join(extract_text(item) for item in value)
+
+
+# 출력 대상의 타입별 텍스트 추출 함수 (하위 타입은 처음 조회할 때 MRO로 찾아서 캐싱)
+_TEXT_EXTRACTORS: Dict[type, Callable[[Any], str]] = {
+    str: lambda value: value,
+    type(None): lambda value: "",
+    BaseMessage: _message_text,
+    dict: _dict_text,
+    list: _sequence_text,
+    tuple: _sequence_text,
+}
+
+
+def extract_text(value: Any) -> str:
+    """
+    스트리밍 청크나 노드 출력에서 화면에 보여줄 텍스트를 추출합니다.
+
+    타입별 추출 함수를 `_TEXT_EXTRACTORS`에서 한 번의 딕셔너리 조회로 찾으므로,
+    토큰마다 isinstance 분기를 반복하지 않습니다.
+    """
+    extractor = _TEXT_EXTRACTORS.get(type(value))
+    if extractor is None:
+        extractor = next(
+            (
+                _TEXT_EXTRACTORS[base]
+                for base in type(value).__mro__
+                if base in _TEXT_EXTRACTORS
+            ),
+            str,
+        )
+        _TEXT_EXTRACTORS[type(value)] = extractor
+    return extractor(value)
+
+
+@dataclass(slots=True, kw_only=True)
+class GraphEvent:
+    """
+    그래프 스트림에서 발생하는 이벤트의 기본 클래스입니다.
+
+    Attributes:
+        node (Optional[str]): 이벤트가 발생한 노드 이름
+        namespace (tuple): 서브그래프 네임스페이스. 루트 그래프는 빈 튜플
+        elapsed (float): 스트림 시작 후 경과 시간(초)
+        metadata (Optional[dict]): LangGraph가 전달한 메타데이터 (messages 모드)
+    """
+
+    kind: ClassVar[str] = "event"
+
+    node: Optional[str] = None
+    namespace: tuple = ()
+    elapsed: float = 0.0
+    metadata: Optional[dict] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class TokenEvent(GraphEvent):
+    """LLM이 생성한 텍스트 토큰"""
+
+    kind: ClassVar[str] = "token"
+
+    text: str
+    message: Any = None
+
+
+@dataclass(slots=True, kw_only=True)
+class ToolStartEvent(GraphEvent):
+    """도구 호출 시작. messages 모드에서는 인자가 아직 스트리밍 중이므로 args가 None입니다."""
+
+    kind: ClassVar[str] = "tool_start"
+
+    tool_name: str
+    tool_call_id: Optional[str] = None
+    args: Optional[dict] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class ToolEndEvent(GraphEvent):
+    """도구 실행 결과"""
+
+    kind: ClassVar[str] = "tool_end"
+
+    tool_name: Optional[str]
+    tool_call_id: Optional[str] = None
+    content: Any = None
+    message: Any = None
+
+
+@dataclass(slots=True, kw_only=True)
+class NodeUpdateEvent(GraphEvent):
+    """노드 실행이 끝나고 상태 업데이트가 나온 경우. node가 None이면 딕셔너리가 아닌 원본 출력입니다."""
+
+    kind: ClassVar[str] = "node_update"
+
+    update: Any
+
+
+@dataclass(slots=True, kw_only=True)
+class StreamEndEvent(GraphEvent):
+    """스트림 종료. elapsed가 전체 실행 시간입니다."""
+
+    kind: ClassVar[str] = "end"
+
+
+def _split_stream_item(item: Any, include_subgraphs: bool) -> tuple:
+    """subgraphs 옵션에 따라 (namespace, data) 형태로 맞춥니다."""
+    if include_subgraphs and isinstance(item, tuple) and len(item) == 2:
+        return tuple(item[0]), item[1]
+    return (), item
+
+
+def _message_events(chunk_msg: Any, metadata: dict, namespace: tuple, elapsed: float):
+    """messages 모드의 청크 하나를 이벤트로 변환합니다."""
+    node = metadata.get("langgraph_node")
+    if isinstance(chunk_msg, ToolMessage):
+        yield ToolEndEvent(
+            node=node,
+            namespace=namespace,
+            elapsed=elapsed,
+            metadata=metadata,
+            tool_name=chunk_msg.name,
+            tool_call_id=chunk_msg.tool_call_id,
+            content=chunk_msg.content,
+            message=chunk_msg,
+        )
+        return
+
+    for tool_call_chunk in getattr(chunk_msg, "tool_call_chunks", None) or ():
+        if tool_call_chunk.get("name"):
+            yield ToolStartEvent(
+                node=node,
+                namespace=namespace,
+                elapsed=elapsed,
+                metadata=metadata,
+                tool_name=tool_call_chunk["name"],
+                tool_call_id=tool_call_chunk.get("id"),
+            )
+
+    text = extract_text(chunk_msg)
+    if text:
+        yield TokenEvent(
+            node=node,
+            namespace=namespace,
+            elapsed=elapsed,
+            metadata=metadata,
+            text=text,
+            message=chunk_msg,
+        )
+
+
+def _update_events(node_chunks: Any, namespace: tuple, elapsed: float):
+    """updates 모드의 청크 하나를 이벤트로 변환합니다."""
+    if not isinstance(node_chunks, dict):
+        yield NodeUpdateEvent(namespace=namespace, elapsed=elapsed, update=node_chunks)
+        return
+
+    for node_name, node_chunk in node_chunks.items():
+        yield NodeUpdateEvent(
+            node=node_name, namespace=namespace, elapsed=elapsed, update=node_chunk
+        )
+        if not isinstance(node_chunk, dict):
+            continue
+        for value in node_chunk.values():
+            for message in value if isinstance(value, list) else (value,):
+                if isinstance(message, ToolMessage):
+                    yield ToolEndEvent(
+                        node=node_name,
+                        namespace=namespace,
+                        elapsed=elapsed,
+                        tool_name=message.name,
+                        tool_call_id=message.tool_call_id,
+                        content=message.content,
+                        message=message,
                     )
-                print("- " * 25)
+                elif isinstance(message, AIMessage):
+                    for tool_call in message.tool_calls:
+                        yield ToolStartEvent(
+                            node=node_name,
+                            namespace=namespace,
+                            elapsed=elapsed,
+                            tool_name=tool_call["name"],
+                            tool_call_id=tool_call.get("id"),
+                            args=tool_call["args"],
+                        )
+
+
+async def astream_graph_events(
+    graph: CompiledStateGraph,
+    inputs: dict,
+    config: Optional[RunnableConfig] = None,
+    stream_mode: str = "messages",
+    include_subgraphs: bool = False,
+    node_names: List[str] = [],
+) -> AsyncIterator[GraphEvent]:
+    """
+    LangGraph의 실행 결과를 타입이 지정된 이벤트 객체로 비동기 스트리밍합니다.
+
+    출력이나 콜백 대신 이벤트를 yield하므로, SSE 엔드포인트, 웹소켓, 로그 등
+    어떤 소비자든 청크 형태를 직접 분기하지 않고 구독할 수 있습니다.
+
+    Args:
+        graph (CompiledStateGraph): 실행할 컴파일된 LangGraph 객체
+        inputs (dict): 그래프에 전달할 입력값 딕셔너리
+        config (Optional[RunnableConfig]): 실행 설정 (선택적)
+        stream_mode (str, optional): 스트리밍 모드 ("messages" 또는 "updates"). 기본값은 "messages"
+        include_subgraphs (bool, optional): 서브그래프 포함 여부. 기본값은 False
+        node_names (List[str], optional): 이벤트를 받을 노드 이름 목록. 기본값은 빈 리스트 (전체)
+
+    Yields:
+        GraphEvent: TokenEvent, ToolStartEvent, ToolEndEvent, NodeUpdateEvent 중 하나이며,
+            마지막에는 항상 StreamEndEvent가 나옵니다.
+    """
+    if stream_mode not in ("messages", "updates"):
+        raise ValueError(
+            f"Invalid stream_mode: {stream_mode}. Must be 'messages' or 'updates'."
+        )
+
+    config = config or {}
+    started = time.perf_counter()
+
+    async for item in graph.astream(
+        inputs, config, stream_mode=stream_mode, subgraphs=include_subgraphs
+    ):
+        namespace, data = _split_stream_item(item, include_subgraphs)
+        elapsed = time.perf_counter() - started
+        if stream_mode == "messages":
+            chunk_msg, metadata = data
+            events = _message_events(chunk_msg, metadata, namespace, elapsed)
+        else:
+            events = _update_events(data, namespace, elapsed)
+
+        for event in events:
+            if node_names and event.node is not None and event.node not in node_names:
+                continue
+            yield event
+
+    yield StreamEndEvent(elapsed=time.perf_counter() - started)
+
+
+_SUBSCRIPTION_CLOSED = object()
+
+
+class GraphEventSubscription:
+    """
+    `GraphEventBroadcaster`의 구독자 한 명이 받는 이벤트 스트림입니다.
+
+    구독자마다 크기가 제한된 큐를 가지며, 큐가 가득 찼을 때의 동작은 `policy`로 정합니다.
+
+    - "drop_oldest": 가장 오래된 이벤트를 버리고 새 이벤트를 넣습니다. (UI처럼 최신 상태가 중요한 경우)
+    - "drop_newest": 새 이벤트를 버립니다.
+    - "disconnect": 따라오지 못하는 구독자의 연결을 끊습니다. (감사 로그처럼 누락이 허용되지 않는 경우)
+
+    Attributes:
+        dropped (int): 큐가 가득 차서 버려진 이벤트 수
+        disconnected (bool): "disconnect" 정책으로 연결이 끊겼는지 여부
+    """
+
+    POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+    def __init__(self, broadcaster: "GraphEventBroadcaster", maxsize: int, policy: str):
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"Invalid policy: {policy}. Must be one of {', '.join(self.POLICIES)}."
+            )
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self._broadcaster = broadcaster
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self.disconnected = False
+        self._closed = False
+
+    def _offer(self, event: GraphEvent) -> None:
+        """이벤트를 큐에 넣습니다. 브로드캐스터는 절대 기다리지 않습니다."""
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += 1
+        if self.policy == "drop_oldest":
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+        elif self.policy == "disconnect":
+            self.disconnected = True
+            self._close()
+
+    def _close(self) -> None:
+        """종료 표시를 넣습니다. 큐가 가득 차 있으면 가장 오래된 이벤트를 밀어냅니다."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_SUBSCRIPTION_CLOSED)
+
+    def unsubscribe(self) -> None:
+        """구독을 해지합니다. 이미 받은 이벤트는 계속 읽을 수 있습니다."""
+        self._broadcaster._subscribers.discard(self)
+        self._close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> GraphEvent:
+        event = await self._queue.get()
+        if event is _SUBSCRIPTION_CLOSED:
+            if self._broadcaster.error is not None and not self.disconnected:
+                raise self._broadcaster.error
+            raise StopAsyncIteration
+        return event
+
+
+class GraphEventBroadcaster:
+    """
+    그래프를 한 번만 실행하고, 그 이벤트를 여러 구독자에게 나눠 주는 클래스입니다.
+
+    UI, 감사 로그, 메트릭처럼 같은 실행을 여러 곳에서 지켜봐야 할 때 각자 그래프를
+    실행하면 LLM 호출이 중복됩니다. 브로드캐스터는 `astream_graph_events`를 한 번만
+    돌리고, 구독자별 큐에 이벤트를 넣기만 하므로 느린 구독자가 실행을 멈추지 못합니다.
+
+    사용 예시:
+        broadcaster = GraphEventBroadcaster(graph, inputs, config)
+        ui = broadcaster.subscribe(maxsize=100, policy="drop_oldest")
+        audit = broadcaster.subscribe(maxsize=10_000, policy="disconnect")
+        broadcaster.start()
+
+        async for event in ui:
+            ...
+
+    Args:
+        graph (CompiledStateGraph): 실행할 컴파일된 LangGraph 객체
+        inputs (dict): 그래프에 전달할 입력값 딕셔너리
+        config (Optional[RunnableConfig]): 실행 설정 (선택적)
+        stream_mode (str, optional): 스트리밍 모드 ("messages" 또는 "updates"). 기본값은 "messages"
+        include_subgraphs (bool, optional): 서브그래프 포함 여부. 기본값은 False
+    """
+
+    def __init__(
+        self,
+        graph: CompiledStateGraph,
+        inputs: dict,
+        config: Optional[RunnableConfig] = None,
+        stream_mode: str = "messages",
+        include_subgraphs: bool = False,
+    ):
+        self.graph = graph
+        self.inputs = inputs
+        self.config = config
+        self.stream_mode = stream_mode
+        self.include_subgraphs = include_subgraphs
+        self.error: Optional[BaseException] = None
+        self._subscribers: set[GraphEventSubscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._finished = False
+
+    def subscribe(
+        self, maxsize: int = 1000, policy: str = "drop_oldest"
+    ) -> GraphEventSubscription:
+        """
+        새 구독자를 등록합니다. 실행이 시작된 뒤에 구독하면 그 이후의 이벤트만 받습니다.
+
+        Args:
+            maxsize (int, optional): 구독자 큐의 최대 크기. 기본값은 1000
+            policy (str, optional): 큐가 가득 찼을 때의 정책. 기본값은 "drop_oldest"
+
+        Returns:
+            GraphEventSubscription: 이벤트를 받을 수 있는 비동기 이터레이터
+        """
+        subscription = GraphEventSubscription(self, maxsize, policy)
+        if self._finished:
+            subscription._close()
+        else:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def start(self) -> asyncio.Task:
+        """그래프 실행을 백그라운드 태스크로 시작합니다."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+            # 예외는 구독자에게 전달되므로 태스크를 기다리지 않아도 경고가 나지 않게 합니다.
+            self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._task
+
+    async def run(self) -> None:
+        """그래프를 실행하고 모든 이벤트를 구독자에게 전달합니다."""
+        try:
+            async for event in astream_graph_events(
+                self.graph,
+                self.inputs,
+                self.config,
+                self.stream_mode,
+                self.include_subgraphs,
+            ):
+                for subscription in list(self._subscribers):
+                    subscription._offer(event)
+                    if subscription.disconnected:
+                        self._subscribers.discard(subscription)
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self._finished = True
+            for subscription in self._subscribers:
+                subscription._close()
+            self._subscribers.clear()
+
+
+def _print_node_header(renderer: TerminalRenderer, event: GraphEvent) -> None:
+    renderer.print("\n" + "=" * 50)
+    renderer.print(f"🔄 Node: \033[1;36m{event.node}\033[0m 🔄")
+    renderer.print("- " * 25)
+
+
+def _render_token(renderer: TerminalRenderer, event: TokenEvent) -> None:
+    renderer.write(event.text)
+
+
+def _render_tool_end(renderer: TerminalRenderer, event: ToolEndEvent) -> None:
+    renderer.write(extract_text(event.content))
+
+
+def _render_node_update(renderer: TerminalRenderer, event: NodeUpdateEvent) -> None:
+    if event.node is None:
+        renderer.print("\n" + "=" * 50)
+        renderer.print("🔄 Raw output 🔄")
+        renderer.print("- " * 25)
+        renderer.write(event.update)
+        return
+
+    if isinstance(event.update, dict):
+        for value in event.update.values():
+            renderer.write(extract_text(value))
+    else:
+        renderer.write(extract_text(event.update))
+
+
+# astream_graph의 모드별 이벤트 출력 함수
+_EVENT_RENDERERS: Dict[str, Dict[type, Callable]] = {
+    "messages": {TokenEvent: _render_token, ToolEndEvent: _render_tool_end},
+    "updates": {NodeUpdateEvent: _render_node_update},
+}
 
-                # 노드의 청크 데이터 출력
-                if isinstance(node_chunk, dict):
-                    for k, v in node_chunk.items():
-                        if isinstance(v, BaseMessage):
-                            v.pretty_print()
-                        elif isinstance(v, list):
-                            for list_item in v:
-                                if isinstance(list_item, BaseMessage):
-                                    list_item.pretty_print()
-                                else:
-                                    print(list_item)
-                        elif isinstance(v, dict):
-                            for node_chunk_key, node_chunk_value in node_chunk.items():
-                                print(f"{node_chunk_key}:\n{node_chunk_value}")
-                        else:
-                            print(f"\033[1;32m{k}\033[0m:\n{v}")
-                else:
-                    if node_chunk is not None:
-                        for item in node_chunk:
-                            print(item)
-                print("=" * 50)
 
 async def astream_graph(
     graph: CompiledStateGraph,
@@ -456,10 +1364,13 @@ async def astream_graph(
     callback: Optional[Callable] = None,
     stream_mode: str = "messages",
     include_subgraphs: bool = False,
+    renderer: Optional[AsyncTerminalRenderer] = None,
 ) -> Dict[str, Any]:
     """
     LangGraph의 실행 결과를 비동기적으로 스트리밍하고 직접 출력하는 함수입니다.
 
+    `astream_graph_events`가 만든 이벤트를 받아서 출력하거나 콜백에 전달합니다.
+
     Args:
         graph (CompiledStateGraph): 실행할 컴파일된 LangGraph 객체
         inputs (dict): 그래프에 전달할 입력값 딕셔너리
@@ -467,63 +1378,118 @@ async def astream_graph(
         node_names (List[str], optional): 출력할 노드 이름 목록. 기본값은 빈 리스트
         callback (Optional[Callable], optional): 각 청크 처리를 위한 콜백 함수. 기본값은 None
             콜백 함수는 {"node": str, "content": Any} 형태의 딕셔너리를 인자로 받습니다.
+            messages 모드에서는 텍스트가 있는 메시지 청크와 도구 결과 메시지가 전달됩니다.
         stream_mode (str, optional): 스트리밍 모드 ("messages" 또는 "updates"). 기본값은 "messages"
         include_subgraphs (bool, optional): 서브그래프 포함 여부. 기본값은 False
+        renderer (AsyncTerminalRenderer, optional): 기본 출력에 사용할 렌더러. 기본값은 None
+            지정하지 않으면 함수 안에서 렌더러를 만들고, 반환 전에 닫습니다.
 
     Returns:
         Dict[str, Any]: 최종 결과 (선택적)
     """
-    config = config or {}
     final_result = {}
-
-    def format_namespace(namespace):
-        return namespace[-1].split(":")[0] if len(namespace) > 0 else "root graph"
-
+    event_renderers = _EVENT_RENDERERS.get(stream_mode, {})
+    owns_renderer = renderer is None
+    renderer = renderer or AsyncTerminalRenderer()
     prev_node = ""
 
-    if stream_mode == "messages":
-        async for chunk_msg, metadata in graph.astream(
-            inputs, config, stream_mode=stream_mode
+    try:
+        async for event in astream_graph_events(
+            graph, inputs, config, stream_mode, include_subgraphs
         ):
-            curr_node = metadata["langgraph_node"]
-            final_result = {"node": curr_node, "content": chunk_msg, "metadata": metadata}
+            if isinstance(event, StreamEndEvent):
+                break
+
+            render = event_renderers.get(type(event))
+            if render is None:
+                continue
+
+            if stream_mode == "messages":
+                content = event.message
+                final_result = {
+                    "node": event.node,
+                    "content": content,
+                    "metadata": event.metadata,
+                }
+            else:
+                content = event.update
+                final_result = {
+                    "node": event.node,
+                    "content": content,
+                    "namespace": list(event.namespace),
+                }
+
+            # 딕셔너리가 아닌 원본 출력은 필터링/콜백 없이 그대로 출력
+            if event.node is None:
+                final_result = {"content": content}
+                render(renderer, event)
+                continue
 
             # node_names가 비어있거나 현재 노드가 node_names에 있는 경우에만 처리
-            if not node_names or curr_node in node_names:
-                # 콜백 함수가 있는 경우 실행
-                if callback:
-                    result = callback({"node": curr_node, "content": chunk_msg})
-                    if hasattr(result, "__await__"):
-                        await result
-                # 콜백이 없는 경우 기본 출력
-                else:
-                    # 노드가 변경된 경우에만 구분선 출력
-                    if curr_node != prev_node:
-                        print("\n" + "=" * 50)
-                        print(f"🔄 Node: \033[1;36m{curr_node}\033[0m 🔄")
-                        print("- " * 25)
-                    
-                    # Claude/Anthropic 모델의 토큰 청크 처리 - 항상 텍스트만 추출
-                    if hasattr(chunk_msg, 'content'):
-                        # 리스트 형태의 content (Anthropic/Claude 스타일)
-                        if isinstance(chunk_msg.content, list):
-                            for item in chunk_msg.content:
-                                if isinstance(item, dict) and 'text' in item:
-                                    print(item['text'], end="", flush=True)
-                        # 문자열 형태의 content
-                        elif isinstance(chunk_msg.content, str):
-                            print(chunk_msg.content, end="", flush=True)
-                    # 그 외 형태의 chunk_msg 처리
-                    else:
-                        print(chunk_msg, end="", flush=True)
+            if node_names and event.node not in node_names:
+                continue
+
+            # 콜백 함수가 있는 경우 실행
+            if callback is not None:
+                result = callback({"node": event.node, "content": content})
+                if hasattr(result, "__await__"):
+                    await result
+            # 콜백이 없는 경우 기본 출력
+            else:
+                # 노드가 변경된 경우에만 구분선 출력
+                if event.node != prev_node:
+                    _print_node_header(renderer, event)
+                render(renderer, event)
+
+            prev_node = event.node
+    finally:
+        if owns_renderer:
+            await renderer.aclose()
+        else:
+            renderer.flush()
+
+    # 필요에 따라 최종 결과 반환
+    return final_result
+
+
+async def ainvoke_graph(
+    graph: CompiledStateGraph,
+    inputs: dict,
+    config: Optional[RunnableConfig] = None,
+    node_names: List[str] = [],
+    callback: Optional[Callable] = None,
+    include_subgraphs: bool = True,
+    profiler: Optional[GraphProfiler] = None,
+) -> Dict[str, Any]:
+    """
+    LangGraph 앱의 실행 결과를 비동기적으로 스트리밍하여 출력하는 함수입니다.
+
+    Args:
+        graph (CompiledStateGraph): 실행할 컴파일된 LangGraph 객체
+        inputs (dict): 그래프에 전달할 입력값 딕셔너리
+        config (Optional[RunnableConfig]): 실행 설정 (선택적)
+        node_names (List[str], optional): 출력할 노드 이름 목록. 기본값은 빈 리스트
+        callback (Optional[Callable], optional): 각 청크 처리를 위한 콜백 함수. 기본값은 None
+            콜백 함수는 {"node": str, "content": Any} 형태의 딕셔너리를 인자로 받습니다.
+        include_subgraphs (bool, optional): 서브그래프 포함 여부. 기본값은 True
+        profiler (GraphProfiler, optional): 노드별 실행 시간과 토큰 사용량을 기록할 프로파일러. 기본값은 None
+
+    Returns:
+        Dict[str, Any]: 최종 결과 (마지막 노드의 출력)
+    """
+    config = config or {}
+    final_result = {}
+
+    def format_namespace(namespace):
+        return namespace[-1].split(":")[0] if len(namespace) > 0 else "root graph"
 
-                prev_node = curr_node
+    if profiler is not None:
+        profiler.start()
 
-    elif stream_mode == "updates":
-        # 에러 수정: 언패킹 방식 변경
-        # REACT 에이전트 등 일부 그래프에서는 단일 딕셔너리만 반환함
+    try:
+        # subgraphs 매개변수를 통해 서브그래프의 출력도 포함
         async for chunk in graph.astream(
-            inputs, config, stream_mode=stream_mode, subgraphs=include_subgraphs
+            inputs, config, stream_mode="updates", subgraphs=include_subgraphs
         ):
             # 반환 형식에 따라 처리 방법 분기
             if isinstance(chunk, tuple) and len(chunk) == 2:
@@ -533,193 +1499,72 @@ async def astream_graph(
                 # 단일 딕셔너리만 반환하는 경우 (REACT 에이전트 등)
                 namespace = []  # 빈 네임스페이스 (루트 그래프)
                 node_chunks = chunk  # chunk 자체가 노드 청크 딕셔너리
-            
+
             # 딕셔너리인지 확인하고 항목 처리
             if isinstance(node_chunks, dict):
                 for node_name, node_chunk in node_chunks.items():
                     final_result = {"node": node_name, "content": node_chunk, "namespace": namespace}
-                    
+
+                    # 프로파일링은 node_names 필터와 관계없이 모든 노드를 기록
+                    if profiler is not None:
+                        profiler.record(namespace, node_name, node_chunk)
+
                     # node_names가 비어있지 않은 경우에만 필터링
-                    if len(node_names) > 0 and node_name not in node_names:
+                    if node_names and node_name not in node_names:
                         continue
 
                     # 콜백 함수가 있는 경우 실행
                     if callback is not None:
                         result = callback({"node": node_name, "content": node_chunk})
+                        # 코루틴인 경우 await
                         if hasattr(result, "__await__"):
                             await result
                     # 콜백이 없는 경우 기본 출력
                     else:
-                        # 노드가 변경된 경우에만 구분선 출력 (messages 모드와 동일하게)
-                        if node_name != prev_node:
-                            print("\n" + "=" * 50)
+                        print("\n" + "=" * 50)
+                        formatted_namespace = format_namespace(namespace)
+                        if formatted_namespace == "root graph":
                             print(f"🔄 Node: \033[1;36m{node_name}\033[0m 🔄")
-                            print("- " * 25)
-                        
-                        # 노드의 청크 데이터 출력 - 텍스트 중심으로 처리
+                        else:
+                            print(
+                                f"🔄 Node: \033[1;36m{node_name}\033[0m in [\033[1;33m{formatted_namespace}\033[0m] 🔄"
+                            )
+                        print("- " * 25)
+
+                        # 노드의 청크 데이터 출력
                         if isinstance(node_chunk, dict):
                             for k, v in node_chunk.items():
                                 if isinstance(v, BaseMessage):
-                                    # BaseMessage의 content 속성이 텍스트나 리스트인 경우를 처리
-                                    if hasattr(v, 'content'):
-                                        if isinstance(v.content, list):
-                                            for item in v.content:
-                                                if isinstance(item, dict) and 'text' in item:
-                                                    print(item['text'], end="", flush=True)
-                                        else:
-                                            print(v.content, end="", flush=True)
-                                    else:
-                                        v.pretty_print()
+                                    v.pretty_print()
                                 elif isinstance(v, list):
                                     for list_item in v:
                                         if isinstance(list_item, BaseMessage):
-                                            if hasattr(list_item, 'content'):
-                                                if isinstance(list_item.content, list):
-                                                    for item in list_item.content:
-                                                        if isinstance(item, dict) and 'text' in item:
-                                                            print(item['text'], end="", flush=True)
-                                                else:
-                                                    print(list_item.content, end="", flush=True)
-                                            else:
-                                                list_item.pretty_print()
-                                        elif isinstance(list_item, dict) and 'text' in list_item:
-                                            print(list_item['text'], end="", flush=True)
+                                            list_item.pretty_print()
                                         else:
-                                            print(list_item, end="", flush=True)
-                                elif isinstance(v, dict) and 'text' in v:
-                                    print(v['text'], end="", flush=True)
+                                            print(list_item)
+                                elif isinstance(v, dict):
+                                    for node_chunk_key, node_chunk_value in v.items():
+                                        print(f"{node_chunk_key}:\n{node_chunk_value}")
                                 else:
-                                    print(v, end="", flush=True)
+                                    print(f"\033[1;32m{k}\033[0m:\n{v}")
                         elif node_chunk is not None:
                             if hasattr(node_chunk, "__iter__") and not isinstance(node_chunk, str):
                                 for item in node_chunk:
-                                    if isinstance(item, dict) and 'text' in item:
-                                        print(item['text'], end="", flush=True)
-                                    else:
-                                        print(item, end="", flush=True)
+                                    print(item)
                             else:
-                                print(node_chunk, end="", flush=True)
-                        
-                        # 구분선을 여기서 출력하지 않음 (messages 모드와 동일하게)
-                        
-                    prev_node = node_name
+                                print(node_chunk)
+                        print("=" * 50)
             else:
                 # 딕셔너리가 아닌 경우 전체 청크 출력
                 print("\n" + "=" * 50)
                 print(f"🔄 Raw output 🔄")
                 print("- " * 25)
-                print(node_chunks, end="", flush=True)
-                # 구분선을 여기서 출력하지 않음
+                print(node_chunks)
+                print("=" * 50)
                 final_result = {"content": node_chunks}
+    finally:
+        if profiler is not None:
+            profiler.stop()
 
-    else:
-        raise ValueError(
-            f"Invalid stream_mode: {stream_mode}. Must be 'messages' or 'updates'."
-        )
-    
-    # 필요에 따라 최종 결과 반환
-    return final_result
-
-async def ainvoke_graph(
-    graph: CompiledStateGraph,
-    inputs: dict,
-    config: Optional[RunnableConfig] = None,
-    node_names: List[str] = [],
-    callback: Optional[Callable] = None,
-    include_subgraphs: bool = True,
-) -> Dict[str, Any]:
-    """
-    LangGraph 앱의 실행 결과를 비동기적으로 스트리밍하여 출력하는 함수입니다.
-
-    Args:
-        graph (CompiledStateGraph): 실행할 컴파일된 LangGraph 객체
-        inputs (dict): 그래프에 전달할 입력값 딕셔너리
-        config (Optional[RunnableConfig]): 실행 설정 (선택적)
-        node_names (List[str], optional): 출력할 노드 이름 목록. 기본값은 빈 리스트
-        callback (Optional[Callable], optional): 각 청크 처리를 위한 콜백 함수. 기본값은 None
-            콜백 함수는 {"node": str, "content": Any} 형태의 딕셔너리를 인자로 받습니다.
-        include_subgraphs (bool, optional): 서브그래프 포함 여부. 기본값은 True
-
-    Returns:
-        Dict[str, Any]: 최종 결과 (마지막 노드의 출력)
-    """
-    config = config or {}
-    final_result = {}
-
-    def format_namespace(namespace):
-        return namespace[-1].split(":")[0] if len(namespace) > 0 else "root graph"
-
-    # subgraphs 매개변수를 통해 서브그래프의 출력도 포함
-    async for chunk in graph.astream(
-        inputs, config, stream_mode="updates", subgraphs=include_subgraphs
-    ):
-        # 반환 형식에 따라 처리 방법 분기
-        if isinstance(chunk, tuple) and len(chunk) == 2:
-            # 기존 예상 형식: (namespace, chunk_dict)
-            namespace, node_chunks = chunk
-        else:
-            # 단일 딕셔너리만 반환하는 경우 (REACT 에이전트 등)
-            namespace = []  # 빈 네임스페이스 (루트 그래프)
-            node_chunks = chunk  # chunk 자체가 노드 청크 딕셔너리
-        
-        # 딕셔너리인지 확인하고 항목 처리
-        if isinstance(node_chunks, dict):
-            for node_name, node_chunk in node_chunks.items():
-                final_result = {"node": node_name, "content": node_chunk, "namespace": namespace}
-                
-                # node_names가 비어있지 않은 경우에만 필터링
-                if node_names and node_name not in node_names:
-                    continue
-
-                # 콜백 함수가 있는 경우 실행
-                if callback is not None:
-                    result = callback({"node": node_name, "content": node_chunk})
-                    # 코루틴인 경우 await
-                    if hasattr(result, "__await__"):
-                        await result
-                # 콜백이 없는 경우 기본 출력
-                else:
-                    print("\n" + "=" * 50)
-                    formatted_namespace = format_namespace(namespace)
-                    if formatted_namespace == "root graph":
-                        print(f"🔄 Node: \033[1;36m{node_name}\033[0m 🔄")
-                    else:
-                        print(
-                            f"🔄 Node: \033[1;36m{node_name}\033[0m in [\033[1;33m{formatted_namespace}\033[0m] 🔄"
-                        )
-                    print("- " * 25)
-
-                    # 노드의 청크 데이터 출력
-                    if isinstance(node_chunk, dict):
-                        for k, v in node_chunk.items():
-                            if isinstance(v, BaseMessage):
-                                v.pretty_print()
-                            elif isinstance(v, list):
-                                for list_item in v:
-                                    if isinstance(list_item, BaseMessage):
-                                        list_item.pretty_print()
-                                    else:
-                                        print(list_item)
-                            elif isinstance(v, dict):
-                                for node_chunk_key, node_chunk_value in v.items():
-                                    print(f"{node_chunk_key}:\n{node_chunk_value}")
-                            else:
-                                print(f"\033[1;32m{k}\033[0m:\n{v}")
-                    elif node_chunk is not None:
-                        if hasattr(node_chunk, "__iter__") and not isinstance(node_chunk, str):
-                            for item in node_chunk:
-                                print(item)
-                        else:
-                            print(node_chunk)
-                    print("=" * 50)
-        else:
-            # 딕셔너리가 아닌 경우 전체 청크 출력
-            print("\n" + "=" * 50)
-            print(f"🔄 Raw output 🔄")
-            print("- " * 25)
-            print(node_chunks)
-            print("=" * 50)
-            final_result = {"content": node_chunks}
-    
     # 최종 결과 반환
     return final_result
\ No newline at end of file
@@ -0,0 +1,199 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+
+@dataclass
+class NodeStats:
+    """
+    노드 하나(네임스페이스 + 노드 이름)의 누적 실행 통계입니다.
+
+    Attributes:
+        namespace (str): 노드가 속한 그래프 경로. 루트 그래프는 "root graph"
+        node (str): 노드 이름
+        calls (int): 노드 실행 횟수
+        wall_time (float): 누적 실행 시간(초)
+        max_time (float): 가장 오래 걸린 한 번의 실행 시간(초)
+        input_tokens (int): LLM 입력 토큰 수
+        output_tokens (int): LLM 출력 토큰 수
+        tool_calls (int): 노드가 요청한 도구 호출 수
+        tool_results (int): 노드가 반환한 도구 결과 수
+        tool_payload_bytes (int): 도구 결과의 크기(바이트, UTF-8 기준)
+    """
+
+    namespace: str
+    node: str
+    calls: int = 0
+    wall_time: float = 0.0
+    max_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    tool_results: int = 0
+    tool_payload_bytes: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+def _namespace_label(namespace: Sequence[str]) -> str:
+    """("weather_expert:<task_id>", ...) 형태의 네임스페이스를 읽기 쉬운 경로로 바꿉니다."""
+    if not namespace:
+        return "root graph"
+    return "/".join(part.split(":")[0] for part in namespace)
+
+
+def _token_usage(message: AIMessage) -> tuple[int, int]:
+    """메시지 메타데이터에서 (입력, 출력) 토큰 수를 꺼냅니다."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    # usage_metadata를 채우지 않는 모델은 response_metadata에 남깁니다.
+    token_usage = (message.response_metadata or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+
+
+def _iter_messages(node_chunk: Any):
+    """노드 업데이트 안에 들어 있는 메시지들을 꺼냅니다."""
+    if not isinstance(node_chunk, dict):
+        return
+    for value in node_chunk.values():
+        if isinstance(value, BaseMessage):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, BaseMessage):
+                    yield item
+
+
+class GraphProfiler:
+    """
+    `invoke_graph` / `ainvoke_graph`에 넘겨서 노드별 실행 시간과 토큰 사용량을 기록하는 프로파일러입니다.
+
+    updates 모드에서는 노드가 끝날 때 업데이트가 나오므로, 노드 실행 시간은
+    같은 네임스페이스에서 직전 업데이트가 나온 뒤로 흐른 시간으로 계산합니다.
+    서브그래프 안의 시간과 토큰은 부모 그래프의 서브그래프 노드 통계에도 포함됩니다.
+    병렬로 실행된 노드는 같은 구간을 나눠 갖지 않으므로 합계가 전체 시간보다 클 수 있습니다.
+
+    사용 예시:
+        profiler = GraphProfiler()
+        invoke_graph(graph, inputs, config, profiler=profiler)
+        profiler.print_report()
+        profiler.export_json("profile.json")
+    """
+
+    def __init__(self):
+        self.stats: Dict[tuple[str, str], NodeStats] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._last_update: Dict[str, float] = {}
+
+    def start(self) -> None:
+        """실행 시작 시각을 기록합니다."""
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self._last_update.clear()
+
+    def stop(self) -> None:
+        """실행 종료 시각을 기록합니다."""
+        self.finished_at = time.perf_counter()
+
+    @property
+    def total_time(self) -> float:
+        """전체 실행 시간(초)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def record(self, namespace: Sequence[str], node_name: str, node_chunk: Any) -> None:
+        """
+        노드 업데이트 하나를 기록합니다.
+
+        Args:
+            namespace (Sequence[str]): 업데이트가 나온 그래프의 네임스페이스
+            node_name (str): 노드 이름
+            node_chunk (Any): 노드가 반환한 업데이트
+        """
+        now = time.perf_counter()
+        if self.started_at is None:
+            self.start()
+
+        label = _namespace_label(namespace)
+        if label not in self._last_update:
+            # 처음 보는 서브그래프는 부모 그래프의 직전 업데이트부터 시작한 것으로 봅니다.
+            parent = _namespace_label(namespace[:-1]) if namespace else None
+            self._last_update[label] = self._last_update.get(parent, self.started_at)
+        elapsed = now - self._last_update[label]
+        self._last_update[label] = now
+
+        stats = self.stats.get((label, node_name))
+        if stats is None:
+            stats = self.stats[(label, node_name)] = NodeStats(label, node_name)
+        stats.calls += 1
+        stats.wall_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+
+        for message in _iter_messages(node_chunk):
+            if isinstance(message, AIMessage):
+                input_tokens, output_tokens = _token_usage(message)
+                stats.input_tokens += input_tokens
+                stats.output_tokens += output_tokens
+                stats.tool_calls += len(message.tool_calls)
+            elif isinstance(message, ToolMessage):
+                stats.tool_results += 1
+                stats.tool_payload_bytes += len(str(message.content).encode("utf-8"))
+
+    def hot_path(self) -> List[NodeStats]:
+        """누적 실행 시간이 긴 순서로 정렬된 노드 통계를 반환합니다."""
+        return sorted(self.stats.values(), key=lambda s: s.wall_time, reverse=True)
+
+    def subgraph_totals(self) -> Dict[str, float]:
+        """네임스페이스(서브그래프)별 누적 실행 시간을 반환합니다."""
+        totals: Dict[str, float] = {}
+        for stats in self.stats.values():
+            totals[stats.namespace] = totals.get(stats.namespace, 0.0) + stats.wall_time
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON으로 내보낼 수 있는 딕셔너리로 변환합니다."""
+        return {
+            "total_time": self.total_time,
+            "subgraphs": self.subgraph_totals(),
+            "nodes": [
+                {**asdict(stats), "total_tokens": stats.total_tokens}
+                for stats in self.hot_path()
+            ],
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def export_json(self, path: str) -> None:
+        """프로파일 결과를 JSON 파일로 저장합니다."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def print_report(self) -> None:
+        """노드별 실행 시간이 긴 순서대로 표를 출력합니다."""
+        total = self.total_time or 1e-9
+        print("\n" + "=" * 96)
+        print(f"⏱️  그래프 프로파일 (전체 {self.total_time:.3f}s)")
+        print("-" * 96)
+        print(
+            f"{'namespace':<20} {'node':<20} {'calls':>5} {'time(s)':>9} {'%':>6} "
+            f"{'max(s)':>8} {'tokens':>8} {'tools':>5} {'payload':>9}"
+        )
+        print("-" * 96)
+        for stats in self.hot_path():
+            print(
+                f"{stats.namespace:<20.20} {stats.node:<20.20} {stats.calls:>5} "
+                f"{stats.wall_time:>9.3f} {stats.wall_time / total * 100:>5.1f}% "
+                f"{stats.max_time:>8.3f} {stats.total_tokens:>8} {stats.tool_calls:>5} "
+                f"{stats.tool_payload_bytes:>9}"
+            )
+        print("=" * 96)
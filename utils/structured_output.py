@@ -0,0 +1,344 @@
+"""
+LLM 구조화 출력(JSON) 공용 도구
+
+LLM이 JSON 앞뒤에 설명을 붙이거나 ```json 코드 블록으로 감싸면 `json.loads`가 실패하고,
+요청 전체를 다시 보내야 합니다. 이 모듈은 다음 순서로 구조화 출력을 받습니다.
+
+1. 모델이 지원하면 `with_structured_output`으로 스키마를 강제합니다 (tool / JSON schema 모드).
+2. 지원하지 않으면 텍스트 응답에서 JSON을 관대하게 찾아 파싱하고 Pydantic 모델로 검증합니다.
+3. 파싱이나 검증에 실패하면 원래 프롬프트를 다시 보내지 않고,
+   깨진 출력과 오류 메시지만 담은 짧은 수정 요청을 보냅니다.
+
+스트리밍 중에는 `StructuredOutputParser`로 토큰을 이어서 파싱하고,
+다 받은 목록 항목부터 모델로 검증해 먼저 사용할 수 있습니다.
+
+사용 예시:
+    from utils.structured_output import invoke_structured
+
+    class Quiz(BaseModel):
+        question: str
+        choices: list[str]
+        answer: str
+
+    quiz = invoke_structured(llm, messages, Quiz)
+"""
+
+import json
+from typing import Any, List, Optional, Type, TypeVar
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, ValidationError
+
+from .messages import IncrementalJSONParser
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# 수정 요청에 넣을 깨진 출력의 최대 길이 (글자 수)
+REPAIR_OUTPUT_MAX_CHARS = 8000
+
+
+class StructuredOutputError(ValueError):
+    """LLM 출력에서 스키마에 맞는 JSON을 얻지 못했을 때 발생합니다."""
+
+    def __init__(self, message: str, text: str = "", partial: Any = None):
+        super().__init__(message)
+        self.text = text
+        self.partial = partial
+
+
+def _json_starts(text: str) -> List[int]:
+    """JSON 객체/배열이 시작될 수 있는 위치 목록"""
+    return [i for i, ch in enumerate(text) if ch in "{["]
+
+
+def validate_output(data: Any, schema: Optional[Type[ModelT]]) -> Any:
+    """파싱한 값을 스키마로 검증합니다. schema가 없으면 그대로 반환합니다."""
+    if schema is None:
+        return data
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(str(e), partial=data) from e
+
+
+def parse_json(text: str) -> Any:
+    """
+    텍스트에서 첫 번째로 완전한 JSON 객체(또는 배열)를 찾아 파싱합니다.
+
+    앞뒤의 설명 문장과 ```json 코드 블록은 무시합니다.
+
+    Args:
+        text (str): LLM 응답 텍스트
+
+    Returns:
+        파싱한 dict 또는 list
+
+    Raises:
+        StructuredOutputError: 완전한 JSON을 찾지 못한 경우
+    """
+    partial = None
+    for start in _json_starts(text):
+        parser = IncrementalJSONParser()
+        parser.feed(text[start:])
+        if parser.done and not parser.failed:
+            return parser.root
+        if not parser.failed:
+            # 끊겼을 뿐 문법은 맞으므로, 뒤의 시작 위치는 이 JSON 안쪽의 일부입니다.
+            partial = parser.snapshot()
+            break
+    message = "JSON이 중간에 끊겼습니다." if partial is not None else "JSON을 찾을 수 없습니다."
+    raise StructuredOutputError(message, text=text, partial=partial)
+
+
+def parse_model(text: str, schema: Type[ModelT]) -> ModelT:
+    """텍스트에서 JSON을 찾아 schema로 검증합니다. 실패하면 StructuredOutputError가 발생합니다."""
+    try:
+        return validate_output(parse_json(text), schema)
+    except StructuredOutputError as e:
+        e.text = text
+        raise
+
+
+class StructuredOutputParser:
+    """
+    스트리밍되는 LLM 출력을 이어서 파싱하는 클래스입니다.
+
+    첫 `{` 또는 `[` 전의 텍스트(설명, 코드 블록 표시)는 건너뛰고, 최상위 JSON이 닫히면
+    나머지 텍스트는 무시합니다. `new_items()`로 목록 필드에서 다 받은 항목만 먼저 꺼낼 수 있습니다.
+
+    Args:
+        schema: 최종 결과를 검증할 Pydantic 모델. 없으면 dict/list를 그대로 반환합니다.
+
+    사용 예시:
+        parser = StructuredOutputParser(ActionItemList)
+        for chunk in llm.stream(messages):
+            parser.feed(chunk.content)
+            for item in parser.new_items("action_items", ActionItem):
+                print(item.title)
+        result = parser.result()
+    """
+
+    def __init__(self, schema: Optional[Type[BaseModel]] = None):
+        self.schema = schema
+        self._parts: List[str] = []
+        self._json = IncrementalJSONParser()
+        self._started = False
+        self._emitted: dict[str, int] = {}
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return "".join(self._parts)
+
+    @property
+    def done(self) -> bool:
+        return self._json.done and not self._json.failed
+
+    @property
+    def partial(self) -> Any:
+        """지금까지 파싱된 값. 닫히지 않은 문자열도 받은 만큼 채워집니다."""
+        return self._json.snapshot()
+
+    def feed(self, text: str) -> Any:
+        """새로 받은 텍스트 조각을 파싱하고 현재까지의 값을 반환합니다."""
+        if not isinstance(text, str) or not text:
+            return self.partial
+        self._parts.append(text)
+        if self._json.done or self._json.failed:
+            return self.partial
+        if not self._started:
+            starts = _json_starts(text)
+            if not starts:
+                return None
+            text = text[starts[0]:]
+            self._started = True
+        self._json.feed(text)
+        return self.partial
+
+    def new_items(self, key: str, item_schema: Type[ModelT]) -> List[ModelT]:
+        """
+        key 목록 필드에서 새로 완성된 항목을 item_schema로 검증해 반환합니다.
+
+        아직 받는 중인 마지막 항목은 다음 호출로 미루고, 검증에 실패한 항목은 건너뜁니다.
+        건너뛴 항목은 `result()`에서 다시 검증되므로 오류가 사라지지 않습니다.
+        """
+        data = self.partial
+        items = data.get(key) if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return []
+        complete = len(items)
+        if items and self._json.is_open(items):
+            last = items[-1]
+            # 문자열/숫자 같은 단순 값은 다음 쉼표가 올 때까지 끝났는지 알 수 없습니다.
+            if not isinstance(last, (dict, list)) or self._json.is_open(last):
+                complete -= 1
+
+        start = self._emitted.get(key, 0)
+        self._emitted[key] = max(start, complete)
+        ready = []
+        for item in items[start:complete]:
+            try:
+                ready.append(item_schema.model_validate(item))
+            except ValidationError:
+                continue
+        return ready
+
+    def result(self) -> Any:
+        """최종 결과를 검증해 반환합니다. JSON이 끝나지 않았거나 스키마와 맞지 않으면 StructuredOutputError"""
+        if not self.done:
+            # 스트리밍 파서가 실패했어도 전체 텍스트에서 다른 JSON을 찾을 수 있습니다.
+            return validate_output(parse_json(self.text), self.schema)
+        try:
+            return validate_output(self._json.root, self.schema)
+        except StructuredOutputError as e:
+            e.text = self.text
+            raise
+
+
+def build_repair_messages(
+    text: str, error: Exception, schema: Type[BaseModel]
+) -> List[BaseMessage]:
+    """깨진 출력과 오류만으로 JSON을 고치는 프롬프트를 만듭니다. 원래 대화는 다시 보내지 않습니다."""
+    json_schema = json.dumps(schema.model_json_schema(), ensure_ascii=False)
+    if len(text) > REPAIR_OUTPUT_MAX_CHARS:
+        text = text[:REPAIR_OUTPUT_MAX_CHARS] + "\n...(생략)"
+    prompt = f"""다음 출력은 아래 JSON 스키마를 따라야 하지만 오류가 있습니다.
+내용은 최대한 그대로 두고 형식만 고친 JSON을 반환하세요. JSON 외의 텍스트는 포함하지 마세요.
+
+JSON 스키마:
+{json_schema}
+
+오류:
+{error}
+
+출력:
+{text}"""
+    return [
+        SystemMessage(content="당신은 JSON 형식 오류를 고치는 도우미입니다."),
+        HumanMessage(content=prompt),
+    ]
+
+
+def _raw_text(raw: Any) -> str:
+    """with_structured_output(include_raw=True)의 원본 응답을 수정 요청용 텍스트로 만듭니다."""
+    if isinstance(raw, AIMessage) and raw.tool_calls:
+        return json.dumps(raw.tool_calls[0]["args"], ensure_ascii=False)
+    if isinstance(raw, BaseMessage):
+        return raw.text()
+    return str(raw)
+
+
+def _structured_runnable(llm: BaseChatModel, schema: Type[BaseModel]):
+    """스키마를 강제하는 runnable을 만듭니다. 모델이 지원하지 않으면 None"""
+    try:
+        return llm.with_structured_output(schema, include_raw=True)
+    except NotImplementedError:
+        return None
+
+
+def repair_structured(
+    llm: BaseChatModel,
+    text: str,
+    error: Exception,
+    schema: Type[ModelT],
+    max_repairs: int = 1,
+) -> ModelT:
+    """
+    깨진 출력을 LLM에게 고치게 합니다.
+
+    Args:
+        llm: 수정에 사용할 채팅 모델
+        text (str): 깨진 출력
+        error (Exception): 파싱/검증 오류
+        schema: 결과를 검증할 Pydantic 모델
+        max_repairs (int): 최대 수정 요청 횟수
+
+    Raises:
+        StructuredOutputError: 모든 수정 요청이 실패한 경우
+    """
+    for _ in range(max_repairs):
+        text = llm.invoke(build_repair_messages(text, error, schema)).text()
+        try:
+            return parse_model(text, schema)
+        except StructuredOutputError as e:
+            error = e
+    raise StructuredOutputError(f"구조화 출력 수정 실패: {error}", text=text)
+
+
+async def arepair_structured(
+    llm: BaseChatModel,
+    text: str,
+    error: Exception,
+    schema: Type[ModelT],
+    max_repairs: int = 1,
+) -> ModelT:
+    """repair_structured의 비동기 버전"""
+    for _ in range(max_repairs):
+        text = (await llm.ainvoke(build_repair_messages(text, error, schema))).text()
+        try:
+            return parse_model(text, schema)
+        except StructuredOutputError as e:
+            error = e
+    raise StructuredOutputError(f"구조화 출력 수정 실패: {error}", text=text)
+
+
+def invoke_structured(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    schema: Type[ModelT],
+    max_repairs: int = 1,
+) -> ModelT:
+    """
+    LLM을 호출해 schema 모델 인스턴스를 받습니다.
+
+    모델이 지원하면 스키마를 강제해서 호출하고, 아니면 텍스트 응답을 관대하게 파싱합니다.
+    어느 쪽이든 실패하면 전체를 다시 생성하지 않고 깨진 출력만 고치도록 요청합니다.
+
+    Args:
+        llm: 채팅 모델
+        messages: 프롬프트 메시지 목록
+        schema: 응답을 검증할 Pydantic 모델
+        max_repairs (int): 최대 수정 요청 횟수
+
+    Returns:
+        schema 인스턴스
+
+    Raises:
+        StructuredOutputError: 수정 요청까지 실패한 경우
+    """
+    structured = _structured_runnable(llm, schema)
+    if structured is not None:
+        output = structured.invoke(messages)
+        if output["parsed"] is not None:
+            return output["parsed"]
+        text, error = _raw_text(output["raw"]), output["parsing_error"]
+    else:
+        text = llm.invoke(messages).text()
+        try:
+            return parse_model(text, schema)
+        except StructuredOutputError as e:
+            error = e
+    return repair_structured(llm, text, error, schema, max_repairs)
+
+
+async def ainvoke_structured(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    schema: Type[ModelT],
+    max_repairs: int = 1,
+) -> ModelT:
+    """invoke_structured의 비동기 버전"""
+    structured = _structured_runnable(llm, schema)
+    if structured is not None:
+        output = await structured.ainvoke(messages)
+        if output["parsed"] is not None:
+            return output["parsed"]
+        text, error = _raw_text(output["raw"]), output["parsing_error"]
+    else:
+        text = (await llm.ainvoke(messages)).text()
+        try:
+            return parse_model(text, schema)
+        except StructuredOutputError as e:
+            error = e
+    return await arepair_structured(llm, text, error, schema, max_repairs)
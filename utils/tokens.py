@@ -0,0 +1,32 @@
+"""
+프롬프트 예산 계산용 토큰 수 도우미
+
+tiktoken 인코딩 파일은 처음 사용할 때 내려받으므로, 오프라인 등으로 불러올 수 없으면
+글자 수를 토큰 수로 사용합니다. 한국어/영어 모두 실제 토큰 수보다 크게 잡히므로
+예산을 넘기지 않는 쪽으로 추정됩니다.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """모델의 tiktoken 인코딩을 불러옵니다. 불러올 수 없으면 None을 반환합니다."""
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # tiktoken이 아직 모르는 모델은 최신 인코딩으로 셉니다.
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """텍스트의 토큰 수를 셉니다. tiktoken을 쓸 수 없으면 글자 수로 넉넉하게 추정합니다."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode(text))